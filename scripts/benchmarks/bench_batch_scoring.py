@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Benchmark: reavaliação de um acervo de análises com ComplianceScorer
+
+Compara evaluate() texto a texto com evaluate_many (contagem + arrays) e
+com score_counts (apenas novos pesos sobre a matriz já contada).
+
+Uso:
+    python scripts/benchmarks/bench_batch_scoring.py [--documents 20000] [--words 500]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from fixtures import lorem  # noqa: E402
+from src.ai.core.validator import ComplianceScorer  # noqa: E402
+
+
+def build_analyses(documents, words):
+    """Análises sintéticas com ~5% de palavras-chave"""
+    scorer = ComplianceScorer()
+    keywords = [keyword for words in scorer._category_keywords().values() for keyword in words]
+    rng = random.Random(0)
+    analyses = []
+    for index in range(documents):
+        filler = lorem(words, seed=index).split()
+        for position in rng.sample(range(words), words // 20):
+            filler[position] = rng.choice(keywords)
+        analyses.append(' '.join(filler))
+    return analyses
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--documents', type=int, default=20000, help='Análises no acervo')
+    parser.add_argument('--words', type=int, default=500, help='Palavras por análise')
+    args = parser.parse_args()
+    
+    analyses = build_analyses(args.documents, args.words)
+    scorer = ComplianceScorer()
+    
+    started = time.perf_counter()
+    results = [scorer.evaluate(text) for text in analyses]
+    elapsed_loop = time.perf_counter() - started
+    
+    started = time.perf_counter()
+    batch = scorer.evaluate_many(analyses)
+    elapsed_batch = time.perf_counter() - started
+    
+    assert batch.compliance_score.tolist() == [result['compliance_score'] for result in results]
+    
+    scorer.scoring_weights = {'jorc': 0.3, 'ni_43_101': 0.2, 'prms': 0.1, 'qa_qc': 0.3, 'compliance': 0.1}
+    started = time.perf_counter()
+    scorer.score_counts(batch.counts, batch.categories)
+    elapsed_weights = time.perf_counter() - started
+    
+    print(f"{'método':<34}{'tempo':>10}{'ganho':>8}")
+    print(f"{'evaluate() por análise':<34}{elapsed_loop:>9.2f}s{1:>7.1f}x")
+    print(f"{'evaluate_many':<34}{elapsed_batch:>9.2f}s{elapsed_loop / elapsed_batch:>7.1f}x")
+    print(f"{'score_counts (novos pesos)':<34}{elapsed_weights:>9.3f}s{elapsed_loop / elapsed_weights:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
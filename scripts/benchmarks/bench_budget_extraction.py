@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark: extração completa vs. extração com orçamento (extract_with_budget)
+
+Gera um relatório longo com capa e sumário e compara o tempo de
+extract (documento inteiro) com extract_with_budget usando o
+mesmo limite de entrada do ValidatorAI (12.000 caracteres).
+
+Uso:
+    python scripts/benchmarks/bench_budget_extraction.py [--pages 400]
+"""
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from fixtures import build_pdf, lorem  # noqa: E402
+from src.ai.core.validator import DocumentPreprocessor  # noqa: E402
+
+BUDGET = 12000
+
+
+def build_document(page_count):
+    pages = [["Technical Report on the Gold Project", "NI 43-101"]]
+    pages.append(["Table of Contents"] + [f"Section {i} ........ {i * 3}" for i in range(1, 35)])
+    pages.append([f"Section {i} ........ {i * 3}" for i in range(35, 70)])
+    for page in range(page_count - len(pages)):
+        pages.append([lorem(12, seed=page * 100 + line) for line in range(40)])
+    return build_pdf(pages)
+
+
+async def timed(coro):
+    started = time.perf_counter()
+    result = await coro
+    return time.perf_counter() - started, result
+
+
+async def run(path):
+    full = DocumentPreprocessor(max_workers=0)
+    elapsed_full, result_full = await timed(full.extract(str(path)))
+    
+    budgeted = DocumentPreprocessor(max_workers=0)
+    elapsed_budget, result_budget = await timed(
+        budgeted.extract_with_budget(str(path), max_chars=BUDGET, skip_front_matter=True)
+    )
+    metadata = result_budget.metadata
+    
+    print(f"{'modo':<26}{'tempo':>9}{'páginas':>9}{'chars':>10}")
+    print(f"{'extract':<26}{elapsed_full:>8.2f}s{result_full.metadata['page_count']:>9}{len(result_full.text):>10}")
+    print(f"{'extract_with_budget':<26}{elapsed_budget:>8.2f}s{metadata['page_count']:>9}{len(result_budget.text):>10}")
+    print(f"ganho: {elapsed_full / elapsed_budget:.1f}x, páginas de capa/sumário descartadas: {metadata['skipped_pages']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--pages', type=int, default=400, help='Páginas do relatório')
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "report.pdf"
+        path.write_bytes(build_document(args.pages))
+        asyncio.run(run(path))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark: DOCX via python-docx (DOM completo) vs. leitura em streaming
+
+Gera um relatório com uma tabela de recursos/reservas com muitas linhas e
+compara tempo e pico de memória da extração antiga, que monta o documento
+inteiro com python-docx, com iter_docx_blocks. Cada modo roda em um
+subprocesso próprio e o pico é o RSS máximo (a árvore do lxml vive fora
+do heap Python, invisível ao tracemalloc).
+
+Uso:
+    python scripts/benchmarks/bench_docx_streaming.py [--rows 20000]
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import docx  # noqa: E402
+from fixtures import build_docx, lorem  # noqa: E402
+from src.ai.core.validator.extractors import extract_docx  # noqa: E402
+
+
+def extract_docx_dom(file_path):
+    """Extração anterior: parágrafos e depois todas as tabelas via python-docx"""
+    document = docx.Document(file_path)
+    text = [paragraph.text for paragraph in document.paragraphs if paragraph.text.strip()]
+    for table in document.tables:
+        for row in table.rows:
+            row_text = ' | '.join(cell.text.strip() for cell in row.cells)
+            if row_text.strip():
+                text.append(row_text)
+    return '\n'.join(text)
+
+
+MODES = {
+    'python-docx (DOM)': extract_docx_dom,
+    'iterparse (streaming)': extract_docx,
+}
+
+
+def measure(mode, path):
+    """Executa um modo em subprocesso e devolve (tempo, pico RSS em MB, texto)"""
+    output = subprocess.run(
+        [sys.executable, __file__, '--measure', mode, str(path)],
+        check=True, capture_output=True, text=True
+    ).stdout
+    result = json.loads(output)
+    return result['elapsed'], result['peak_mb'], result['text']
+
+
+def run_mode(mode, path):
+    started = time.perf_counter()
+    text = MODES[mode](path)
+    elapsed = time.perf_counter() - started
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(json.dumps({'elapsed': elapsed, 'peak_mb': peak_mb, 'text': text}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--rows', type=int, default=20000, help='Linhas da tabela')
+    parser.add_argument('--measure', nargs=2, metavar=('MODE', 'PATH'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.measure:
+        run_mode(*args.measure)
+        return
+    
+    paragraphs = [lorem(30, seed=i) for i in range(50)]
+    rows = [[f"Bloco {i}", "Indicated", f"{i * 1.5:.1f}", "2.35", lorem(4, seed=i)] for i in range(args.rows)]
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "report.docx"
+        path.write_bytes(build_docx(paragraphs, rows))
+        results = {mode: measure(mode, path) for mode in MODES}
+    
+    print(f"{'modo':<24}{'tempo':>9}{'pico RSS MB':>13}{'chars':>11}")
+    for mode, (elapsed, peak, text) in results.items():
+        print(f"{mode:<24}{elapsed:>8.2f}s{peak:>13.1f}{len(text):>11}")
+    
+    (dom_time, dom_peak, dom_text), (stream_time, stream_peak, stream_text) = results.values()
+    same_lines = sorted(dom_text.split('\n')) == sorted(stream_text.split('\n'))
+    print(f"mesmas linhas: {same_lines}")
+    print(f"ganho: {dom_time / stream_time:.1f}x tempo, {dom_peak / stream_peak:.1f}x memória")
+
+
+if __name__ == "__main__":
+    main()
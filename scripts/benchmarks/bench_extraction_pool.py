@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Benchmark: latência de /ai/analyze/text durante parsing pesado de PDFs
+
+Dispara extrações de PDFs grandes em paralelo e, ao mesmo tempo, mede a
+latência de chamadas a ValidatorAI.validate_text (o handler de
+/ai/analyze/text) com a chamada ao GPT simulada por um sleep. Compara:
+
+- blocking: parsing síncrono no event loop (comportamento anterior)
+- thread:   DocumentPreprocessor(max_workers=0)
+- process:  DocumentPreprocessor(max_workers=N)
+
+Uso:
+    python scripts/benchmarks/bench_extraction_pool.py [--pdfs 4] [--pages 200] [--workers 4]
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from fixtures import build_report_pdf  # noqa: E402
+from src.ai.core.validator import ValidatorAI, DocumentPreprocessor  # noqa: E402
+from src.ai.core.validator import extractors  # noqa: E402
+
+GPT_LATENCY = 0.05  # Latência simulada do GPT (s)
+REQUEST_INTERVAL = 0.02  # Intervalo entre chamadas a /ai/analyze/text (s)
+
+
+class BlockingPreprocessor(DocumentPreprocessor):
+    """Reproduz o comportamento antigo: parsing síncrono dentro do event loop"""
+    
+    async def _run_extraction(self, func, *args, admitted=False):
+        return func(*args)
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run_scenario(preprocessor, paths):
+    validator = ValidatorAI(api_key='sk-benchmark')
+    
+    async def fake_gpt(text):
+        await asyncio.sleep(GPT_LATENCY)
+        return "jorc resource qa/qc"
+    
+    validator._analyze_with_gpt = fake_gpt
+    latencies = []
+    done = asyncio.Event()
+    
+    async def request(scheduled):
+        await validator.validate_text("x" * 200)
+        latencies.append(time.perf_counter() - scheduled)
+    
+    async def interactive_load():
+        # Carga em malha aberta: latência medida a partir do horário agendado,
+        # para que um event loop bloqueado apareça como atraso
+        requests = []
+        scheduled = time.perf_counter()
+        while not done.is_set():
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            requests.append(asyncio.create_task(request(scheduled)))
+            scheduled += REQUEST_INTERVAL
+        await asyncio.gather(*requests)
+    
+    load = asyncio.create_task(interactive_load())
+    await asyncio.sleep(0.2)  # Aquecimento
+    
+    started = time.perf_counter()
+    await asyncio.gather(*(preprocessor.preprocess_text(str(path)) for path in paths))
+    elapsed = time.perf_counter() - started
+    
+    done.set()
+    await load
+    preprocessor.shutdown()
+    
+    return elapsed, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--pdfs', type=int, default=4, help='PDFs extraídos em paralelo')
+    parser.add_argument('--pages', type=int, default=200, help='Páginas por PDF')
+    parser.add_argument('--workers', type=int, default=4, help='Processos do pool')
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for index in range(args.pdfs):
+            path = Path(tmp) / f"report_{index}.pdf"
+            path.write_bytes(build_report_pdf(args.pages, seed=index))
+            paths.append(path)
+        
+        # Aquecer caches de import do PyPDF2
+        extractors.pdf_page_count(str(paths[0]))
+        
+        scenarios = {
+            'blocking': BlockingPreprocessor(max_workers=0),
+            'thread': DocumentPreprocessor(max_workers=0),
+            f'process({args.workers})': DocumentPreprocessor(max_workers=args.workers),
+        }
+        
+        print(f"{args.pdfs} PDFs x {args.pages} páginas, GPT simulado em {GPT_LATENCY * 1000:.0f} ms")
+        print(f"{'backend':<14}{'extração':>10}{'reqs':>6}{'p50 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+        
+        for name, preprocessor in scenarios.items():
+            elapsed, latencies = asyncio.run(run_scenario(preprocessor, paths))
+            print(
+                f"{name:<14}{elapsed:>9.2f}s{len(latencies):>6}"
+                f"{statistics.median(latencies) * 1000:>9.1f}"
+                f"{percentile(latencies, 99) * 1000:>9.1f}"
+                f"{max(latencies) * 1000:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark: contagem de palavras-chave do ComplianceScorer em textos de 1 MB
+
+Compara a implementação antiga (str.count por palavra-chave e categoria)
+com o KeywordMatcher (uma passagem para todas as categorias) em cada modo
+de fronteira, em texto de relatório e em texto denso de palavras-chave.
+Também mede como o custo cresce com o número de palavras-chave.
+
+Uso:
+    python scripts/benchmarks/bench_keyword_matcher.py [--mb 1] [--repeat 5]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from fixtures import lorem  # noqa: E402
+from src.ai.core.validator.matcher import BOUNDARY_MODES, KeywordMatcher  # noqa: E402
+from src.ai.core.validator.scoring import ComplianceScorer  # noqa: E402
+
+
+def legacy_count(text, categories):
+    """Implementação anterior de ComplianceScorer.evaluate (contagem)"""
+    text_lower = text.lower()
+    return {
+        category: sum(text_lower.count(keyword.lower()) for keyword in keywords)
+        for category, keywords in categories.items()
+    }
+
+
+def build_text(megabytes, keyword_share, keywords, seed=0):
+    """Texto técnico com a fração indicada de palavras-chave"""
+    rng = random.Random(seed)
+    filler = lorem(5000, seed=seed).split()
+    words = []
+    size = 0
+    while size < megabytes * 1024 * 1024:
+        word = rng.choice(keywords) if rng.random() < keyword_share else rng.choice(filler)
+        words.append(word)
+        size += len(word) + 1
+    return ' '.join(words)
+
+
+def measure(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def scaled_categories(categories, factor):
+    """Conjunto de regras factor vezes maior (variantes numeradas)"""
+    return {
+        f'{category}_{copy}': [f'{keyword} {copy}' if copy else keyword for keyword in keywords]
+        for copy in range(factor)
+        for category, keywords in categories.items()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--mb', type=float, default=1, help='Tamanho do texto (MB)')
+    parser.add_argument('--repeat', type=int, default=5, help='Repetições (usa a melhor)')
+    args = parser.parse_args()
+    
+    categories = ComplianceScorer()._category_keywords()
+    keywords = [keyword for words in categories.values() for keyword in words]
+    texts = {
+        'relatório': build_text(args.mb, 0.03, keywords),
+        'denso': build_text(args.mb, 0.5, keywords),
+    }
+    
+    print(f"{'texto':<12}{'implementação':<24}{'ms':>9}{'ganho':>8}")
+    for label, text in texts.items():
+        baseline = measure(lambda: legacy_count(text, categories), args.repeat)
+        print(f"{label:<12}{'legacy (str.count)':<24}{baseline * 1000:>9.1f}{1:>7.2f}x")
+        
+        for boundary in BOUNDARY_MODES:
+            matcher = KeywordMatcher(categories, boundary)
+            if boundary == 'none':
+                assert matcher.count(text) == legacy_count(text, categories)
+            elapsed = measure(lambda: matcher.count(text), args.repeat)
+            print(f"{label:<12}{'matcher/' + boundary:<24}{elapsed * 1000:>9.1f}{baseline / elapsed:>7.2f}x")
+    
+    print()
+    print(f"{'palavras-chave':<16}{'legacy ms':>11}{'matcher ms':>12}{'compilação ms':>15}{'ganho':>8}")
+    text = texts['relatório']
+    for factor in (1, 4, 16):
+        ruleset = scaled_categories(categories, factor)
+        baseline = measure(lambda: legacy_count(text, ruleset), args.repeat)
+        
+        started = time.perf_counter()
+        matcher = KeywordMatcher(ruleset, 'start')
+        compile_time = time.perf_counter() - started
+        
+        elapsed = measure(lambda: matcher.count(text), args.repeat)
+        size = sum(len(words) for words in ruleset.values())
+        print(
+            f"{size:<16}{baseline * 1000:>11.1f}{elapsed * 1000:>12.1f}"
+            f"{compile_time * 1000:>15.1f}{baseline / elapsed:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Benchmark: throughput da normalização de texto (_clean_text)
+
+Compara a implementação antiga (três re.sub + strip) com o TextNormalizer
+(tabela de tradução + uma regex) em textos de vários megabytes: um perfil
+"relatório" (linhas de ~12 palavras, símbolos raros) e dois perfis ruidosos
+com símbolos e espaços extras frequentes, em inglês e português.
+
+Uso:
+    python scripts/benchmarks/bench_normalizer.py [--mb 8] [--repeat 3]
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.ai.core.validator.normalizer import TextNormalizer  # noqa: E402
+
+ENGLISH = [
+    'mineral', 'resource', 'estimate', 'drill', 'hole', 'assay', 'grade', '2.5',
+    'g/t', 'Au', '(JORC)', 'Item', '14', 'qualified', 'person', '•', '©', '—',
+    '\n', '\n\n', '  ', '\t', 'tonnes:', '[1]', '50%'
+]
+PORTUGUESE = ENGLISH + ['recursos', 'medidos', 'indicados', 'inferidos', 'sondagem', 'análise', 'teor', 'ação']
+
+
+def legacy_clean(text):
+    """Implementação anterior de DocumentPreprocessor._clean_text"""
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r'[^\w\s\.,;:!?()\-\[\]{}]', '', text)
+    text = re.sub(r'\n+', '\n', text)
+    return text.strip()
+
+
+def build_report_text(megabytes, seed=0):
+    """Texto no formato típico de extração de PDF: linhas curtas, poucos símbolos"""
+    rng = random.Random(seed)
+    vocabulary = [word for word in PORTUGUESE if word.strip() and len(word) > 2]
+    lines = []
+    size = 0
+    while size < megabytes * 1024 * 1024:
+        line = ' '.join(rng.choice(vocabulary) for _ in range(12))
+        if rng.random() < 0.05:
+            line = '• ' + line
+        lines.append(line)
+        size += len(line) + 1
+    return '\n'.join(lines)
+
+
+def build_text(vocabulary, megabytes, seed=0):
+    rng = random.Random(seed)
+    words = []
+    size = 0
+    while size < megabytes * 1024 * 1024:
+        word = rng.choice(vocabulary)
+        words.append(word)
+        size += len(word) + 1
+    return ' '.join(words)
+
+
+def measure(func, text, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(text)
+        best = min(best, time.perf_counter() - started)
+    return len(text) / best / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--mb', type=int, default=8, help='Tamanho do texto (MB)')
+    parser.add_argument('--repeat', type=int, default=3, help='Repetições (usa a melhor)')
+    args = parser.parse_args()
+    
+    candidates = {
+        'legacy (3x re.sub)': legacy_clean,
+        'TextNormalizer': TextNormalizer().normalize,
+        'TextNormalizer(paragraphs)': TextNormalizer(keep_paragraphs=True).normalize,
+    }
+    
+    print(f"{'texto':<12}{'implementação':<30}{'MB/s':>8}{'ganho':>8}")
+    texts = {
+        'relatório': build_report_text(args.mb),
+        'ruído/en': build_text(ENGLISH, args.mb),
+        'ruído/pt': build_text(PORTUGUESE, args.mb),
+    }
+    
+    for label, text in texts.items():
+        baseline = None
+        for name, func in candidates.items():
+            func(text[:10000])  # Aquecer tabela de tradução
+            throughput = measure(func, text, args.repeat)
+            baseline = baseline or throughput
+            print(f"{label:<12}{name:<30}{throughput:>8.1f}{throughput / baseline:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
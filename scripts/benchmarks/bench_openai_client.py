@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cliente AsyncOpenAI por engine vs cliente compartilhado do processo
+
+Sobe um servidor local compatível com /v1/chat/completions que simula o
+custo de abrir conexão (TCP + TLS) com um atraso por conexão nova e a
+latência do modelo com um atraso por requisição. Compara:
+
+- por engine:    um AsyncOpenAI (e um pool) para cada um dos quatro engines
+- compartilhado: get_openai_client, um pool para o processo
+
+Caminho frio: primeira chamada de cada engine (uma requisição que passa
+por Validator, Bridge, Radar e Manus). Caminho quente: rajadas
+concorrentes com as conexões já abertas.
+
+Uso:
+    python scripts/benchmarks/bench_openai_client.py [--handshake-ms 60] [--latency-ms 20] [--rounds 20]
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from openai import AsyncOpenAI  # noqa: E402
+from src.ai.core.llm import close_openai_clients, get_openai_client  # noqa: E402
+
+ENGINES = ('validator', 'bridge', 'radar', 'manus')
+
+COMPLETION = json.dumps({
+    'id': 'chatcmpl-bench',
+    'object': 'chat.completion',
+    'created': 0,
+    'model': 'gpt-4o',
+    'choices': [{
+        'index': 0,
+        'message': {'role': 'assistant', 'content': 'ok'},
+        'finish_reason': 'stop'
+    }],
+    'usage': {'prompt_tokens': 1, 'completion_tokens': 1, 'total_tokens': 2}
+}).encode('utf-8')
+
+
+class FakeOpenAIServer:
+    """Servidor HTTP/1.1 keep-alive mínimo para chat.completions"""
+    
+    def __init__(self, handshake_s, latency_s):
+        self.handshake_s = handshake_s
+        self.latency_s = latency_s
+        self.connections = 0
+        self._server = None
+    
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, '127.0.0.1', 0)
+        port = self._server.sockets[0].getsockname()[1]
+        return f'http://127.0.0.1:{port}/v1'
+    
+    async def stop(self):
+        self._server.close()
+        await self._server.wait_closed()
+    
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        await asyncio.sleep(self.handshake_s)  # Handshake TCP + TLS simulado
+        try:
+            while True:
+                head = await reader.readuntil(b'\r\n\r\n')
+                length = 0
+                for line in head.split(b'\r\n'):
+                    if line.lower().startswith(b'content-length:'):
+                        length = int(line.split(b':', 1)[1])
+                await reader.readexactly(length)
+                await asyncio.sleep(self.latency_s)
+                writer.write(
+                    b'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n'
+                    b'Connection: keep-alive\r\nContent-Length: '
+                    + str(len(COMPLETION)).encode() + b'\r\n\r\n' + COMPLETION
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+async def call(client):
+    started = time.perf_counter()
+    await client.chat.completions.create(
+        model='gpt-4o',
+        messages=[{'role': 'user', 'content': 'ping'}],
+        max_tokens=1
+    )
+    return time.perf_counter() - started
+
+
+async def run_scenario(label, make_client, server, args):
+    connections_before = server.connections
+    clients = {engine: make_client() for engine in ENGINES}
+    
+    # Caminho frio: primeira chamada de cada engine, em sequência
+    started = time.perf_counter()
+    for engine in ENGINES:
+        await call(clients[engine])
+    cold = time.perf_counter() - started
+    
+    # Caminho quente: rajadas concorrentes em todos os engines
+    latencies = []
+    for _ in range(args.rounds):
+        latencies.extend(await asyncio.gather(*(
+            call(clients[engine]) for engine in ENGINES for _ in range(args.concurrency)
+        )))
+    
+    for client in set(clients.values()):
+        await client.close()
+    
+    return {
+        'label': label,
+        'cold_ms': cold * 1000,
+        'warm_p50_ms': statistics.median(latencies) * 1000,
+        'warm_p95_ms': sorted(latencies)[int(0.95 * (len(latencies) - 1))] * 1000,
+        'connections': server.connections - connections_before
+    }
+
+
+async def main_async(args):
+    server = FakeOpenAIServer(args.handshake_ms / 1000, args.latency_ms / 1000)
+    base_url = await server.start()
+    
+    try:
+        results = [
+            await run_scenario(
+                'por engine',
+                lambda: AsyncOpenAI(api_key='sk-benchmark', base_url=base_url),
+                server,
+                args
+            ),
+            await run_scenario(
+                'compartilhado',
+                lambda: get_openai_client('sk-benchmark', base_url=base_url),
+                server,
+                args
+            ),
+        ]
+    finally:
+        await close_openai_clients()
+        await server.stop()
+    
+    baseline = results[0]
+    print(f"{'cliente':<16}{'frio ms':>10}{'quente p50':>12}{'quente p95':>12}{'conexões':>10}{'ganho frio':>12}")
+    for result in results:
+        print(
+            f"{result['label']:<16}{result['cold_ms']:>10.1f}{result['warm_p50_ms']:>12.1f}"
+            f"{result['warm_p95_ms']:>12.1f}{result['connections']:>10}"
+            f"{baseline['cold_ms'] / result['cold_ms']:>11.2f}x"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--handshake-ms', type=float, default=60, help='Custo de uma conexão nova (ms)')
+    parser.add_argument('--latency-ms', type=float, default=20, help='Latência do modelo por requisição (ms)')
+    parser.add_argument('--rounds', type=int, default=20, help='Rajadas no caminho quente')
+    parser.add_argument('--concurrency', type=int, default=4, help='Requisições simultâneas por engine')
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Benchmark: re-extração de uma revisão de relatório com cache por página
+
+Extrai a revisão 1 de um relatório sintético e, em seguida, a revisão 2
+(com poucas páginas alteradas) com e sem deduplicação de páginas.
+
+Uso:
+    python scripts/benchmarks/bench_page_dedup.py [--pages 300] [--changed 5]
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from fixtures import build_pdf, lorem  # noqa: E402
+from src.ai.core.validator import DocumentPreprocessor, ExtractionCache  # noqa: E402
+
+
+async def extract(preprocessor, path):
+    started = time.perf_counter()
+    result = await preprocessor.extract(str(path))
+    return time.perf_counter() - started, result
+
+
+async def run(tmp, page_count, changed):
+    pages = [[lorem(12, seed=page * 100 + line) for line in range(40)] for page in range(page_count)]
+    original = Path(tmp) / "rev1.pdf"
+    original.write_bytes(build_pdf(pages))
+    
+    for page in random.Random(0).sample(range(page_count), changed):
+        pages[page] = [lorem(12, seed=10 ** 6 + page * 100 + line) for line in range(40)]
+    revision = Path(tmp) / "rev2.pdf"
+    revision.write_bytes(build_pdf(pages))
+    
+    cache = ExtractionCache(str(Path(tmp) / "cache.db"))
+    dedup = DocumentPreprocessor(max_workers=0, cache=cache)
+    plain = DocumentPreprocessor(max_workers=0, cache=cache, dedup_pages=False)
+    
+    elapsed_first, _ = await extract(dedup, original)
+    elapsed_plain, result_plain = await extract(plain, revision)
+    # Remover a entrada do documento inteiro para medir apenas o cache por página
+    cache.clear()
+    await extract(dedup, original)
+    elapsed_dedup, result_dedup = await extract(dedup, revision)
+    
+    assert result_dedup.text == result_plain.text
+    
+    print(f"{'extração':<30}{'tempo':>9}{'reaproveitadas':>16}")
+    print(f"{'revisão 1 (cache frio)':<30}{elapsed_first:>8.2f}s{0:>16}")
+    print(f"{'revisão 2 sem dedup':<30}{elapsed_plain:>8.2f}s{0:>16}")
+    print(f"{'revisão 2 com dedup':<30}{elapsed_dedup:>8.2f}s{result_dedup.metadata['reused_pages']:>16}")
+    print(f"ganho: {elapsed_plain / elapsed_dedup:.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--pages', type=int, default=300, help='Páginas do relatório')
+    parser.add_argument('--changed', type=int, default=5, help='Páginas alteradas na revisão')
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(run(tmp, args.pages, args.changed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark: escalonamento da extração paralela de PDF por faixas de páginas
+
+Mede páginas/s de DocumentPreprocessor.preprocess_text em um PDF grande
+com o backend de threads e com o pool de processos usando 1, 2, 4 e 8
+workers (faixas paralelas habilitadas a partir de 1 página).
+
+Uso:
+    python scripts/benchmarks/bench_parallel_pdf.py [--pages 600] [--workers 1 2 4 8]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from fixtures import build_report_pdf  # noqa: E402
+from src.ai.core.validator import DocumentPreprocessor  # noqa: E402
+
+
+async def extract(preprocessor, path):
+    # Pool criado antes da medição para não contar o fork dos workers
+    if preprocessor.max_workers > 0:
+        executor = preprocessor._get_executor()
+        await asyncio.gather(*(
+            asyncio.get_running_loop().run_in_executor(executor, os.getpid)
+            for _ in range(preprocessor.max_workers)
+        ))
+    
+    started = time.perf_counter()
+    await preprocessor.preprocess_text(str(path))
+    elapsed = time.perf_counter() - started
+    preprocessor.shutdown()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--pages', type=int, default=600, help='Páginas do PDF')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "report.pdf"
+        path.write_bytes(build_report_pdf(args.pages))
+        
+        print(f"{args.pages} páginas, {os.cpu_count()} CPUs disponíveis")
+        print(f"{'backend':<14}{'tempo':>9}{'páginas/s':>11}{'escala':>8}")
+        
+        elapsed = asyncio.run(extract(DocumentPreprocessor(max_workers=0), path))
+        print(f"{'thread':<14}{elapsed:>8.2f}s{args.pages / elapsed:>11.1f}{'':>8}")
+        
+        baseline = None
+        for workers in args.workers:
+            preprocessor = DocumentPreprocessor(
+                max_workers=workers, parallel_page_threshold=1, parallel_workers=workers
+            )
+            elapsed = asyncio.run(extract(preprocessor, path))
+            rate = args.pages / elapsed
+            baseline = baseline or rate
+            print(f"{f'process({workers})':<14}{elapsed:>8.2f}s{rate:>11.1f}{rate / baseline:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+QIVO Benchmarks - Fixtures
+Geração de documentos sintéticos para os benchmarks do Validator AI
+"""
+
+import io
+import random
+import zipfile
+from typing import List
+from xml.sax.saxutils import escape
+
+WORDS = [
+    'mineral', 'resource', 'estimate', 'drilling', 'assay', 'sampling', 'grade',
+    'tonnes', 'indicated', 'inferred', 'measured', 'qualified', 'person', 'report',
+    'deposit', 'geology', 'core', 'recovery', 'blank', 'duplicate', 'density',
+    'cut-off', 'open', 'pit', 'underground', 'metallurgical', 'testwork', 'reserve'
+]
+
+
+def lorem(words: int, seed: int = 0) -> str:
+    """Gera texto técnico pseudoaleatório com o número de palavras pedido"""
+    rng = random.Random(seed)
+    return ' '.join(rng.choice(WORDS) for _ in range(words))
+
+
+def build_pdf(pages: List[List[str]]) -> bytes:
+    """
+    Gera um PDF válido e mínimo
+    
+    Args:
+        pages: Lista de páginas, cada uma com suas linhas de texto (ASCII, sem parênteses)
+    
+    Returns:
+        Bytes do PDF
+    """
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        None,
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    kids = []
+    
+    for lines in pages:
+        ops = ["BT /F1 10 Tf 12 TL 50 750 Td"]
+        ops.extend(f"({line}) Tj T*" for line in lines)
+        ops.append("ET")
+        stream = '\n'.join(ops)
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        content_id = len(objects)
+        objects.append(
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>"
+        )
+        kids.append(f"{len(objects)} 0 R")
+    
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+    
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode('latin-1')
+    
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        out += f"{offset:010d} 00000 n \n".encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    
+    return bytes(out)
+
+
+def build_report_pdf(page_count: int, lines_per_page: int = 40, seed: int = 0) -> bytes:
+    """Gera um relatório técnico sintético com page_count páginas"""
+    pages = [
+        [lorem(12, seed=seed * 100000 + page * 100 + line) for line in range(lines_per_page)]
+        for page in range(page_count)
+    ]
+    return build_pdf(pages)
+
+
+_DOCX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '</Types>'
+)
+
+_DOCX_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Target="word/document.xml" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"/>'
+    '</Relationships>'
+)
+
+
+def build_docx(paragraphs: List[str], rows: List[List[str]]) -> bytes:
+    """
+    Gera um DOCX mínimo (parágrafos seguidos de uma tabela)
+    
+    Escreve o XML diretamente: montar tabelas grandes com python-docx
+    levaria mais tempo que o próprio benchmark.
+    """
+    def paragraph(text):
+        return f'<w:p><w:r><w:t xml:space="preserve">{escape(text)}</w:t></w:r></w:p>'
+    
+    body = [paragraph(text) for text in paragraphs]
+    body.append('<w:tbl>')
+    for cells in rows:
+        body.append('<w:tr>' + ''.join(f'<w:tc>{paragraph(text)}</w:tc>' for text in cells) + '</w:tr>')
+    body.append('</w:tbl><w:sectPr/>')
+    
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f'<w:body>{"".join(body)}</w:body></w:document>'
+    )
+    
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, 'w', zipfile.ZIP_DEFLATED) as package:
+        package.writestr('[Content_Types].xml', _DOCX_CONTENT_TYPES)
+        package.writestr('_rels/.rels', _DOCX_RELS)
+        package.writestr('word/document.xml', document)
+    
+    return out.getvalue()
@@ -9,6 +9,8 @@ from typing import Dict, Any, Optional, Literal
 from openai import AsyncOpenAI
 from datetime import datetime, timezone
 
+from ..llm import cached_completion, get_openai_client, get_token_budget
+
 
 # Tipos de normas suportadas
 NormType = Literal['ANM', 'JORC', 'NI43-101', 'PERC', 'SAMREC']
@@ -60,24 +62,29 @@ class BridgeAI:
         }
     }
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, client: Optional[AsyncOpenAI] = None):
         """
         Inicializa Bridge AI
         
         Args:
             api_key: OpenAI API key (usa variável de ambiente se não fornecida)
+            client: Cliente OpenAI (padrão: cliente compartilhado do processo)
         """
         self.api_key = api_key or os.getenv('OPENAI_API_KEY')
         
         if not self.api_key:
             raise ValueError("OPENAI_API_KEY não configurada")
         
-        self.client = AsyncOpenAI(api_key=self.api_key)
+        self.client = client or get_openai_client(self.api_key)
         
         # Configurações do modelo
         self.model = "gpt-4o"  # GPT-4 Turbo para melhor raciocínio
         self.max_tokens = 3000
         self.temperature = 0.2  # Baixa para consistência em traduções técnicas
+        
+        # Tokens do texto por tradução (teto de custo; 0 = toda a janela do
+        # modelo menos prompt e resposta)
+        self.max_input_tokens = int(os.getenv('QIVO_BRIDGE_INPUT_TOKENS', '2000'))
     
     async def translate_normative(
         self,
@@ -112,17 +119,27 @@ class BridgeAI:
             if source_norm == target_norm:
                 raise ValueError("Normas de origem e destino devem ser diferentes")
             
-            # Limitar tamanho do texto
-            max_chars = 8000
-            if len(text) > max_chars:
-                text = text[:max_chars] + "\n\n[... texto truncado ...]"
-            
             # Construir prompt especializado
             system_prompt = self._build_system_prompt(source_norm, target_norm)
+            
+            # Limitar o texto ao que cabe na janela após prompt e resposta
+            template = [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": self._build_user_prompt('', source_norm, target_norm, explain)}
+            ]
+            text = get_token_budget(self.model).fit(
+                text,
+                template,
+                self.max_tokens,
+                limit=self.max_input_tokens,
+                marker="\n\n[... texto truncado ...]"
+            )
             user_prompt = self._build_user_prompt(text, source_norm, target_norm, explain)
             
             # Chamar GPT-4
-            response = await self.client.chat.completions.create(
+            content = await cached_completion(
+                self.client,
+                'bridge',
                 model=self.model,
                 messages=[
                     {"role": "system", "content": system_prompt},
@@ -134,7 +151,7 @@ class BridgeAI:
             )
             
             # Parsear resposta
-            result_json = json.loads(response.choices[0].message.content)
+            result_json = json.loads(content)
             
             # Compilar resultado final
             result = {
@@ -283,7 +300,9 @@ Forneça uma análise comparativa em JSON:
     "practical_impact": "Impacto prático das diferenças"
 }}"""
             
-            response = await self.client.chat.completions.create(
+            content = await cached_completion(
+                self.client,
+                'bridge',
                 model=self.model,
                 messages=[
                     {"role": "system", "content": system_prompt},
@@ -294,7 +313,7 @@ Forneça uma análise comparativa em JSON:
                 response_format={"type": "json_object"}
             )
             
-            result = json.loads(response.choices[0].message.content)
+            result = json.loads(content)
             result['status'] = 'success'
             result['timestamp'] = self._get_timestamp()
             
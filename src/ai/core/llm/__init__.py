@@ -0,0 +1,19 @@
+"""
+QIVO Intelligence Layer - LLM Module
+Infraestrutura compartilhada das chamadas ao OpenAI (cliente compartilhado, cache de respostas, orçamento de tokens, limite de taxa)
+"""
+
+from .cache import (
+    LLMResponseCache, cached_completion, cached_stream, get_llm_cache, llm_cache_bypass,
+    request_key
+)
+from .client import build_http_client, close_openai_clients, get_openai_client
+from .limiter import RateLimiter, current_priority, get_rate_limiter, llm_priority
+from .tokens import TokenBudget, context_window, get_token_budget
+
+__all__ = [
+    'LLMResponseCache', 'cached_completion', 'cached_stream', 'get_llm_cache',
+    'llm_cache_bypass', 'request_key', 'build_http_client', 'close_openai_clients',
+    'get_openai_client', 'RateLimiter', 'current_priority', 'get_rate_limiter', 'llm_priority',
+    'TokenBudget', 'context_window', 'get_token_budget'
+]
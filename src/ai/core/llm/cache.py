@@ -0,0 +1,407 @@
+"""
+QIVO Intelligence Layer - LLM Cache Module
+Cache persistente (SQLite) de respostas do chat completions, compartilhado entre engines
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing, contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from .limiter import get_rate_limiter
+from .tokens import get_token_budget
+
+# Ignora o cache nas chamadas feitas dentro de llm_cache_bypass()
+_bypass: ContextVar[bool] = ContextVar('qivo_llm_cache_bypass', default=False)
+
+
+def normalize_messages(messages: List[Mapping[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Forma canônica das mensagens para a chave do cache
+    
+    Espaços nas bordas, espaços no fim das linhas e quebras de linha
+    Windows não mudam a chave; o restante do conteúdo é mantido.
+    """
+    normalized = []
+    for message in messages:
+        item = dict(message)
+        content = item.get('content')
+        if isinstance(content, str):
+            lines = content.replace('\r\n', '\n').strip().split('\n')
+            item['content'] = '\n'.join(line.rstrip() for line in lines)
+        normalized.append(item)
+    return normalized
+
+
+def request_key(
+    model: str,
+    messages: List[Mapping[str, Any]],
+    temperature: Optional[float] = None,
+    response_format: Optional[Mapping[str, Any]] = None,
+    max_tokens: Optional[int] = None
+) -> str:
+    """SHA-256 de (model, mensagens normalizadas, temperature, response_format, max_tokens)"""
+    canonical = json.dumps(
+        [model, normalize_messages(messages), temperature, response_format, max_tokens],
+        sort_keys=True,
+        ensure_ascii=False
+    )
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+@contextmanager
+def llm_cache_bypass() -> Iterator[None]:
+    """
+    Ignora o cache (leitura e escrita) nas chamadas feitas dentro do bloco
+    
+    Vale para a tarefa asyncio corrente, sem afetar requisições concorrentes:
+        with llm_cache_bypass():
+            await bridge.translate_normative(...)
+    """
+    token = _bypass.set(True)
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
+
+
+class LLMResponseCache:
+    """
+    Store LRU de respostas do chat completions com TTL
+    
+    Cada entrada guarda o conteúdo da resposta indexado por request_key.
+    Entradas mais antigas que ttl_s são ignoradas e removidas; quando o
+    total ultrapassa max_bytes, as acessadas há mais tempo são removidas.
+    Hits, misses e chamadas que ignoraram o cache são contados por engine.
+    """
+    
+    def __init__(self, path: str, ttl_s: float = 7 * 24 * 3600, max_bytes: int = 256 * 1024 * 1024):
+        """
+        Inicializa o cache
+        
+        Args:
+            path: Caminho do arquivo SQLite
+            ttl_s: Validade de uma resposta em segundos
+            max_bytes: Tamanho máximo somado das respostas
+        """
+        self.path = Path(path)
+        self.ttl_s = ttl_s
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        self._counters: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+        
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    engine TEXT NOT NULL,
+                    content TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_responses_access ON responses (last_access)"
+            )
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Abre conexão (uma por operação, seguro entre threads)"""
+        return sqlite3.connect(self.path, timeout=30)
+    
+    def _count(self, engine: str, counter: str):
+        counters = self._counters.setdefault(engine, {'hits': 0, 'misses': 0, 'bypassed': 0})
+        counters[counter] += 1
+    
+    def get(self, key: str, engine: str) -> Optional[str]:
+        """
+        Busca resposta no cache
+        
+        Args:
+            key: Resultado de request_key
+            engine: Engine que faz a chamada (para as métricas)
+        
+        Returns:
+            Conteúdo da resposta ou None se ausente ou expirada
+        """
+        now = time.time()
+        with self._lock, closing(self._connect()) as conn, conn:
+            row = conn.execute(
+                "SELECT content, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            
+            if row is not None and now - row[1] > self.ttl_s:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                row = None
+            
+            if row is None:
+                self._count(engine, 'misses')
+                return None
+            
+            conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self._count(engine, 'hits')
+        return row[0]
+    
+    def put(self, key: str, engine: str, content: str):
+        """
+        Armazena resposta e aplica TTL e limite de tamanho (LRU)
+        
+        Args:
+            key: Resultado de request_key
+            engine: Engine que fez a chamada
+            content: Conteúdo da resposta
+        """
+        size = len(content.encode('utf-8'))
+        
+        # Respostas maiores que o próprio cache não são armazenadas
+        if size > self.max_bytes:
+            return
+        
+        now = time.time()
+        with self._lock, closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, engine, content, size, created_at, last_access) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, engine, content, size, now, now)
+            )
+            self._evict(conn, now)
+    
+    def record_bypass(self, engine: str):
+        """Conta uma chamada que ignorou o cache"""
+        with self._lock:
+            self._count(engine, 'bypassed')
+    
+    def _evict(self, conn: sqlite3.Connection, now: float):
+        """Remove as expiradas e as menos recentes até caber em max_bytes"""
+        expired = conn.execute(
+            "DELETE FROM responses WHERE created_at < ?", (now - self.ttl_s,)
+        ).rowcount
+        self.evictions += max(expired, 0)
+        
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        
+        rows = conn.execute(
+            "SELECT key, size FROM responses ORDER BY last_access ASC"
+        ).fetchall()
+        
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            self.evictions += 1
+    
+    def clear(self):
+        """Remove todas as entradas"""
+        with self._lock, closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM responses")
+    
+    def stats(self) -> Dict[str, Any]:
+        """Retorna contadores por engine, hit rate e ocupação"""
+        with closing(self._connect()) as conn:
+            entries, total = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        
+        with self._lock:
+            engines = {engine: dict(counters) for engine, counters in self._counters.items()}
+        
+        for counters in engines.values():
+            lookups = counters['hits'] + counters['misses']
+            counters['hit_rate'] = round(counters['hits'] / lookups, 4) if lookups else 0.0
+        
+        hits = sum(counters['hits'] for counters in engines.values())
+        lookups = hits + sum(counters['misses'] for counters in engines.values())
+        return {
+            'engines': engines,
+            'hit_rate': round(hits / lookups, 4) if lookups else 0.0,
+            'evictions': self.evictions,
+            'entries': entries,
+            'size_bytes': total,
+            'max_bytes': self.max_bytes,
+            'ttl_s': self.ttl_s
+        }
+
+
+_shared_cache: Optional[LLMResponseCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """
+    Cache compartilhado pelos engines do processo
+    
+    Configurado por QIVO_LLM_CACHE_PATH, QIVO_LLM_CACHE_TTL_S e
+    QIVO_LLM_CACHE_MAX_MB; sem cache se QIVO_LLM_CACHE_PATH não estiver definido.
+    """
+    global _shared_cache
+    path = os.getenv('QIVO_LLM_CACHE_PATH')
+    if not path:
+        return None
+    
+    with _shared_lock:
+        if _shared_cache is None or str(_shared_cache.path) != str(Path(path)):
+            _shared_cache = LLMResponseCache(
+                path,
+                ttl_s=float(os.getenv('QIVO_LLM_CACHE_TTL_S', str(7 * 24 * 3600))),
+                max_bytes=int(os.getenv('QIVO_LLM_CACHE_MAX_MB', '256')) * 1024 * 1024
+            )
+        return _shared_cache
+
+
+async def _lookup(
+    cache: Optional[LLMResponseCache],
+    engine: str,
+    bypass_cache: bool,
+    request: Mapping[str, Any]
+) -> Tuple[Optional[str], Optional[str]]:
+    """
+    (chave para gravar a resposta, conteúdo em cache); chave None = não gravar
+    
+    A leitura do SQLite roda em uma thread: com o banco bloqueado por outro
+    processo ela pode esperar até o timeout da conexão sem travar o event loop.
+    """
+    if cache is None:
+        return None, None
+    if bypass_cache or _bypass.get():
+        cache.record_bypass(engine)
+        return None, None
+    
+    key = request_key(
+        request['model'],
+        request['messages'],
+        request.get('temperature'),
+        request.get('response_format'),
+        request.get('max_tokens')
+    )
+    return key, await asyncio.to_thread(cache.get, key, engine)
+
+
+def _estimated_tokens(request: Mapping[str, Any]) -> int:
+    """Tokens que a chamada pode consumir: prompt + max_tokens"""
+    prompt = get_token_budget(request['model']).count_messages(request['messages'])
+    return prompt + (request.get('max_tokens') or 0)
+
+
+async def cached_completion(
+    client: Any,
+    engine: str,
+    *,
+    cache: Optional[LLMResponseCache] = None,
+    bypass_cache: bool = False,
+    **request: Any
+) -> Optional[str]:
+    """
+    chat.completions.create com cache da resposta
+    
+    Args:
+        client: Cliente AsyncOpenAI do engine
+        engine: Nome do engine (métricas por engine)
+        cache: Cache a usar (padrão: get_llm_cache())
+        bypass_cache: Ignora o cache nesta chamada (também via llm_cache_bypass())
+        **request: Argumentos de chat.completions.create (model, messages, ...)
+    
+    Returns:
+        Conteúdo da primeira escolha (message.content)
+    """
+    cache = cache or get_llm_cache()
+    key, content = await _lookup(cache, engine, bypass_cache, request)
+    if content is not None:
+        return content
+    
+    # Respostas em cache não passam pelo limitador
+    limiter = get_rate_limiter()
+    reserved = await limiter.acquire(_estimated_tokens(request)) if limiter else 0
+    used: Optional[int] = 0  # Chamada que falhou devolve a reserva inteira
+    try:
+        response = await client.chat.completions.create(**request)
+        used = getattr(getattr(response, 'usage', None), 'total_tokens', None)
+    finally:
+        if limiter:
+            limiter.release(reserved, used)
+    
+    content = response.choices[0].message.content
+    if key is not None and content is not None:
+        await asyncio.to_thread(cache.put, key, engine, content)
+    return content
+
+
+async def cached_stream(
+    client: Any,
+    engine: str,
+    *,
+    cache: Optional[LLMResponseCache] = None,
+    bypass_cache: bool = False,
+    **request: Any
+) -> AsyncIterator[str]:
+    """
+    chat.completions.create com stream=True e cache da resposta completa
+    
+    A chave é a mesma de cached_completion: uma resposta em cache é
+    enviada de uma vez, e uma resposta recebida em partes fica disponível
+    para chamadas sem stream.
+    
+    Args:
+        client: Cliente AsyncOpenAI do engine
+        engine: Nome do engine (métricas por engine)
+        cache: Cache a usar (padrão: get_llm_cache())
+        bypass_cache: Ignora o cache nesta chamada (também via llm_cache_bypass())
+        **request: Argumentos de chat.completions.create (sem stream e
+            stream_options; com limitador ativo o uso é pedido no stream)
+    
+    Yields:
+        Trechos do conteúdo da primeira escolha, em ordem
+    """
+    cache = cache or get_llm_cache()
+    key, content = await _lookup(cache, engine, bypass_cache, request)
+    if content is not None:
+        yield content
+        return
+    
+    limiter = get_rate_limiter()
+    if limiter is None:
+        options = {}
+        reserved = 0
+    else:
+        # Uso real no último pedaço do stream, para acertar a reserva
+        options = {'stream_options': {'include_usage': True}}
+        reserved = await limiter.acquire(_estimated_tokens(request))
+    
+    parts = []
+    used: Optional[int] = 0  # Chamada que falhou devolve a reserva inteira
+    try:
+        stream = await client.chat.completions.create(stream=True, **options, **request)
+        used = None
+        async for chunk in stream:
+            usage = getattr(chunk, 'usage', None)
+            if usage is not None:
+                used = usage.total_tokens
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                parts.append(delta)
+                yield delta
+    finally:
+        if limiter:
+            if used is None:
+                # Interrompido antes do uso final: prompt + o que já foi gerado
+                budget = get_token_budget(request['model'])
+                used = budget.count_messages(request['messages']) + budget.count(''.join(parts))
+            limiter.release(reserved, used)
+    
+    if key is not None and parts:
+        await asyncio.to_thread(cache.put, key, engine, ''.join(parts))
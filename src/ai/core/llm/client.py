@@ -0,0 +1,92 @@
+"""
+QIVO Intelligence Layer - LLM Client Module
+Cliente AsyncOpenAI compartilhado pelos engines, com pool de conexões configurável
+"""
+
+import logging
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+from openai import DEFAULT_CONNECTION_LIMITS, AsyncOpenAI, DefaultAsyncHttpxClient, Timeout
+
+logger = logging.getLogger(__name__)
+
+_clients: Dict[Tuple[str, Optional[str]], AsyncOpenAI] = {}
+_clients_lock = threading.Lock()
+
+
+def _http2_enabled() -> bool:
+    """HTTP/2 pedido por QIVO_HTTP2=1 e pacote h2 instalado"""
+    if os.getenv('QIVO_HTTP2', '0') != '1':
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        logger.warning("QIVO_HTTP2=1 sem o pacote h2 (httpx[http2]); usando HTTP/1.1")
+        return False
+    return True
+
+
+def build_http_client() -> DefaultAsyncHttpxClient:
+    """
+    Cliente HTTP do SDK com pool, keep-alive e timeouts do ambiente
+    
+    Variáveis:
+        QIVO_HTTP_MAX_CONNECTIONS: Conexões simultâneas no processo (100)
+        QIVO_HTTP_MAX_KEEPALIVE: Conexões ociosas mantidas abertas (20)
+        QIVO_HTTP_KEEPALIVE_S: Tempo máximo de uma conexão ociosa (60)
+        QIVO_HTTP_CONNECT_TIMEOUT_S: Timeout de conexão/TLS (5)
+        QIVO_HTTP_TIMEOUT_S: Timeout de leitura/escrita (120)
+        QIVO_HTTP2: 1 para HTTP/2 (requer httpx[http2])
+    """
+    # Classes do cliente HTTP que o SDK instalado usa
+    limits = type(DEFAULT_CONNECTION_LIMITS)(
+        max_connections=int(os.getenv('QIVO_HTTP_MAX_CONNECTIONS', '100')),
+        max_keepalive_connections=int(os.getenv('QIVO_HTTP_MAX_KEEPALIVE', '20')),
+        keepalive_expiry=float(os.getenv('QIVO_HTTP_KEEPALIVE_S', '60'))
+    )
+    timeout = Timeout(
+        float(os.getenv('QIVO_HTTP_TIMEOUT_S', '120')),
+        connect=float(os.getenv('QIVO_HTTP_CONNECT_TIMEOUT_S', '5'))
+    )
+    return DefaultAsyncHttpxClient(limits=limits, timeout=timeout, http2=_http2_enabled())
+
+
+def get_openai_client(api_key: str, base_url: Optional[str] = None) -> AsyncOpenAI:
+    """
+    AsyncOpenAI do processo para a chave (e base_url)
+    
+    Engines com a mesma chave compartilham o cliente e, com ele, o pool de
+    conexões: o handshake TLS é pago uma vez e o limite de conexões vale
+    para o processo inteiro.
+    
+    Args:
+        api_key: OpenAI API key
+        base_url: Endpoint alternativo (padrão: OPENAI_BASE_URL ou api.openai.com)
+    
+    Returns:
+        Cliente compartilhado
+    """
+    base_url = base_url or os.getenv('OPENAI_BASE_URL') or None
+    key = (api_key, base_url)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = AsyncOpenAI(
+                api_key=api_key,
+                base_url=base_url,
+                http_client=build_http_client(),
+                max_retries=int(os.getenv('QIVO_OPENAI_MAX_RETRIES', '2'))
+            )
+            _clients[key] = client
+        return client
+
+
+async def close_openai_clients():
+    """Fecha os clientes compartilhados (encerramento da aplicação)"""
+    with _clients_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        await client.close()
@@ -0,0 +1,244 @@
+"""
+QIVO Intelligence Layer - LLM Limiter Module
+Limite de requisições/min e tokens/min do processo, com prioridade entre tráfego interativo e em lote
+"""
+
+import asyncio
+import heapq
+import itertools
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Classes de prioridade, da mais urgente para a menos urgente
+PRIORITIES = ('interactive', 'batch')
+
+# Intervalo máximo entre verificações de quem espera na fila (s)
+MAX_POLL_S = 0.25
+
+_priority: ContextVar[str] = ContextVar('qivo_llm_priority', default='interactive')
+
+
+@contextmanager
+def llm_priority(priority: str) -> Iterator[None]:
+    """
+    Classe de prioridade das chamadas feitas dentro do bloco
+    
+    Exemplo:
+        with llm_priority('batch'):
+            await manus.generate_report(...)
+    
+    Tarefas criadas dentro do bloco herdam a prioridade.
+    """
+    if priority not in PRIORITIES:
+        raise ValueError(f"Prioridade inválida: {priority}. Use uma de {list(PRIORITIES)}")
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> str:
+    """Prioridade do contexto atual ('interactive' fora de llm_priority())"""
+    return _priority.get()
+
+
+class TokenBucket:
+    """Balde que enche continuamente até capacity unidades por minuto"""
+    
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self.level = per_minute
+        self.updated = time.monotonic()
+    
+    def refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+    
+    def wait_for(self, amount: float) -> float:
+        """Segundos até haver amount no balde (0 se já houver)"""
+        return max(amount - self.level, 0.0) / self.rate
+
+
+class RateLimiter:
+    """
+    Limitador token bucket de requisições e tokens por minuto
+    
+    Cada chamada reserva 1 requisição e uma estimativa de tokens (prompt +
+    max_tokens) antes de ir ao provedor; o uso real informado na resposta
+    (no stream, no último pedaço) devolve o que sobrou, e uma chamada que
+    falha devolve a reserva inteira. Quem espera fica em uma fila por prioridade e, na
+    mesma prioridade, por ordem de chegada: enquanto houver uma chamada
+    interativa esperando, nenhuma chamada em lote é liberada.
+    
+    O estado é protegido por um threading.Lock e a espera é feita com
+    asyncio.sleep, então o limitador vale para o processo inteiro,
+    independentemente do event loop de cada chamada.
+    """
+    
+    def __init__(self, requests_per_min: Optional[float] = None, tokens_per_min: Optional[float] = None):
+        """
+        Inicializa o limitador
+        
+        Args:
+            requests_per_min: Requisições por minuto (None ou 0 = sem limite)
+            tokens_per_min: Tokens por minuto (None ou 0 = sem limite)
+        """
+        self.requests = TokenBucket(requests_per_min) if requests_per_min else None
+        self.tokens = TokenBucket(tokens_per_min) if tokens_per_min else None
+        self._queue: List[Tuple[int, int]] = []
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self._waits = {
+            priority: {'acquired': 0, 'waited': 0, 'wait_total_s': 0.0, 'wait_max_s': 0.0}
+            for priority in PRIORITIES
+        }
+    
+    async def acquire(self, tokens: int, priority: Optional[str] = None) -> int:
+        """
+        Espera a vez e reserva uma requisição e tokens
+        
+        Args:
+            tokens: Tokens estimados da chamada
+            priority: Classe de prioridade (padrão: current_priority())
+        
+        Returns:
+            Tokens reservados (limitados à capacidade do balde), para release()
+        """
+        priority = priority or current_priority()
+        if priority not in PRIORITIES:
+            raise ValueError(f"Prioridade inválida: {priority}. Use uma de {list(PRIORITIES)}")
+        if self.tokens is not None:
+            # Uma chamada maior que o balde nunca caberia
+            tokens = min(tokens, int(self.tokens.capacity))
+        
+        entry = (PRIORITIES.index(priority), next(self._sequence))
+        started = time.monotonic()
+        with self._lock:
+            heapq.heappush(self._queue, entry)
+        
+        try:
+            while True:
+                with self._lock:
+                    delay = self._try_take(entry, tokens)
+                if delay == 0.0:
+                    break
+                await asyncio.sleep(min(delay, MAX_POLL_S))
+        except BaseException:
+            with self._lock:
+                if entry in self._queue:
+                    self._queue.remove(entry)
+                    heapq.heapify(self._queue)
+            raise
+        
+        self._record_wait(priority, time.monotonic() - started)
+        return tokens
+    
+    def release(self, reserved: int, used: Optional[int]):
+        """
+        Devolve ao balde os tokens reservados e não usados
+        
+        Args:
+            reserved: Retorno de acquire()
+            used: Tokens consumidos (0 = chamada falhou; None = desconhecido,
+                a reserva é mantida)
+        """
+        if self.tokens is None or not isinstance(used, int) or used >= reserved:
+            return
+        with self._lock:
+            self.tokens.refill(time.monotonic())
+            self.tokens.level = min(self.tokens.capacity, self.tokens.level + reserved - used)
+    
+    def _try_take(self, entry: Tuple[int, int], tokens: int) -> float:
+        """Reserva se entry é a primeira da fila e há saldo; senão segundos a esperar"""
+        now = time.monotonic()
+        buckets = [(bucket, amount) for bucket, amount in ((self.requests, 1), (self.tokens, tokens)) if bucket]
+        for bucket, _ in buckets:
+            bucket.refill(now)
+        if self._queue[0] != entry:
+            # Atrás de outra chamada: verifica de novo em breve
+            return MAX_POLL_S / 5
+        
+        delay = max((bucket.wait_for(amount) for bucket, amount in buckets), default=0.0)
+        if delay > 0.0:
+            return delay
+        for bucket, amount in buckets:
+            bucket.level -= amount
+        heapq.heappop(self._queue)
+        return 0.0
+    
+    def _record_wait(self, priority: str, waited: float):
+        with self._lock:
+            waits = self._waits[priority]
+            waits['acquired'] += 1
+            waits['wait_total_s'] += waited
+            waits['wait_max_s'] = max(waits['wait_max_s'], waited)
+            if waited >= 0.001:
+                waits['waited'] += 1
+    
+    def stats(self) -> Dict[str, Any]:
+        """Limites, saldo atual, chamadas na fila e espera por prioridade"""
+        with self._lock:
+            now = time.monotonic()
+            for bucket in (self.requests, self.tokens):
+                if bucket:
+                    bucket.refill(now)
+            queued = {priority: 0 for priority in PRIORITIES}
+            for index, _ in self._queue:
+                queued[PRIORITIES[index]] += 1
+            return {
+                'requests_per_min': self.requests.capacity if self.requests else None,
+                'tokens_per_min': self.tokens.capacity if self.tokens else None,
+                'requests_available': round(self.requests.level, 2) if self.requests else None,
+                'tokens_available': round(self.tokens.level) if self.tokens else None,
+                'queued': queued,
+                'wait': {
+                    priority: {
+                        'acquired': waits['acquired'],
+                        'waited': waits['waited'],
+                        'wait_avg_s': round(waits['wait_total_s'] / waits['acquired'], 4) if waits['acquired'] else 0.0,
+                        'wait_max_s': round(waits['wait_max_s'], 4)
+                    }
+                    for priority, waits in self._waits.items()
+                }
+            }
+
+
+_shared_limiter: Optional[RateLimiter] = None
+_shared_config: Optional[Tuple[float, float]] = None
+_shared_lock = threading.Lock()
+
+
+def process_count() -> int:
+    """Processos que dividem o limite (QIVO_LLM_WORKERS, senão WEB_CONCURRENCY, senão 1)"""
+    workers = os.getenv('QIVO_LLM_WORKERS') or os.getenv('WEB_CONCURRENCY') or '1'
+    return max(int(workers), 1)
+
+
+def get_rate_limiter() -> Optional[RateLimiter]:
+    """
+    Limitador compartilhado pelos engines do processo
+    
+    Configurado por QIVO_LLM_RPM e QIVO_LLM_TPM (limites da conta); com
+    vários processos (QIVO_LLM_WORKERS ou WEB_CONCURRENCY) cada um fica com
+    sua fração. Sem limitador se nenhum dos dois estiver definido.
+    """
+    global _shared_limiter, _shared_config
+    workers = process_count()
+    config = (
+        float(os.getenv('QIVO_LLM_RPM', '0')) / workers,
+        float(os.getenv('QIVO_LLM_TPM', '0')) / workers
+    )
+    if not any(config):
+        return None
+    
+    with _shared_lock:
+        if _shared_limiter is None or _shared_config != config:
+            _shared_limiter = RateLimiter(*config)
+            _shared_config = config
+        return _shared_limiter
@@ -0,0 +1,208 @@
+"""
+QIVO Intelligence Layer - LLM Tokens Module
+Orçamento de entrada em tokens (tokenizer local) com contagens memorizadas por hash do texto
+"""
+
+import hashlib
+import logging
+import math
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, List, Mapping, Optional
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - dependência opcional
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+# Janela de contexto (tokens) por modelo; prefixo mais longo vence
+MODEL_CONTEXT = {
+    'gpt-4o': 128000,
+    'gpt-4-turbo': 128000,
+    'gpt-4': 8192,
+    'gpt-3.5-turbo': 16385,
+}
+DEFAULT_CONTEXT = 8192
+
+# Tokens fixos por mensagem e por resposta no formato de chat
+TOKENS_PER_MESSAGE = 4
+TOKENS_PER_REPLY = 3
+
+# Estimativa sem tokenizer (mesma conversão do DocumentPreprocessor)
+CHARS_PER_TOKEN = 4
+
+# Caracteres por token no pior caso: extrair tokens × MAX_CHARS_PER_TOKEN
+# caracteres garante texto suficiente para preencher o orçamento
+MAX_CHARS_PER_TOKEN = 6
+
+TRUNCATION_MARKER = "\n\n[... documento truncado ...]"
+
+
+def context_window(model: str) -> int:
+    """Janela de contexto do modelo (DEFAULT_CONTEXT se desconhecido)"""
+    matches = [prefix for prefix in MODEL_CONTEXT if model.startswith(prefix)]
+    return MODEL_CONTEXT[max(matches, key=len)] if matches else DEFAULT_CONTEXT
+
+
+class TokenBudget:
+    """
+    Contagem e corte de texto em tokens do modelo
+    
+    Usa o tokenizer local do tiktoken; se ele (ou o arquivo da codificação)
+    não estiver disponível, estima CHARS_PER_TOKEN caracteres por token.
+    As contagens ficam em um LRU indexado pelo SHA-1 do texto, então medir
+    de novo o mesmo prompt ou documento não tokeniza outra vez.
+    """
+    
+    def __init__(self, model: str, cache_size: int = 4096):
+        """
+        Inicializa o orçamento
+        
+        Args:
+            model: Modelo OpenAI (define codificação e janela de contexto)
+            cache_size: Contagens memorizadas
+        """
+        self.model = model
+        self.context = context_window(model)
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+        self._counts: 'OrderedDict[bytes, int]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._encoding = self._load_encoding(model)
+    
+    @staticmethod
+    def _load_encoding(model: str) -> Optional[Any]:
+        if tiktoken is None:
+            logger.warning("tiktoken não instalado; tokens estimados por caracteres")
+            return None
+        try:
+            try:
+                return tiktoken.encoding_for_model(model)
+            except KeyError:
+                return tiktoken.get_encoding('o200k_base')
+        except Exception:
+            # Codificação não baixada e sem rede
+            logger.warning("Tokenizer de %s indisponível; tokens estimados por caracteres", model)
+            return None
+    
+    @property
+    def exact(self) -> bool:
+        """True se as contagens vêm do tokenizer (e não da estimativa)"""
+        return self._encoding is not None
+    
+    def count(self, text: str) -> int:
+        """Tokens do texto (memorizado pelo hash do conteúdo)"""
+        key = hashlib.sha1(text.encode('utf-8', 'surrogatepass')).digest()
+        with self._lock:
+            count = self._counts.get(key)
+            if count is not None:
+                self._counts.move_to_end(key)
+                self.hits += 1
+                return count
+            self.misses += 1
+        
+        count = len(self._encode(text)) if self.exact else math.ceil(len(text) / CHARS_PER_TOKEN)
+        
+        with self._lock:
+            self._counts[key] = count
+            while len(self._counts) > self.cache_size:
+                self._counts.popitem(last=False)
+        return count
+    
+    def count_messages(self, messages: List[Mapping[str, Any]]) -> int:
+        """Tokens de uma lista de mensagens de chat, incluindo o início da resposta"""
+        return TOKENS_PER_REPLY + sum(
+            TOKENS_PER_MESSAGE + self.count(message.get('content') or '')
+            for message in messages
+        )
+    
+    def truncate(self, text: str, max_tokens: int, marker: str = TRUNCATION_MARKER) -> str:
+        """
+        Corta o texto para caber em max_tokens (incluindo o marcador)
+        
+        Só os primeiros char_budget(max_tokens) caracteres são tokenizados
+        (uma vez, sem passar pela memória de contagens), então um texto de
+        vários MB custa o mesmo que um que mal passa do orçamento. Um texto
+        maior que esse prefixo é tratado como acima do orçamento.
+        
+        Args:
+            text: Texto
+            max_tokens: Orçamento
+            marker: Anexado quando há corte
+        
+        Returns:
+            O próprio texto se couber; senão o maior prefixo que cabe com o marcador
+        """
+        window = text[:self.char_budget(max_tokens)]
+        if not self.exact:
+            if len(text) <= len(window):
+                return text
+            budget = max(max_tokens - self.count(marker), 0)
+            return text[:budget * CHARS_PER_TOKEN] + marker
+        
+        tokens = self._encode(window)
+        if len(window) == len(text) and len(tokens) <= max_tokens:
+            return text
+        
+        budget = max(max_tokens - self.count(marker), 0)
+        return self._encoding.decode(tokens[:budget]) + marker
+    
+    def available(
+        self,
+        messages: List[Mapping[str, Any]],
+        max_tokens: int,
+        limit: Optional[int] = None
+    ) -> int:
+        """
+        Tokens livres para o documento
+        
+        Args:
+            messages: Mensagens sem o documento (prompt de sistema e template)
+            max_tokens: Tokens reservados para a resposta
+            limit: Teto de custo para o documento (None ou 0 = sem teto)
+        
+        Returns:
+            Janela do modelo menos prompt e resposta, limitada a limit
+        """
+        free = max(self.context - self.count_messages(messages) - max_tokens, 0)
+        return min(free, limit) if limit else free
+    
+    def fit(
+        self,
+        text: str,
+        messages: List[Mapping[str, Any]],
+        max_tokens: int,
+        limit: Optional[int] = None,
+        marker: str = TRUNCATION_MARKER
+    ) -> str:
+        """Corta o texto para caber em available(messages, max_tokens, limit)"""
+        return self.truncate(text, self.available(messages, max_tokens, limit), marker)
+    
+    def char_budget(self, tokens: int) -> int:
+        """Caracteres a extrair para preencher tokens (limite superior)"""
+        return tokens * (MAX_CHARS_PER_TOKEN if self.exact else CHARS_PER_TOKEN)
+    
+    def stats(self) -> Mapping[str, Any]:
+        """Contadores da memória de contagens"""
+        lookups = self.hits + self.misses
+        return {
+            'exact': self.exact,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            'entries': len(self._counts)
+        }
+    
+    def _encode(self, text: str) -> List[int]:
+        # Texto de documentos pode conter marcadores especiais literais
+        return self._encoding.encode(text, disallowed_special=())
+
+
+@lru_cache(maxsize=None)
+def get_token_budget(model: str) -> TokenBudget:
+    """TokenBudget compartilhado por modelo (memória de contagens comum aos engines)"""
+    return TokenBudget(model)
@@ -7,9 +7,13 @@ AI-powered technical report generation following mining industry standards
 from openai import AsyncOpenAI
 from typing import Dict, List, Optional, Any
 import os
+import copy
 import json
 from datetime import datetime, timezone
 
+from ..llm import cached_completion, get_openai_client, llm_priority
+from ..templates import REPORT_TEMPLATES
+
 
 class ManusEngine:
     """
@@ -25,104 +29,21 @@ class ManusEngine:
     - Section management
     """
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, client: Optional[AsyncOpenAI] = None):
         """
         Initialize Manus Engine
         
         Args:
             api_key: OpenAI API key (uses OPENAI_API_KEY env var if not provided)
+            client: OpenAI client (defaults to the process-wide shared client)
         """
         self.api_key = api_key or os.getenv('OPENAI_API_KEY')
-        self.client = AsyncOpenAI(api_key=self.api_key) if self.api_key else None
+        self.client = client or (get_openai_client(self.api_key) if self.api_key else None)
         self.templates = self._load_templates()
     
     def _load_templates(self) -> Dict[str, Dict]:
         """Load template configurations"""
-        return {
-            'jorc_2012': {
-                'name': 'JORC Code 2012',
-                'full_name': 'Australasian Code for Reporting of Exploration Results, Mineral Resources and Ore Reserves (2012 Edition)',
-                'sections': [
-                    'Summary',
-                    'Introduction',
-                    'Geology and Geological Interpretation',
-                    'Sampling and Sub-sampling',
-                    'Sample Analysis and Security',
-                    'Estimation and Reporting of Mineral Resources',
-                    'Estimation and Reporting of Ore Reserves',
-                    'Mining Methods',
-                    'Processing and Metallurgical Testwork',
-                    'Infrastructure',
-                    'Costs',
-                    'Revenue Factors',
-                    'Market Assessment',
-                    'Environmental Studies',
-                    'Social and Community',
-                    'Permitting and Legal',
-                    'Economic Analysis',
-                    'Risks and Opportunities',
-                    'Conclusions and Recommendations'
-                ],
-                'standard': 'JORC',
-                'year': 2012,
-                'jurisdiction': 'Australia'
-            },
-            'ni_43_101': {
-                'name': 'NI 43-101 Technical Report',
-                'full_name': 'National Instrument 43-101 Standards of Disclosure for Mineral Projects',
-                'sections': [
-                    'Title Page',
-                    'Table of Contents',
-                    'Summary',
-                    'Introduction and Terms of Reference',
-                    'Reliance on Other Experts',
-                    'Property Description and Location',
-                    'Accessibility, Climate, Local Resources, Infrastructure',
-                    'History',
-                    'Geological Setting and Mineralization',
-                    'Deposit Types',
-                    'Exploration',
-                    'Drilling',
-                    'Sample Preparation, Analyses and Security',
-                    'Data Verification',
-                    'Mineral Processing and Metallurgical Testing',
-                    'Mineral Resource Estimates',
-                    'Mineral Reserve Estimates',
-                    'Mining Methods',
-                    'Recovery Methods',
-                    'Project Infrastructure',
-                    'Market Studies',
-                    'Environmental Studies, Permitting, Social/Community Impact',
-                    'Capital and Operating Costs',
-                    'Economic Analysis',
-                    'Adjacent Properties',
-                    'Other Relevant Data and Information',
-                    'Interpretation and Conclusions',
-                    'Recommendations',
-                    'References',
-                    'Certificates'
-                ],
-                'standard': 'NI 43-101',
-                'jurisdiction': 'Canada',
-                'exchange': 'TSX'
-            },
-            'prms': {
-                'name': 'PRMS Executive Summary',
-                'full_name': 'Petroleum Resources Management System',
-                'sections': [
-                    'Overview',
-                    'Resources Summary',
-                    'Reserves Summary',
-                    'Economic Analysis',
-                    'Key Assumptions',
-                    'Risks and Uncertainties',
-                    'Recommendations'
-                ],
-                'standard': 'PRMS',
-                'jurisdiction': 'International',
-                'focus': 'Petroleum'
-            }
-        }
+        return copy.deepcopy(REPORT_TEMPLATES)
     
     async def generate_report(
         self,
@@ -159,31 +80,32 @@ class ManusEngine:
             template_config = self.templates[template]
             sections = []
             
-            # Generate each section
-            for section_name in template_config['sections']:
-                try:
-                    content = await self.generate_section(
-                        section_name=section_name,
-                        template=template,
-                        project_data=project_data
-                    )
-                    sections.append({
-                        'name': section_name,
-                        'content': content,
-                        'word_count': len(content.split())
-                    })
-                except Exception as e:
-                    sections.append({
-                        'name': section_name,
-                        'content': f"[Error generating section: {str(e)}]",
-                        'error': str(e)
-                    })
-            
-            # Assemble report
-            report_content = self._assemble_report(sections, template_config)
-            
-            # Quality check
-            quality = await self.validate_report(report_content, template)
+            # Report sections are batch traffic: interactive calls go first under the rate limit
+            with llm_priority('batch'):
+                for section_name in template_config['sections']:
+                    try:
+                        content = await self.generate_section(
+                            section_name=section_name,
+                            template=template,
+                            project_data=project_data
+                        )
+                        sections.append({
+                            'name': section_name,
+                            'content': content,
+                            'word_count': len(content.split())
+                        })
+                    except Exception as e:
+                        sections.append({
+                            'name': section_name,
+                            'content': f"[Error generating section: {str(e)}]",
+                            'error': str(e)
+                        })
+                
+                # Assemble report
+                report_content = self._assemble_report(sections, template_config)
+                
+                # Quality check
+                quality = await self.validate_report(report_content, template)
             
             return {
                 'status': 'success',
@@ -238,7 +160,9 @@ class ManusEngine:
             project_data=project_data
         )
         
-        response = await self.client.chat.completions.create(
+        return await cached_completion(
+            self.client,
+            'manus',
             model="gpt-4o",
             messages=[
                 {
@@ -261,8 +185,6 @@ Your writing style:
             temperature=0.3,  # Lower for more consistent technical writing
             max_tokens=2000
         )
-        
-        return response.choices[0].message.content
     
     def _build_section_prompt(
         self,
@@ -375,7 +297,9 @@ Generate the section content now, following {template_config['standard']} guidel
         
         # AI quality check
         try:
-            response = await self.client.chat.completions.create(
+            review = await cached_completion(
+                self.client,
+                'manus',
                 model="gpt-4o",
                 messages=[
                     {
@@ -412,7 +336,7 @@ Respond with JSON:
                 max_tokens=500
             )
             
-            ai_review = json.loads(response.choices[0].message.content)
+            ai_review = json.loads(review)
             
             # Calculate overall score
             overall_score = (
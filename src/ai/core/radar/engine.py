@@ -16,6 +16,8 @@ from typing import Dict, List, Optional, Any
 from openai import AsyncOpenAI
 import os
 
+from ..llm import cached_completion, get_openai_client
+
 # Metadados das fontes regulatórias
 REGULATORY_SOURCES = {
     "ANM": {
@@ -75,15 +77,16 @@ class RadarEngine:
     sobre mudanças em normas globais de mineração.
     """
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, client: Optional[AsyncOpenAI] = None):
         """
         Inicializa o Radar Engine.
         
         Args:
             api_key: OpenAI API key (opcional, usa env var se não fornecida)
+            client: Cliente OpenAI (padrão: cliente compartilhado do processo)
         """
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
-        self.client = AsyncOpenAI(api_key=self.api_key) if self.api_key else None
+        self.client = client or (get_openai_client(self.api_key) if self.api_key else None)
         self.sources = REGULATORY_SOURCES
         self.cache: Dict[str, Any] = {}  # Cache de versões anteriores
         
@@ -301,7 +304,9 @@ Responda em JSON com este formato:
 }}"""
 
         try:
-            response = await self.client.chat.completions.create(
+            content = await cached_completion(
+                self.client,
+                'radar',
                 model="gpt-4o",
                 messages=[
                     {"role": "system", "content": "Você é um analista de compliance regulatório especializado em mineração."},
@@ -311,7 +316,7 @@ Responda em JSON com este formato:
                 response_format={"type": "json_object"}
             )
             
-            analysis = json.loads(response.choices[0].message.content)
+            analysis = json.loads(content)
             
             # Enriquece os changes com análise GPT
             for i, change in enumerate(changes):
@@ -460,7 +465,9 @@ Dados:
 Seja objetivo, técnico e focado em decisões estratégicas."""
 
         try:
-            response = await self.client.chat.completions.create(
+            content = await cached_completion(
+                self.client,
+                'radar',
                 model="gpt-4o",
                 messages=[
                     {"role": "system", "content": "Você é um especialista em regulação de mineração global."},
@@ -470,7 +477,7 @@ Seja objetivo, técnico e focado em decisões estratégicas."""
                 max_tokens=800
             )
             
-            return response.choices[0].message.content.strip()
+            return content.strip()
             
         except Exception as e:
             return self._generate_basic_summary(findings) + f"\n\n[Nota: Erro ao gerar resumo GPT: {str(e)}]"
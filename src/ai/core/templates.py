@@ -0,0 +1,97 @@
+"""
+QIVO Intelligence Layer - Report Templates Module
+Modelos de relatório (JORC, NI 43-101, PRMS) compartilhados pelos engines
+
+Apenas dados: o Manus gera relatórios a partir das seções de cada modelo e
+o Validator usa as mesmas seções como vocabulário do índice de seções, sem
+importar o engine do Manus (e o cliente OpenAI).
+"""
+
+from typing import Dict
+
+# Seções de cada modelo, na ordem do relatório
+REPORT_TEMPLATES: Dict[str, Dict] = {
+    'jorc_2012': {
+        'name': 'JORC Code 2012',
+        'full_name': 'Australasian Code for Reporting of Exploration Results, Mineral Resources and Ore Reserves (2012 Edition)',
+        'sections': [
+            'Summary',
+            'Introduction',
+            'Geology and Geological Interpretation',
+            'Sampling and Sub-sampling',
+            'Sample Analysis and Security',
+            'Estimation and Reporting of Mineral Resources',
+            'Estimation and Reporting of Ore Reserves',
+            'Mining Methods',
+            'Processing and Metallurgical Testwork',
+            'Infrastructure',
+            'Costs',
+            'Revenue Factors',
+            'Market Assessment',
+            'Environmental Studies',
+            'Social and Community',
+            'Permitting and Legal',
+            'Economic Analysis',
+            'Risks and Opportunities',
+            'Conclusions and Recommendations'
+        ],
+        'standard': 'JORC',
+        'year': 2012,
+        'jurisdiction': 'Australia'
+    },
+    'ni_43_101': {
+        'name': 'NI 43-101 Technical Report',
+        'full_name': 'National Instrument 43-101 Standards of Disclosure for Mineral Projects',
+        'sections': [
+            'Title Page',
+            'Table of Contents',
+            'Summary',
+            'Introduction and Terms of Reference',
+            'Reliance on Other Experts',
+            'Property Description and Location',
+            'Accessibility, Climate, Local Resources, Infrastructure',
+            'History',
+            'Geological Setting and Mineralization',
+            'Deposit Types',
+            'Exploration',
+            'Drilling',
+            'Sample Preparation, Analyses and Security',
+            'Data Verification',
+            'Mineral Processing and Metallurgical Testing',
+            'Mineral Resource Estimates',
+            'Mineral Reserve Estimates',
+            'Mining Methods',
+            'Recovery Methods',
+            'Project Infrastructure',
+            'Market Studies',
+            'Environmental Studies, Permitting, Social/Community Impact',
+            'Capital and Operating Costs',
+            'Economic Analysis',
+            'Adjacent Properties',
+            'Other Relevant Data and Information',
+            'Interpretation and Conclusions',
+            'Recommendations',
+            'References',
+            'Certificates'
+        ],
+        'standard': 'NI 43-101',
+        'jurisdiction': 'Canada',
+        'exchange': 'TSX'
+    },
+    'prms': {
+        'name': 'PRMS Executive Summary',
+        'full_name': 'Petroleum Resources Management System',
+        'sections': [
+            'Overview',
+            'Resources Summary',
+            'Reserves Summary',
+            'Economic Analysis',
+            'Key Assumptions',
+            'Risks and Uncertainties',
+            'Recommendations'
+        ],
+        'standard': 'PRMS',
+        'jurisdiction': 'International',
+        'focus': 'Petroleum'
+    }
+}
@@ -3,7 +3,18 @@ QIVO Intelligence Layer - Validator Module
 """
 
 from .validator import ValidatorAI
-from .preprocessor import DocumentPreprocessor
-from .scoring import ComplianceScorer, RiskLevel
+from .preprocessor import DocumentPreprocessor, ExtractionQueueFullError
+from .scoring import ComplianceScorer, RiskLevel, ScoreBatch, ScoringSession
+from .cache import ExtractionCache
+from .result import ExtractionResult
+from .sections import Section
+from .rulesets import Ruleset, RulesetStore
+from .heatmap import Heatmap, HeatmapBin
+from .pipeline import PipelineStats
 
-__all__ = ['ValidatorAI', 'DocumentPreprocessor', 'ComplianceScorer', 'RiskLevel']
+__all__ = [
+    'ValidatorAI', 'DocumentPreprocessor', 'ExtractionQueueFullError',
+    'ExtractionCache', 'ExtractionResult', 'Section', 'ComplianceScorer', 'RiskLevel',
+    'ScoreBatch', 'ScoringSession', 'Ruleset', 'RulesetStore', 'Heatmap', 'HeatmapBin',
+    'PipelineStats'
+]
@@ -0,0 +1,218 @@
+"""
+QIVO Intelligence Layer - Extraction Cache Module
+Cache em disco (SQLite) de texto extraído, endereçado por conteúdo
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import hashlib
+from contextlib import closing
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Tuple
+
+
+def file_sha256(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    """Calcula SHA-256 do conteúdo do arquivo em blocos"""
+    digest = hashlib.sha256()
+    
+    with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(chunk_size), b''):
+            digest.update(chunk)
+    
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    """
+    Store LRU limitado por tamanho para texto limpo de documentos
+    
+    Cada entrada guarda as páginas limpas e a metadata de extração, indexadas
+    pela chave de conteúdo (SHA-256 dos bytes). Quando o total ultrapassa
+    max_bytes, as entradas acessadas há mais tempo são removidas.
+    """
+    
+    def __init__(self, path: str, max_bytes: int = 512 * 1024 * 1024):
+        """
+        Inicializa o cache
+        
+        Args:
+            path: Caminho do arquivo SQLite
+            max_bytes: Tamanho máximo somado das entradas
+        """
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS extractions (
+                    key TEXT PRIMARY KEY,
+                    pages TEXT NOT NULL,
+                    metadata TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    last_access REAL NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_extractions_access ON extractions (last_access)"
+            )
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Abre conexão (uma por operação, seguro entre threads)"""
+        return sqlite3.connect(self.path, timeout=30)
+    
+    def get(self, key: str) -> Optional[Tuple[List[Tuple[int, str]], Dict[str, Any]]]:
+        """
+        Busca entrada no cache
+        
+        Args:
+            key: Chave de conteúdo
+        
+        Returns:
+            Tupla (páginas, metadata) ou None se ausente
+        """
+        with self._lock, closing(self._connect()) as conn, conn:
+            row = conn.execute(
+                "SELECT pages, metadata FROM extractions WHERE key = ?", (key,)
+            ).fetchone()
+            
+            if row is None:
+                self.misses += 1
+                return None
+            
+            conn.execute(
+                "UPDATE extractions SET last_access = ? WHERE key = ?", (time.time(), key)
+            )
+            self.hits += 1
+        
+        pages = [(number, text) for number, text in json.loads(row[0])]
+        return pages, json.loads(row[1])
+    
+    def get_many(self, keys: List[str]) -> Dict[str, List[Tuple[int, str]]]:
+        """
+        Busca várias entradas em uma única conexão (cache de páginas)
+        
+        Não altera os contadores de hit/miss, que medem documentos inteiros.
+        
+        Args:
+            keys: Chaves de conteúdo
+        
+        Returns:
+            Dict chave → páginas, apenas para as chaves presentes
+        """
+        if not keys:
+            return {}
+        
+        rows = []
+        with self._lock, closing(self._connect()) as conn, conn:
+            # Lotes abaixo do limite de parâmetros do SQLite
+            for index in range(0, len(keys), 500):
+                batch = keys[index:index + 500]
+                placeholders = ', '.join('?' * len(batch))
+                rows.extend(conn.execute(
+                    f"SELECT key, pages FROM extractions WHERE key IN ({placeholders})", batch
+                ).fetchall())
+            conn.executemany(
+                "UPDATE extractions SET last_access = ? WHERE key = ?",
+                [(time.time(), key) for key, _ in rows]
+            )
+        
+        return {key: [(number, text) for number, text in json.loads(pages)] for key, pages in rows}
+    
+    def put_many(self, entries: List[Tuple[str, List[Tuple[int, str]]]]):
+        """
+        Armazena várias entradas em uma única transação e aplica o limite LRU
+        
+        Args:
+            entries: Pares (chave, páginas), sem metadata
+        """
+        rows = []
+        now = time.time()
+        for key, pages in entries:
+            payload = json.dumps(pages, ensure_ascii=False)
+            size = len(payload.encode('utf-8'))
+            if size <= self.max_bytes:
+                rows.append((key, payload, '{}', size, now))
+        
+        if not rows:
+            return
+        
+        with self._lock, closing(self._connect()) as conn, conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO extractions (key, pages, metadata, size, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+            self._evict(conn)
+    
+    def put(self, key: str, pages: List[Tuple[int, str]], metadata: Dict[str, Any]):
+        """
+        Armazena entrada e aplica o limite de tamanho (LRU)
+        
+        Args:
+            key: Chave de conteúdo
+            pages: Páginas limpas (número, texto)
+            metadata: Metadata de extração
+        """
+        payload = json.dumps(pages, ensure_ascii=False)
+        size = len(payload.encode('utf-8'))
+        
+        # Entradas maiores que o próprio cache não são armazenadas
+        if size > self.max_bytes:
+            return
+        
+        with self._lock, closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO extractions (key, pages, metadata, size, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, payload, json.dumps(metadata), size, time.time())
+            )
+            self._evict(conn)
+    
+    def _evict(self, conn: sqlite3.Connection):
+        """Remove as entradas menos recentes até caber em max_bytes"""
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM extractions").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        
+        rows = conn.execute(
+            "SELECT key, size FROM extractions ORDER BY last_access ASC"
+        ).fetchall()
+        
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM extractions WHERE key = ?", (key,))
+            total -= size
+            self.evictions += 1
+    
+    def clear(self):
+        """Remove todas as entradas"""
+        with self._lock, closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM extractions")
+    
+    def stats(self) -> Dict[str, Any]:
+        """Retorna contadores de hit/miss/eviction e ocupação"""
+        with closing(self._connect()) as conn:
+            entries, total = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM extractions"
+            ).fetchone()
+        
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            'entries': entries,
+            'size_bytes': total,
+            'max_bytes': self.max_bytes
+        }
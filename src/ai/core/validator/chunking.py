@@ -0,0 +1,64 @@
+"""
+QIVO Intelligence Layer - Chunking Module
+Divisão de documentos longos em trechos com sobreposição para análise map-reduce
+"""
+
+from typing import List
+
+# Separadores preferidos para o fim de um trecho, do mais forte ao mais fraco
+_BREAKS = ('\n\n', '\n', '. ', ' ')
+
+
+def split_chunks(text: str, size: int, overlap: int = 0) -> List[str]:
+    """
+    Divide o texto em trechos de até size caracteres
+    
+    O corte é feito no separador mais forte (parágrafo, linha, frase,
+    palavra) da segunda metade do trecho; sem separador, corta em size.
+    Cada trecho seguinte repete os últimos overlap caracteres do anterior
+    (a partir de um início de palavra), para que evidências no limite não
+    sejam perdidas.
+    
+    Args:
+        text: Texto a dividir
+        size: Tamanho máximo de cada trecho em caracteres
+        overlap: Caracteres repetidos entre trechos consecutivos
+    
+    Returns:
+        Trechos em ordem (um único trecho se o texto couber em size)
+    
+    Raises:
+        ValueError: size não positivo ou overlap fora de [0, size / 2]
+    """
+    if size <= 0:
+        raise ValueError(f"Tamanho de trecho inválido: {size}")
+    if overlap < 0 or overlap > size // 2:
+        raise ValueError(f"Sobreposição inválida: {overlap} (máximo {size // 2})")
+    
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = start + size
+        if end >= len(text):
+            chunks.append(text[start:])
+            break
+        
+        end = _break_before(text, start + size // 2, end)
+        chunks.append(text[start:end])
+        
+        # Próximo trecho começa overlap caracteres antes, no início de uma palavra
+        next_start = end - overlap
+        if overlap:
+            space = text.find(' ', next_start, end)
+            next_start = space + 1 if space != -1 else next_start
+        start = max(next_start, start + 1)
+    return chunks
+
+
+def _break_before(text: str, lower: int, upper: int) -> int:
+    """Fim do trecho: logo após o separador mais forte em [lower, upper)"""
+    for separator in _BREAKS:
+        index = text.rfind(separator, lower, upper)
+        if index != -1:
+            return index + len(separator)
+    return upper
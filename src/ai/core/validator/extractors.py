@@ -0,0 +1,348 @@
+"""
+QIVO Intelligence Layer - Extractors Module
+Funções síncronas de parsing (PDF, DOCX) executadas fora do event loop
+"""
+
+import time
+import hashlib
+import posixpath
+import zipfile
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import PyPDF2
+from PyPDF2.generic import ArrayObject, DictionaryObject, IndirectObject, StreamObject
+from lxml import etree
+
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_REL_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+_OFFICE_DOCUMENT = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument'
+# Chaves ignoradas no fingerprint: programas de fonte não afetam o texto
+# extraído e /Parent levaria à árvore de páginas inteira
+_FINGERPRINT_SKIP_KEYS = {'/FontFile', '/FontFile2', '/FontFile3', '/Parent'}
+
+_BLOCK_TAGS = (_W + 'p', _W + 'tr', _W + 'tbl', _W + 'body')
+
+
+def pdf_page_count(file_path: str) -> int:
+    """Retorna o número de páginas de um PDF"""
+    with open(file_path, 'rb') as file:
+        return len(PyPDF2.PdfReader(file).pages)
+
+
+def extract_pdf_pages(
+    file_path: str,
+    start: int = 0,
+    end: Optional[int] = None
+) -> List[Tuple[str, float]]:
+    """
+    Extrai o texto bruto de um intervalo de páginas de PDF
+    
+    Cada chamada abre o arquivo de forma independente, o que permite
+    executá-la em processos separados.
+    
+    Args:
+        file_path: Caminho do arquivo
+        start: Índice (base 0) da primeira página
+        end: Índice final exclusivo (None = até o fim)
+    
+    Returns:
+        Tuplas (texto bruto, segundos de parsing) de cada página do intervalo
+        ('' para páginas sem texto)
+    """
+    with open(file_path, 'rb') as file:
+        pages = PyPDF2.PdfReader(file).pages
+        end = len(pages) if end is None else min(end, len(pages))
+        
+        return _timed_page_texts(pages, range(start, end))
+
+
+def extract_pdf_page_indices(file_path: str, indices: List[int]) -> List[Tuple[str, float]]:
+    """Extrai (texto bruto, segundos de parsing) das páginas de índices indicados"""
+    with open(file_path, 'rb') as file:
+        return _timed_page_texts(PyPDF2.PdfReader(file).pages, indices)
+
+
+def pdf_page_fingerprints(file_path: str, start: int = 0, end: Optional[int] = None) -> List[str]:
+    """Fingerprints das páginas [start, end) (ver page_fingerprint)"""
+    with open(file_path, 'rb') as file:
+        pages = PyPDF2.PdfReader(file).pages
+        end = len(pages) if end is None else min(end, len(pages))
+        
+        return [page_fingerprint(pages[index]) for index in range(start, end)]
+
+
+def page_fingerprint(page) -> str:
+    """
+    SHA-256 do que determina o texto extraído de uma página
+    
+    Cobre o content stream decodificado e os recursos da página (fontes,
+    encodings, ToUnicode, XObjects de formulário), sem parsing de texto.
+    Páginas idênticas entre revisões de um relatório têm o mesmo fingerprint
+    mesmo quando os números de objeto mudam.
+    """
+    digest = hashlib.sha256()
+    
+    contents = page.get('/Contents')
+    if contents is not None:
+        contents = contents.get_object()
+        streams = contents if isinstance(contents, ArrayObject) else [contents]
+        for stream in streams:
+            digest.update(stream.get_object().get_data())
+    
+    digest.update(b'\x00R')
+    _hash_pdf_object(page.get('/Resources'), digest, set())
+    
+    return digest.hexdigest()
+
+
+def _hash_pdf_object(obj, digest, seen: set):
+    """Serializa um objeto PDF no digest resolvendo referências (sem ciclos)"""
+    if isinstance(obj, IndirectObject):
+        reference = (obj.idnum, obj.generation)
+        if reference in seen:
+            digest.update(b'<cycle>')
+            return
+        seen.add(reference)
+        obj = obj.get_object()
+    
+    if isinstance(obj, DictionaryObject):
+        digest.update(b'<<')
+        for key in sorted(obj):
+            if key in _FINGERPRINT_SKIP_KEYS:
+                continue
+            digest.update(key.encode('utf-8', 'surrogatepass'))
+            _hash_pdf_object(obj[key], digest, seen)
+        digest.update(b'>>')
+        
+        # Dados de imagem não afetam o texto; decodificá-los seria caro
+        if isinstance(obj, StreamObject) and obj.get('/Subtype') != '/Image':
+            digest.update(obj.get_data())
+    elif isinstance(obj, ArrayObject):
+        digest.update(b'[')
+        for item in obj:
+            _hash_pdf_object(item, digest, seen)
+        digest.update(b']')
+    else:
+        digest.update(repr(obj).encode('utf-8', 'surrogatepass'))
+        digest.update(b' ')
+
+
+def _timed_page_texts(pages, indices: Iterable[int]) -> List[Tuple[str, float]]:
+    """Extrai texto das páginas indicadas medindo o parsing de cada uma"""
+    results = []
+    for index in indices:
+        started = time.perf_counter()
+        text = pages[index].extract_text() or ''
+        results.append((text, time.perf_counter() - started))
+    return results
+
+
+class PdfPageReader:
+    """
+    Leitor de PDF mantido aberto entre lotes de páginas
+    
+    Usado pelo backend de threads, onde o mesmo objeto pode ser reutilizado
+    entre tarefas; evita reabrir e reindexar o arquivo a cada lote.
+    """
+    
+    def __init__(self, file_path: str):
+        self._file = open(file_path, 'rb')
+        try:
+            self._reader = PyPDF2.PdfReader(self._file)
+            self.page_count = len(self._reader.pages)
+        except Exception:
+            self._file.close()
+            raise
+    
+    def extract(self, start: int, end: int) -> List[Tuple[str, float]]:
+        """Extrai (texto bruto, segundos de parsing) das páginas [start, end)"""
+        return _timed_page_texts(self._reader.pages, range(start, min(end, self.page_count)))
+    
+    def extract_indices(self, indices: List[int]) -> List[Tuple[str, float]]:
+        """Extrai (texto bruto, segundos de parsing) das páginas de índices indicados"""
+        return _timed_page_texts(self._reader.pages, indices)
+    
+    def fingerprints(self, start: int, end: int) -> List[str]:
+        """Fingerprints das páginas [start, end)"""
+        pages = self._reader.pages
+        return [page_fingerprint(pages[index]) for index in range(start, min(end, self.page_count))]
+    
+    def close(self):
+        """Fecha o arquivo"""
+        self._file.close()
+
+
+def extract_docx(file_path: str, separator: str = '\n') -> str:
+    """Extrai texto de DOCX (parágrafos e linhas de tabela, em ordem)"""
+    return separator.join(iter_docx_blocks(file_path))
+
+
+def iter_docx_blocks(file_path: str) -> Iterator[str]:
+    """
+    Percorre word/document.xml em streaming, sem montar o DOM do python-docx
+    
+    Emite, na ordem do documento, cada parágrafo do corpo com texto e cada
+    linha de tabela de primeiro nível no formato 'célula | célula'. Elementos
+    já processados são descartados, então a memória não cresce com o tamanho
+    das tabelas. A semântica de texto segue o python-docx (tabs, quebras,
+    hyperlinks, células mescladas repetidas por coluna da grade).
+    
+    Args:
+        file_path: Caminho do arquivo
+    
+    Yields:
+        Texto de cada parágrafo ou linha de tabela
+    """
+    with zipfile.ZipFile(file_path) as package:
+        with package.open(_main_document_part(package)) as xml:
+            merged: Dict[int, Tuple[str, int]] = {}
+            
+            # Filtrar por tag evita criar proxies Python para runs, textos etc.
+            events = etree.iterparse(xml, events=('end',), tag=_BLOCK_TAGS)
+            
+            for _, element in events:
+                parent = element.getparent()
+                
+                if element.tag == _W + 'body':
+                    break
+                
+                if element.tag == _W + 'tr':
+                    if parent.getparent().tag != _W + 'body':
+                        continue  # Linha de tabela aninhada: fora de doc.tables
+                    
+                    row_text = ' | '.join(cell.strip() for cell in _row_cells(element, merged))
+                    if row_text.strip():
+                        yield row_text
+                    _discard(element)
+                    continue
+                
+                if parent.tag != _W + 'body':
+                    continue
+                
+                if element.tag == _W + 'p':
+                    text = _paragraph_text(element)
+                    if text.strip():
+                        yield text
+                elif element.tag == _W + 'tbl':
+                    merged = {}
+                
+                _discard(element)
+
+
+def _main_document_part(package: zipfile.ZipFile) -> str:
+    """Resolve a parte principal do documento via _rels/.rels"""
+    try:
+        relationships = etree.fromstring(package.read('_rels/.rels'))
+    except KeyError:
+        return 'word/document.xml'
+    
+    for relationship in relationships.iter(_REL_NS + 'Relationship'):
+        if relationship.get('Type') == _OFFICE_DOCUMENT:
+            return posixpath.normpath(relationship.get('Target').lstrip('/'))
+    
+    return 'word/document.xml'
+
+
+def _discard(element):
+    """Libera elemento processado e irmãos anteriores"""
+    element.clear()
+    parent = element.getparent()
+    while element.getprevious() is not None:
+        del parent[0]
+
+
+def _run_text(run) -> str:
+    """Texto de w:r (equivalente a CT_R.text do python-docx)"""
+    parts = []
+    for child in run:
+        tag = child.tag
+        if tag == _W + 't':
+            parts.append(child.text or '')
+        elif tag in (_W + 'tab', _W + 'ptab'):
+            parts.append('\t')
+        elif tag == _W + 'br':
+            if child.get(_W + 'type', 'textWrapping') == 'textWrapping':
+                parts.append('\n')
+        elif tag == _W + 'cr':
+            parts.append('\n')
+        elif tag == _W + 'noBreakHyphen':
+            parts.append('-')
+    return ''.join(parts)
+
+
+def _paragraph_text(paragraph) -> str:
+    """Texto de w:p (runs e hyperlinks diretos)"""
+    parts = []
+    for child in paragraph:
+        if child.tag == _W + 'r':
+            parts.append(_run_text(child))
+        elif child.tag == _W + 'hyperlink':
+            parts.extend(_run_text(run) for run in child if run.tag == _W + 'r')
+    return ''.join(parts)
+
+
+def _int_property(properties, tag: str, default: int) -> int:
+    """Lê atributo w:val inteiro de uma propriedade (gridSpan, gridBefore)"""
+    node = properties.find(tag) if properties is not None else None
+    if node is None:
+        return default
+    return int(node.get(_W + 'val', default))
+
+
+def _row_cells(row, merged: Dict[int, Tuple[str, int]]) -> List[str]:
+    """
+    Textos das células de uma linha, como row.cells do python-docx
+    
+    Células com gridSpan se repetem por coluna da grade; continuações de
+    mesclagem vertical reutilizam o texto da célula de origem, guardado em
+    merged por deslocamento na grade.
+    """
+    cells = []
+    offset = _int_property(row.find(_W + 'trPr'), _W + 'gridBefore', 0)
+    
+    for cell in row.iterchildren(_W + 'tc'):
+        properties = cell.find(_W + 'tcPr')
+        span = _int_property(properties, _W + 'gridSpan', 1)
+        v_merge = properties.find(_W + 'vMerge') if properties is not None else None
+        
+        if v_merge is not None and v_merge.get(_W + 'val', 'continue') == 'continue' and offset in merged:
+            text, origin_span = merged[offset]
+            cells.extend([text] * origin_span)
+        else:
+            text = '\n'.join(_paragraph_text(p) for p in cell.iterchildren(_W + 'p'))
+            merged[offset] = (text, span)
+            cells.extend([text] * span)
+        
+        offset += span
+    
+    return cells
+
+
+class DocxBlockReader:
+    """
+    Leitura incremental de DOCX em lotes (backend de threads)
+    
+    Mantém o iterador de iter_docx_blocks aberto entre tarefas.
+    """
+    
+    def __init__(self, file_path: str):
+        self._blocks = iter_docx_blocks(file_path)
+    
+    def read(self, max_chars: int) -> List[str]:
+        """Retorna os próximos blocos até somar max_chars (lista vazia no fim)"""
+        blocks = []
+        size = 0
+        for block in self._blocks:
+            blocks.append(block)
+            size += len(block)
+            if size >= max_chars:
+                break
+        return blocks
+    
+    def close(self):
+        """Fecha o arquivo"""
+        try:
+            self._blocks.close()
+        except ValueError:
+            # Leitura ainda em andamento em outra thread (tarefa cancelada):
+            # o gerador é finalizado pelo coletor de lixo
+            pass
@@ -0,0 +1,160 @@
+"""
+QIVO Intelligence Layer - Heatmap Module
+Densidade de evidências por janela, página ou seção a partir das posições das ocorrências
+"""
+
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from .sections import Section
+
+# Densidade expressa em ocorrências por mil caracteres
+DENSITY_SCALE = 1000
+
+
+@dataclass(frozen=True, slots=True)
+class HeatmapBin:
+    """
+    Trecho do texto com as ocorrências de cada categoria
+    
+    Attributes:
+        label: Identificação do trecho (número e título da seção, ou posição)
+        start: Posição inicial no texto
+        end: Posição final (exclusiva)
+        page: Página do início do trecho (None sem páginas)
+        counts: Ocorrências por categoria
+    """
+    
+    label: str
+    start: int
+    end: int
+    page: Optional[int]
+    counts: Mapping[str, int]
+    
+    def density(self, category: str) -> float:
+        """Ocorrências da categoria por mil caracteres do trecho"""
+        length = self.end - self.start
+        return round(self.counts[category] * DENSITY_SCALE / length, 3) if length else 0.0
+    
+    def to_dict(self) -> Dict[str, object]:
+        """Representação serializável"""
+        return {
+            'label': self.label,
+            'start': self.start,
+            'end': self.end,
+            'page': self.page,
+            'counts': dict(self.counts),
+            'density': {category: self.density(category) for category in self.counts}
+        }
+
+
+class Heatmap:
+    """
+    Ocorrências por trecho do texto, sem nova busca
+    
+    Recebe as posições já encontradas na passagem de scoring (ordenadas).
+    A posição de uma ocorrência na lista ordenada é a soma de prefixo das
+    ocorrências até ali, então a contagem de qualquer intervalo é a
+    diferença de dois bisects: O(log n) por trecho e categoria.
+    """
+    
+    def __init__(
+        self,
+        positions: Mapping[str, Sequence[int]],
+        text_length: int,
+        page_offsets: Sequence[Tuple[int, int]] = ()
+    ):
+        """
+        Inicializa o heatmap
+        
+        Args:
+            positions: Posições das ocorrências por categoria, em ordem
+            text_length: Tamanho do texto avaliado
+            page_offsets: Pares (número da página, posição inicial), como em ExtractionResult
+        """
+        self.categories = tuple(positions)
+        self.text_length = text_length
+        self._positions = {category: list(offsets) for category, offsets in positions.items()}
+        self._page_starts = [offset for _, offset in page_offsets]
+        self._page_numbers = [number for number, _ in page_offsets]
+    
+    def count(self, category: str, start: int, end: int) -> int:
+        """Ocorrências da categoria em [start, end)"""
+        offsets = self._positions[category]
+        return bisect_left(offsets, end) - bisect_left(offsets, start)
+    
+    def page_at(self, offset: int) -> Optional[int]:
+        """Página que contém a posição (None sem páginas)"""
+        index = bisect_right(self._page_starts, offset) - 1
+        return self._page_numbers[index] if index >= 0 else None
+    
+    def span(self, label: str, start: int, end: int) -> HeatmapBin:
+        """Trecho [start, end) com as contagens de todas as categorias"""
+        return HeatmapBin(
+            label=label,
+            start=start,
+            end=end,
+            page=self.page_at(start),
+            counts={category: self.count(category, start, end) for category in self.categories}
+        )
+    
+    def windows(self, size: int) -> List[HeatmapBin]:
+        """
+        Janelas consecutivas de tamanho fixo
+        
+        Args:
+            size: Caracteres por janela
+        
+        Returns:
+            Trechos cobrindo o texto inteiro (o último pode ser menor)
+        
+        Raises:
+            ValueError: Tamanho não positivo
+        """
+        if size <= 0:
+            raise ValueError(f"Tamanho de janela inválido: {size}")
+        return [
+            self.span(f'{start}-{min(start + size, self.text_length)}',
+                      start, min(start + size, self.text_length))
+            for start in range(0, self.text_length, size)
+        ]
+    
+    def pages(self) -> List[HeatmapBin]:
+        """Um trecho por página (vazio sem page_offsets)"""
+        bounds = self._page_starts[1:] + [self.text_length]
+        return [
+            HeatmapBin(
+                label=f'p. {number}',
+                start=start,
+                end=end,
+                page=number,
+                counts={category: self.count(category, start, end) for category in self.categories}
+            )
+            for number, start, end in zip(self._page_numbers, self._page_starts, bounds)
+        ]
+    
+    def sections(self, sections: Iterable[Section]) -> List[HeatmapBin]:
+        """Um trecho por seção do índice (seções aninhadas se sobrepõem)"""
+        return [
+            HeatmapBin(
+                label=f'{section.number} {section.title}' if section.number else section.title,
+                start=section.start,
+                end=section.end,
+                page=section.page,
+                counts={
+                    category: self.count(category, section.start, section.end)
+                    for category in self.categories
+                }
+            )
+            for section in sections
+        ]
+    
+    def hottest(self, bins: Sequence[HeatmapBin], category: str, limit: int = 3) -> List[HeatmapBin]:
+        """Trechos de maior densidade da categoria (ignora trechos sem ocorrências)"""
+        ranked = sorted(
+            (item for item in bins if item.counts[category]),
+            key=lambda item: item.density(category),
+            reverse=True
+        )
+        return ranked[:limit]
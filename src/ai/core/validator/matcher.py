@@ -0,0 +1,400 @@
+"""
+QIVO Intelligence Layer - Keyword Matcher Module
+Contagem de palavras-chave de várias categorias em uma única passagem
+"""
+
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+_WORD_CHAR = re.compile(r'\w')
+
+BOUNDARY_MODES = ('none', 'start', 'word')
+
+
+def _is_word_char(char: str) -> bool:
+    return bool(_WORD_CHAR.match(char))
+
+
+class KeywordMatcher:
+    """
+    Autômato de palavras-chave compilado uma vez por conjunto de regras
+    
+    Todas as palavras-chave viram uma única regex em forma de trie, que o
+    motor de regex percorre em C: o texto é lido uma vez, qualquer que seja
+    o número de palavras-chave. Ocorrências de palavras-chave contidas em
+    outras ('resource' em 'mineral resource') são contadas como em
+    str.count, a partir de expansões calculadas na construção. Se um sufixo
+    de palavra-chave pode iniciar outra ('ni 43-101' + '1p' em modo 'none'),
+    a busca passa a testar cada posição (lookahead), mais lenta mas exata.
+    Como em str.count, ocorrências da mesma palavra-chave não se sobrepõem
+    ('bb' conta 1 em 'bbb').
+    
+    Modos de fronteira:
+        'none': substring, o mesmo resultado de somar str.count por
+            palavra-chave (padrão; contagem original dos scores)
+        'start': a palavra-chave começa em início de palavra ('cim' não
+            casa em 'specimen', '1p' não casa em '11p'; plurais contam).
+            Muda os scores em relação a 'none'
+        'word': palavra inteira nas duas extremidades
+    """
+    
+    def __init__(self, categories: Dict[str, Iterable[str]], boundary: str = 'none'):
+        """
+        Compila o autômato
+        
+        Args:
+            categories: Palavras-chave por categoria (uma palavra-chave pode
+                pertencer a várias categorias)
+            boundary: Modo de fronteira ('none', 'start' ou 'word')
+        """
+        if boundary not in BOUNDARY_MODES:
+            raise ValueError(f"Modo de fronteira inválido: {boundary}")
+        
+        self.boundary = boundary
+        self.categories = list(categories)
+        
+        # Palavra-chave → categorias (repetida se listada mais de uma vez)
+        self._keyword_categories: Dict[str, List[str]] = {}
+        for category, keywords in categories.items():
+            for keyword in keywords:
+                keyword = keyword.lower()
+                if keyword:
+                    self._keyword_categories.setdefault(keyword, []).append(category)
+        
+        keywords = sorted(self._keyword_categories)
+        self.max_length = max(map(len, keywords), default=0)
+        
+        # Sem sobreposição parcial entre palavras-chave, a regex pode consumir
+        # cada ocorrência; caso contrário, lookahead testa toda posição
+        self._overlapping = self._has_partial_overlap(keywords)
+        self._pattern = self._compile(keywords)
+        # Grupo da regex com a palavra-chave casada
+        self._group = 1 if self._separated or self._overlapping else 0
+        self._expansions = {
+            keyword: self._contained(keyword, keywords) for keyword in keywords
+        }
+        # Palavras-chave que podem recomeçar dentro de si mesmas ('bb'); só
+        # a busca com lookahead encontra essas ocorrências sobrepostas
+        self._repeating = {
+            keyword for keyword in keywords if self._overlaps_itself(keyword)
+        } if self._overlapping else set()
+    
+    def count_keywords(self, text: str) -> Counter:
+        """
+        Conta ocorrências de cada palavra-chave
+        
+        Args:
+            text: Texto (convertido para minúsculas)
+        
+        Returns:
+            Counter palavra-chave → ocorrências
+        """
+        text = text.lower()
+        if self._separated:
+            text = ' ' + text
+        
+        if not self._repeating:
+            return self._expand(Counter(self._pattern.findall(text)))
+        
+        hits = [(match.start(), match.group(self._group)) for match in self._pattern.finditer(text)]
+        counts = self._expand(Counter(keyword for _, keyword in hits))
+        return counts - Counter(keyword for _, keyword in self._repeats(hits, {}))
+    
+    def count(self, text: str) -> Dict[str, int]:
+        """
+        Conta ocorrências por categoria em uma única passagem
+        
+        Args:
+            text: Texto (convertido para minúsculas)
+        
+        Returns:
+            Dict categoria → ocorrências somadas das palavras-chave
+        """
+        return self._totals(self.count_keywords(text))
+    
+    def find(self, text: str) -> List[Tuple[int, str]]:
+        """
+        Ocorrências com posição, na mesma passagem usada para contar
+        
+        Args:
+            text: Texto (convertido para minúsculas)
+        
+        Returns:
+            Pares (posição em text, palavra-chave casada) em ordem; palavras-chave
+            contidas na casada são atribuídas à mesma posição (ver positions)
+        """
+        lowered = text.lower()
+        shift = 0
+        if self._separated:
+            lowered = ' ' + lowered
+            shift = 1
+        
+        hits = [
+            (match.start(self._group) - shift, match.group(self._group))
+            for match in self._pattern.finditer(lowered)
+        ]
+        
+        if len(lowered) - shift != len(text):
+            # lower() mudou o tamanho (ex.: 'İ'): converter para posições originais
+            original = [index for index, char in enumerate(text) for _ in char.lower()]
+            hits = [(original[offset], keyword) for offset, keyword in hits]
+        return hits
+    
+    def positions(self, hits: List[Tuple[int, str]]) -> Dict[str, List[int]]:
+        """
+        Posições por categoria, em ordem, com uma entrada por ocorrência
+        
+        Args:
+            hits: Resultado de find()
+        
+        Returns:
+            Dict categoria → posições (o tamanho de cada lista é a contagem
+            de count() para a categoria)
+        """
+        skipped = set(self._repeats(hits, {})) if self._repeating else set()
+        positions = {category: [] for category in self.categories}
+        for offset, keyword in hits:
+            if (offset, keyword) not in skipped:
+                for category in self._keyword_categories[keyword]:
+                    positions[category].append(offset)
+            for contained, times in self._expansions[keyword]:
+                if (offset, contained) in skipped:
+                    continue
+                for category in self._keyword_categories[contained]:
+                    positions[category].extend([offset] * times)
+        return positions
+    
+    def stream(self) -> 'KeywordStream':
+        """Contagem incremental de um texto recebido em partes"""
+        return KeywordStream(self)
+    
+    def _expand(self, found: Counter) -> Counter:
+        """Soma às ocorrências encontradas as palavras-chave contidas nelas"""
+        counts = Counter()
+        for keyword, matches in found.items():
+            counts[keyword] += matches
+            for contained, times in self._expansions[keyword]:
+                counts[contained] += matches * times
+        return counts
+    
+    def _repeats(self, hits: Iterable[Tuple[int, str]], last_end: Dict[str, int]) -> List[Tuple[int, str]]:
+        """
+        Ocorrências que começam antes do fim da anterior da mesma palavra-chave
+        
+        Args:
+            hits: Pares (posição, palavra-chave casada) em ordem
+            last_end: Fim da última ocorrência aceita de cada palavra-chave
+                (atualizado; mantido entre partes por KeywordStream)
+        
+        Returns:
+            Pares (posição, palavra-chave) a descontar, como str.count faria
+        """
+        skipped = []
+        for offset, keyword in hits:
+            for candidate in (keyword, *(other for other, _ in self._expansions[keyword])):
+                if candidate not in self._repeating:
+                    continue
+                if offset < last_end.get(candidate, 0):
+                    skipped.append((offset, candidate))
+                else:
+                    last_end[candidate] = offset + len(candidate)
+        return skipped
+    
+    def _totals(self, counts: Counter) -> Dict[str, int]:
+        """Soma as ocorrências por categoria"""
+        totals = {category: 0 for category in self.categories}
+        for keyword, matches in counts.items():
+            for category in self._keyword_categories[keyword]:
+                totals[category] += matches
+        return totals
+    
+    def _starts_at(self, text: str, index: int) -> bool:
+        """Uma palavra-chave pode começar em text[index] (fronteira inicial)"""
+        if self.boundary == 'none' or index == 0 or not _is_word_char(text[index]):
+            return True
+        return not _is_word_char(text[index - 1])
+    
+    def _ends_at(self, text: str, end: int) -> bool:
+        """Uma palavra-chave pode terminar antes de text[end] (fronteira final)"""
+        if self.boundary != 'word' or end == len(text) or not _is_word_char(text[end - 1]):
+            return True
+        return not _is_word_char(text[end])
+    
+    def _has_partial_overlap(self, keywords: List[str]) -> bool:
+        """Algum sufixo de palavra-chave é prefixo próprio de outra?"""
+        for keyword in keywords:
+            for index in range(1, len(keyword)):
+                if not self._starts_at(keyword, index):
+                    continue
+                suffix = keyword[index:]
+                if any(other.startswith(suffix) and len(other) > len(suffix) for other in keywords):
+                    return True
+        return False
+    
+    def _overlaps_itself(self, keyword: str) -> bool:
+        """Um sufixo próprio de keyword é também seu prefixo ('bb', 'abab')?"""
+        return any(
+            self._starts_at(keyword, index) and keyword.startswith(keyword[index:])
+            for index in range(1, len(keyword))
+        )
+    
+    def _contained(self, keyword: str, keywords: List[str]) -> List[Tuple[str, int]]:
+        """
+        Palavras-chave contadas junto com cada ocorrência de keyword
+        
+        Com a regex consumindo, são todas as ocorrências internas; com
+        lookahead, só os prefixos (as demais posições são testadas na busca).
+        """
+        contained = []
+        for other in keywords:
+            if other == keyword or len(other) > len(keyword):
+                continue
+            
+            times = 0
+            index = keyword.find(other)
+            while index >= 0:
+                if self._overlapping and index > 0:
+                    break
+                if self._starts_at(keyword, index) and self._ends_at(keyword, index + len(other)):
+                    times += 1
+                    index = keyword.find(other, index + len(other))
+                else:
+                    index = keyword.find(other, index + 1)
+            
+            if times:
+                contained.append((other, times))
+        return contained
+    
+    def _compile(self, keywords: List[str]) -> 're.Pattern':
+        """Monta a regex em trie (ocorrência mais longa em cada posição)"""
+        trie: Dict[str, dict] = {}
+        for keyword in keywords:
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[''] = {}
+        
+        # Com fronteira inicial e palavras-chave delimitadas por caracteres de
+        # palavra, a regex começa consumindo o separador anterior: o motor
+        # salta direto de separador em separador (o texto ganha um espaço
+        # inicial). Ocorrências adjacentes não disputam o separador, pois
+        # nenhuma palavra-chave termina nele.
+        self._separated = self.boundary != 'none' and not self._overlapping and all(
+            _is_word_char(keyword[0]) and _is_word_char(keyword[-1]) for keyword in keywords
+        )
+        
+        # Nos demais casos, o primeiro caractere vem antes de qualquer
+        # asserção, para que o motor também salte às posições candidatas; a
+        # fronteira inicial é verificada em seguida, dois caracteres atrás
+        branches = []
+        for char, child in sorted(trie.items()):
+            check = ''
+            if self.boundary != 'none' and not self._separated and _is_word_char(char):
+                check = r'(?<!\w.)'
+            branches.append(re.escape(char) + check + self._trie_regex(child, char))
+        
+        body = '(?:' + '|'.join(branches) + ')' if branches else r'(?!x)x'
+        if self._separated:
+            return re.compile(rf'\W({body})')
+        if self._overlapping:
+            # Consome um caractere por ocorrência e captura a palavra-chave
+            # mais longa que começa nele
+            first = ''.join(re.escape(char) for char in sorted(trie))
+            return re.compile(rf'[{first}](?<=(?=({body})).)')
+        return re.compile(body)
+    
+    def _trie_regex(self, node: dict, last_char: str) -> str:
+        """Converte um nó da trie em regex (guloso: prefere continuar)"""
+        terminal = '' in node
+        alternatives = [
+            re.escape(char) + self._trie_regex(child, char)
+            for char, child in sorted(node.items()) if char
+        ]
+        
+        if terminal:
+            end = r'(?!\w)' if self.boundary == 'word' and _is_word_char(last_char) else ''
+            if not alternatives:
+                return end
+            alternatives.append(end)
+            return '(?:' + '|'.join(alternatives) + ')'
+        
+        if len(alternatives) == 1:
+            return alternatives[0]
+        return '(?:' + '|'.join(alternatives) + ')'
+
+
+class KeywordStream:
+    """
+    Contagem incremental com o mesmo resultado de KeywordMatcher.count
+    
+    Ocorrências que começam antes do horizonte (fim do buffer menos a
+    palavra-chave mais longa e dois caracteres de fronteira) já estão
+    inteiramente visíveis e são definitivas; o restante do buffer é
+    reavaliado com a próxima parte. A busca retoma exatamente onde uma
+    busca no texto completo continuaria, então termos que atravessam o
+    limite entre partes ('certified reference' | 'material') contam uma
+    vez, e apenas um trecho do tamanho da maior palavra-chave fica em memória.
+    """
+    
+    # Caracteres anteriores à posição de retomada mantidos para as
+    # verificações de fronteira inicial
+    _CONTEXT = 2
+    
+    def __init__(self, matcher: KeywordMatcher):
+        self._matcher = matcher
+        self._buffer = ' ' if matcher._separated else ''
+        self._position = 0
+        self._found = Counter()
+        # Posição de _buffer[0] no texto e estado das ocorrências sobrepostas
+        self._offset = 0
+        self._last_end: Dict[str, int] = {}
+        self._skipped = Counter()
+    
+    def feed(self, chunk: str):
+        """
+        Processa a próxima parte do texto
+        
+        Args:
+            chunk: Parte do texto (qualquer tamanho, inclusive vazia)
+        """
+        self._buffer += chunk.lower()
+        horizon = len(self._buffer) - self._matcher.max_length - self._CONTEXT
+        if horizon > self._position:
+            self._scan(horizon)
+    
+    def finalize(self) -> Dict[str, int]:
+        """
+        Encerra o texto
+        
+        Returns:
+            Dict categoria → ocorrências (igual a KeywordMatcher.count do texto completo)
+        """
+        self._scan(None)
+        return self._matcher._totals(self.keyword_counts())
+    
+    def keyword_counts(self) -> Counter:
+        """Ocorrências por palavra-chave já definitivas"""
+        counts = self._matcher._expand(self._found)
+        return counts - self._skipped if self._skipped else counts
+    
+    def _scan(self, horizon: Optional[int]):
+        """Conta as ocorrências que começam antes do horizonte (None = fim do texto)"""
+        resume = len(self._buffer) if horizon is None else horizon
+        
+        for match in self._matcher._pattern.finditer(self._buffer, self._position):
+            if horizon is not None and match.start() >= horizon:
+                break
+            keyword = match.group(self._matcher._group)
+            self._found[keyword] += 1
+            if self._matcher._repeating:
+                hit = (self._offset + match.start(), keyword)
+                for _, repeated in self._matcher._repeats([hit], self._last_end):
+                    self._skipped[repeated] += 1
+            resume = max(resume, match.end())
+        
+        # Descarta o que já foi processado, mantendo o contexto de fronteira
+        drop = max(0, resume - self._CONTEXT)
+        self._buffer = self._buffer[drop:]
+        self._position = resume - drop
+        self._offset += drop
@@ -0,0 +1,111 @@
+"""
+QIVO Intelligence Layer - Normalizer Module
+Normalização de texto em passagem única (tabela de tradução + uma regex)
+"""
+
+import re
+from typing import Dict, Optional
+
+# Caracteres preservados além de espaços em branco
+_KEEP_CHAR = re.compile(r'[\w.,;:!?()\-\[\]{}]')
+
+_ASCII = bytes(range(128))
+_UNKNOWN = object()
+
+
+def _ascii_tables(keep_newlines: bool):
+    """
+    Monta a tabela de tradução e os bytes removidos (somente faixa ASCII)
+    
+    Bytes >= 0x80 nunca são alterados pela tradução: em UTF-8 eles formam
+    sequências multibyte e são tratados caractere a caractere.
+    """
+    table = bytearray(range(256))
+    delete = bytearray()
+    
+    for code in range(128):
+        char = chr(code)
+        if char == '\n' and keep_newlines:
+            continue
+        if char.isspace():
+            table[code] = ord(' ')
+        elif not _KEEP_CHAR.match(char):
+            delete.append(code)
+    
+    return bytes(table), bytes(delete)
+
+
+class TextNormalizer:
+    """
+    Normalizador com estado pré-compilado
+    
+    Substitui a antiga sequência de re.sub (colapsar espaços, remover
+    caracteres especiais, strip), com uma diferença: os espaços são
+    colapsados depois da remoção, então 'Au • (JORC)' vira 'Au (JORC)' e
+    não 'Au  (JORC)'. Fora isso o resultado é o da sequência antiga. Trabalha
+    sobre os bytes UTF-8: uma tradução em C para a faixa ASCII,
+    substituições diretas para os poucos caracteres não ASCII especiais e
+    uma única regex para colapsar espaços (mais uma para parágrafos).
+    Com keep_paragraphs=True, linhas em branco viram '\\n\\n' para que a
+    segmentação posterior continue possível.
+    """
+    
+    _SPACES = re.compile(rb' {2,}')
+    _PARAGRAPHS = re.compile(rb'\n *\n[ \n]*')
+    
+    # Marcador de parágrafo: 0x00 é sempre removido pela tradução, logo não
+    # ocorre no texto traduzido
+    _MARK = b'\x00'
+    
+    def __init__(self, keep_paragraphs: bool = False):
+        self.keep_paragraphs = keep_paragraphs
+        self._table, self._delete = _ascii_tables(keep_newlines=keep_paragraphs)
+        
+        # Substituição memorizada por caractere não ASCII (None = manter)
+        self._non_ascii: Dict[str, Optional[bytes]] = {}
+    
+    def normalize(self, text: str) -> str:
+        """
+        Normaliza texto
+        
+        Args:
+            text: Texto bruto
+        
+        Returns:
+            Texto limpo
+        """
+        data = text.encode('utf-8', 'surrogatepass')
+        
+        if not text.isascii():
+            data = self._replace_non_ascii(data)
+        
+        data = data.translate(self._table, self._delete)
+        
+        if self.keep_paragraphs:
+            data = self._PARAGRAPHS.sub(self._MARK, data).replace(b'\n', b' ')
+            data = self._SPACES.sub(b' ', data)
+            data = data.replace(b' ' + self._MARK, self._MARK).replace(self._MARK, b'\n\n')
+        else:
+            data = self._SPACES.sub(b' ', data)
+        
+        return data.decode('utf-8', 'surrogatepass').strip()
+    
+    def _replace_non_ascii(self, data: bytes) -> bytes:
+        """Remove caracteres especiais e troca espaços Unicode por ' '"""
+        # Remover os bytes ASCII deixa apenas os caracteres não ASCII distintos
+        for char in set(data.translate(None, _ASCII).decode('utf-8', 'surrogatepass')):
+            replacement = self._non_ascii.get(char, _UNKNOWN)
+            
+            if replacement is _UNKNOWN:
+                if char.isspace():
+                    replacement = b' '
+                elif _KEEP_CHAR.match(char):
+                    replacement = None
+                else:
+                    replacement = b''
+                self._non_ascii[char] = replacement
+            
+            if replacement is not None:
+                data = data.replace(char.encode('utf-8', 'surrogatepass'), replacement)
+        
+        return data
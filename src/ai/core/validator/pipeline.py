@@ -0,0 +1,72 @@
+"""
+QIVO Intelligence Layer - Batch Pipeline Module
+Contadores por etapa de um lote de process_many, próprios de cada chamada
+"""
+
+import time
+from typing import Any, Dict, Optional
+
+STAGES = ('extraction', 'analysis')
+
+
+class PipelineStats:
+    """
+    Contadores de um lote (documentos concluídos/falhos e tempo ocupado por etapa)
+    
+    Cada chamada de ValidatorAI.process_many preenche o seu próprio objeto,
+    então lotes concorrentes na mesma instância do validator não misturam
+    contadores. Passe um PipelineStats em process_many(stats=...) para
+    acompanhar o lote durante e depois da execução.
+    """
+    
+    def __init__(self):
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self._counts = {
+            stage: {'completed': 0, 'failed': 0, 'busy_s': 0.0}
+            for stage in STAGES
+        }
+    
+    def start(self):
+        """Marca o início do lote"""
+        self.started = time.perf_counter()
+        self.finished = None
+    
+    def finish(self):
+        """Marca o fim do lote"""
+        self.finished = time.perf_counter()
+    
+    def count(self, stage: str, started: float, succeeded: bool):
+        """
+        Registra um documento concluído em uma etapa
+        
+        Args:
+            stage: 'extraction' ou 'analysis'
+            started: time.perf_counter() no início do documento na etapa
+            succeeded: False conta como falha
+        """
+        counts = self._counts[stage]
+        counts['completed' if succeeded else 'failed'] += 1
+        counts['busy_s'] += time.perf_counter() - started
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Contadores do lote
+        
+        Returns:
+            Dict com documentos concluídos/falhos, tempo ocupado e vazão
+            (documentos por segundo) de cada etapa; vazio antes de start()
+        """
+        if self.started is None:
+            return {}
+        
+        elapsed = (self.finished or time.perf_counter()) - self.started
+        stats: Dict[str, Any] = {'elapsed_s': round(elapsed, 3)}
+        for stage, counts in self._counts.items():
+            stats[stage] = {
+                'completed': counts['completed'],
+                'failed': counts['failed'],
+                'busy_s': round(counts['busy_s'], 3),
+                'throughput_per_s': round(counts['completed'] / elapsed, 3) if elapsed else 0.0
+            }
+        return stats
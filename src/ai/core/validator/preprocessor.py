@@ -5,11 +5,47 @@ Extrai e limpa texto de documentos (PDF, DOCX, TXT)
 
 import os
 import re
-from typing import Optional, Dict, Any
+import logging
+import mmap
+import codecs
+import time
+import asyncio
+from collections import deque
+from contextlib import aclosing
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import partial
+from typing import Optional, Dict, Any, AsyncIterator, Callable, List, NamedTuple, Set, Tuple
 from pathlib import Path
-import PyPDF2
-from docx import Document
-import aiofiles
+
+from . import extractors
+from .cache import ExtractionCache, file_sha256
+from .normalizer import TextNormalizer
+from .result import ExtractionResult
+from .sections import SectionIndexer, SectionVocabulary
+from .telemetry import ExtractionTelemetry, MetricsHook
+
+logger = logging.getLogger(__name__)
+
+
+class ExtractionQueueFullError(RuntimeError):
+    """Limite de profundidade da fila de extração atingido"""
+
+
+class _PdfSource(NamedTuple):
+    """Operações de parsing de PDF de um backend (leitor aberto ou por arquivo)"""
+    extract: Callable
+    fingerprints: Callable
+    extract_indices: Callable
+
+
+# Cabeçalho de sumário no início da página (restante da linha em 'rest') e
+# entradas típicas de sumário ("Geology ........ 12")
+_TOC_HEADING = re.compile(
+    r'\A\s*(?:table of contents|contents|sumário|índice|list of (?:figures|tables))'
+    r'(?!\w)(?P<rest>[^\n]*)',
+    re.IGNORECASE
+)
+_TOC_ENTRY = re.compile(r'\.{4,} ?\d+')
 
 
 class DocumentPreprocessor:
@@ -17,125 +53,931 @@ class DocumentPreprocessor:
     
     SUPPORTED_EXTENSIONS = {'.pdf', '.docx', '.doc', '.txt'}
     
-    def __init__(self):
+    # Páginas de PDF extraídas por tarefa no backend de threads (leitor aberto)
+    PAGES_PER_TASK = 8
+    
+    # Páginas por tarefa no pool de processos (cada tarefa reabre o arquivo)
+    PAGES_PER_PROCESS_TASK = 32
+    
+    # Bytes de TXT decodificados e limpos por bloco
+    TXT_CHUNK_SIZE = 256 * 1024
+    
+    # Páginas iniciais inspecionadas em busca de capa/sumário
+    FRONT_MATTER_MAX_PAGES = 20
+    
+    # Estimativa usada para converter orçamento em tokens para caracteres
+    CHARS_PER_TOKEN = 4
+    
+    # Versão da extração/limpeza; alterar invalida entradas antigas do cache
+    EXTRACTION_VERSION = 3
+    
+    # Versão das entradas por página (texto bruto por fingerprint de página)
+    PAGE_CACHE_VERSION = 1
+    
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_queue_depth: Optional[int] = None,
+        cache: Optional[ExtractionCache] = None,
+        keep_paragraphs: bool = False,
+        parallel_page_threshold: Optional[int] = None,
+        parallel_workers: Optional[int] = None,
+        metrics_hook: Optional[MetricsHook] = None,
+        dedup_pages: Optional[bool] = None,
+        section_titles: Optional[List[str]] = None
+    ):
+        """
+        Inicializa o preprocessor
+        
+        O parsing de PDF/DOCX nunca roda no event loop: com max_workers > 0 usa
+        um pool de processos dedicado; com 0 usa o executor de threads padrão.
+        
+        Args:
+            max_workers: Processos do pool de extração (usa QIVO_EXTRACTION_WORKERS se não fornecido)
+            max_queue_depth: Tarefas aguardando além das em execução antes de rejeitar
+                novas extrações (usa QIVO_EXTRACTION_QUEUE_DEPTH se não fornecido)
+            cache: Cache de texto extraído (usa QIVO_EXTRACTION_CACHE_PATH e
+                QIVO_EXTRACTION_CACHE_MAX_MB se não fornecido; sem cache se ausentes)
+            keep_paragraphs: Preserva limites de parágrafo ('\\n\\n') no texto limpo
+            parallel_page_threshold: PDFs com ao menos esse número de páginas são
+                extraídos em faixas paralelas no pool de processos (usa
+                QIVO_PARALLEL_PAGE_THRESHOLD se não fornecido)
+            parallel_workers: Faixas extraídas simultaneamente por documento (usa
+                QIVO_PARALLEL_WORKERS se não fornecido; padrão = max_workers)
+            metrics_hook: Função chamada com a metadata (incluindo 'telemetry')
+                de cada extração concluída, para exportar métricas
+            dedup_pages: Com cache, guarda o texto de cada página de PDF pelo
+                fingerprint do conteúdo, de modo que revisões de um relatório só
+                parseiam as páginas alteradas (usa QIVO_PAGE_DEDUP se não
+                fornecido; padrão ativo)
+            section_titles: Vocabulário de títulos do índice de seções (usa as
+                seções dos templates do Manus se não fornecido)
+        """
         self.metadata: Dict[str, Any] = {}
+        
+        if max_workers is None:
+            max_workers = int(os.getenv('QIVO_EXTRACTION_WORKERS', '0'))
+        if max_queue_depth is None:
+            max_queue_depth = int(os.getenv('QIVO_EXTRACTION_QUEUE_DEPTH', '16'))
+        
+        if parallel_page_threshold is None:
+            parallel_page_threshold = int(os.getenv('QIVO_PARALLEL_PAGE_THRESHOLD', '200'))
+        if parallel_workers is None:
+            parallel_workers = int(os.getenv('QIVO_PARALLEL_WORKERS', str(max_workers)))
+        
+        self.max_workers = max_workers
+        self.max_queue_depth = max_queue_depth
+        self.parallel_page_threshold = parallel_page_threshold
+        self.parallel_workers = parallel_workers
+        self._executor: Optional[Executor] = None
+        self._pending = 0
+        self._cache_fills: Set[asyncio.Task] = set()
+        
+        if cache is None and os.getenv('QIVO_EXTRACTION_CACHE_PATH'):
+            cache = ExtractionCache(
+                os.getenv('QIVO_EXTRACTION_CACHE_PATH'),
+                max_bytes=int(os.getenv('QIVO_EXTRACTION_CACHE_MAX_MB', '512')) * 1024 * 1024
+            )
+        self.cache = cache
+        
+        if dedup_pages is None:
+            dedup_pages = os.getenv('QIVO_PAGE_DEDUP', '1') == '1'
+        self.dedup_pages = dedup_pages
+        
+        self.keep_paragraphs = keep_paragraphs
+        self.page_separator = '\n\n' if keep_paragraphs else ' '
+        self._normalizer = TextNormalizer(keep_paragraphs=keep_paragraphs)
+        self.section_titles = section_titles
+        self.section_vocabulary = SectionVocabulary(section_titles, keep_paragraphs=keep_paragraphs)
+        self.metrics_hook = metrics_hook
+    
+    def with_workers(self, max_workers: int) -> 'DocumentPreprocessor':
+        """
+        Novo preprocessor com a mesma configuração e um pool de processos próprio
+        
+        Cache, limpeza, vocabulário de seções, metrics_hook, dedup e limites
+        de fila são os desta instância, então o texto extraído é o mesmo.
+        Encerre o pool com shutdown().
+        
+        Args:
+            max_workers: Processos do pool de extração
+        
+        Returns:
+            DocumentPreprocessor configurado como esta instância
+        """
+        return DocumentPreprocessor(
+            max_workers=max_workers,
+            max_queue_depth=self.max_queue_depth,
+            cache=self.cache,
+            keep_paragraphs=self.keep_paragraphs,
+            parallel_page_threshold=self.parallel_page_threshold,
+            metrics_hook=self.metrics_hook,
+            dedup_pages=self.dedup_pages,
+            section_titles=self.section_titles
+        )
     
     async def preprocess_text(self, file_path: str) -> str:
         """
         Extrai e limpa texto de arquivo
         
+        A metadata fica em get_metadata(), compartilhada pela instância; com
+        documentos concorrentes use extract(), que devolve o resultado
+        próprio de cada chamada.
+        
         Args:
             file_path: Caminho do arquivo
             
         Returns:
             Texto limpo e preprocessado
         """
-        path = Path(file_path)
+        return (await self.extract(file_path)).text
+    
+    async def extract(self, file_path: str) -> ExtractionResult:
+        """
+        Extrai e limpa texto de arquivo, com os dados desta extração
         
-        if not path.exists():
-            raise FileNotFoundError(f"Arquivo não encontrado: {file_path}")
+        Args:
+            file_path: Caminho do arquivo
         
-        extension = path.suffix.lower()
+        Returns:
+            ExtractionResult com texto limpo, metadata (com 'telemetry'),
+            posição de cada página, tempos de extração e índice de seções
+        """
+        started = time.perf_counter()
+        state: Dict[str, Any] = {}
+        indexer = SectionIndexer(self.section_vocabulary)
+        parts = []
+        page_offsets = []
+        offset = 0
         
-        if extension not in self.SUPPORTED_EXTENSIONS:
-            raise ValueError(f"Formato não suportado: {extension}")
+        # Consumir páginas já limpas, sem materializar o texto bruto inteiro
+        async for page_number, page_text in self._iter_pages(file_path, state):
+            if parts:
+                parts.append(self.page_separator)
+                offset += len(self.page_separator)
+            else:
+                state['first_page'] = time.perf_counter() - started
+            
+            page_offsets.append((page_number, offset))
+            indexer.feed(page_number, page_text, offset, is_toc=self._is_toc_page(page_text))
+            parts.append(page_text)
+            offset += len(page_text)
+        
+        metadata = state['metadata']
+        return self._build_result(
+            ''.join(parts), metadata, page_offsets, state, started,
+            byte_count=metadata['file_size'], indexer=indexer
+        )
+    
+    async def extract_with_budget(
+        self,
+        file_path: str,
+        max_chars: Optional[int] = None,
+        max_tokens: Optional[int] = None,
+        skip_front_matter: bool = False
+    ) -> ExtractionResult:
+        """
+        Extrai texto até preencher um orçamento, sem ler o restante do documento
+        
+        A leitura de páginas é interrompida assim que o orçamento é atingido;
+        páginas posteriores não são parseadas antes do retorno. A metadata
+        reflete apenas o trecho lido e indica se o documento foi truncado.
+        
+        Com cache configurado, uma leitura truncada que não veio do cache é
+        completada em segundo plano para gravar o documento inteiro, de modo
+        que a próxima chamada para o mesmo arquivo é servida do cache (ver
+        wait_cache_fills()).
+        
+        Args:
+            file_path: Caminho do arquivo
+            max_chars: Orçamento em caracteres
+            max_tokens: Orçamento em tokens (convertido por CHARS_PER_TOKEN)
+            skip_front_matter: Descarta capa e sumário antes de contar o orçamento
+        
+        Returns:
+            ExtractionResult com no máximo o orçamento em caracteres
+        """
+        budgets = [max_chars] if max_chars is not None else []
+        if max_tokens is not None:
+            budgets.append(max_tokens * self.CHARS_PER_TOKEN)
+        if not budgets:
+            raise ValueError("Informe max_chars ou max_tokens")
+        budget = min(budgets)
+        
+        started = time.perf_counter()
+        path = self._validate_path(file_path)
+        state: Dict[str, Any] = {}
+        indexer = SectionIndexer(self.section_vocabulary)
+        pages = self._iter_pages(file_path, state)
+        front_matter = {'skipped_pages': 0}
+        if skip_front_matter:
+            pages = self._skip_front_matter(pages, front_matter)
+        
+        parts = []
+        page_offsets = []
+        kept = 0
+        word_count = 0
+        last_page = 0
+        truncated = False
+        fill_cache = False
+        
+        try:
+            async for page_number, page_text in pages:
+                # Separador e página só entram se sobrar orçamento para texto
+                separator = self.page_separator if parts else ''
+                if kept + len(separator) >= budget:
+                    truncated = True
+                    break
+                
+                if parts:
+                    parts.append(separator)
+                    kept += len(separator)
+                else:
+                    state['first_page'] = time.perf_counter() - started
+                
+                last_page = page_number
+                page_offsets.append((page_number, kept))
+                piece = page_text[:budget - kept]
+                indexer.feed(page_number, piece, kept, is_toc=self._is_toc_page(page_text))
+                parts.append(piece)
+                kept += len(piece)
+                word_count += len(piece.split())
+                
+                if kept >= budget:
+                    truncated = True
+                    break
+            
+            fill_cache = truncated and self.cache is not None and not state.get('cache_hit', False)
+        finally:
+            if fill_cache:
+                self._fill_cache_later(pages)
+            else:
+                await pages.aclose()
+        
+        text = ''.join(parts)[:budget]
+        
+        metadata = self._build_metadata(
+            path,
+            page_count=last_page,
+            char_count=len(text),
+            word_count=word_count,
+            cache_hit=state.get('cache_hit', False)
+        )
+        metadata.update({
+            'reused_pages': state['telemetry'].reused_pages,
+            'truncated': truncated,
+            'skipped_pages': front_matter['skipped_pages']
+        })
+        
+        # Leitura interrompida: bytes efetivamente processados são desconhecidos
+        return self._build_result(
+            text, metadata, page_offsets, state, started,
+            byte_count=None if truncated else metadata['file_size'], indexer=indexer
+        )
+    
+    def _fill_cache_later(self, pages: AsyncIterator[Tuple[int, str]]):
+        """Termina em segundo plano uma leitura interrompida para gravar o documento no cache"""
+        task = asyncio.get_running_loop().create_task(self._drain_pages(pages))
+        self._cache_fills.add(task)
+        task.add_done_callback(self._cache_fills.discard)
+    
+    @staticmethod
+    async def _drain_pages(pages: AsyncIterator[Tuple[int, str]]):
+        """Consome as páginas restantes (o cache é gravado ao final de _iter_pages)"""
+        try:
+            async with aclosing(pages):
+                async for _ in pages:
+                    pass
+        except Exception:
+            logger.exception("Erro ao completar a extração para o cache")
+    
+    async def wait_cache_fills(self):
+        """Espera as extrações completadas em segundo plano para o cache"""
+        if self._cache_fills:
+            await asyncio.gather(*self._cache_fills, return_exceptions=True)
+    
+    def _build_result(
+        self,
+        text: str,
+        metadata: Dict[str, Any],
+        page_offsets: list,
+        state: Dict[str, Any],
+        started: float,
+        byte_count: Optional[int],
+        indexer: SectionIndexer
+    ) -> ExtractionResult:
+        """Monta o resultado imutável e atualiza a metadata de conveniência"""
+        sections = indexer.finalize(len(text))
+        metadata['section_count'] = len(sections)
+        self._finish_telemetry(metadata, state, byte_count)
+        
+        timings = {'total': time.perf_counter() - started}
+        if 'first_page' in state:
+            timings['first_page'] = state['first_page']
+        timings.update(state['telemetry'].stages)
+        
+        # Somente para get_metadata(); chamadas concorrentes devem usar o resultado
+        self.metadata = metadata
+        
+        return ExtractionResult(
+            text=text,
+            metadata=metadata,
+            page_offsets=page_offsets,
+            timings=timings,
+            sections=sections
+        )
+    
+    def _finish_telemetry(
+        self,
+        metadata: Dict[str, Any],
+        state: Dict[str, Any],
+        byte_count: Optional[int]
+    ):
+        """Adiciona a telemetria da extração à metadata e a envia ao metrics_hook"""
+        metadata['telemetry'] = state['telemetry'].summary(metadata['page_count'], byte_count)
+        
+        if self.metrics_hook is None:
+            return
+        
+        # Falha no exportador de métricas não deve derrubar a extração
+        try:
+            self.metrics_hook(dict(metadata))
+        except Exception:
+            logger.exception("Erro no metrics_hook do preprocessor")
+    
+    async def _skip_front_matter(
+        self,
+        pages: AsyncIterator[Tuple[int, str]],
+        stats: Dict[str, int]
+    ) -> AsyncIterator[Tuple[int, str]]:
+        """
+        Descarta capa e sumário no início do documento
+        
+        Páginas iniciais ficam em buffer até que um sumário seja encontrado
+        (tudo até ele é descartado, incluindo páginas de sumário seguidas) ou
+        até FRONT_MATTER_MAX_PAGES, caso em que nada é descartado.
+        """
+        buffered = []
+        in_toc = False
+        body = False
+        
+        async with aclosing(pages):
+            async for page_number, page_text in pages:
+                if not body:
+                    if self._is_toc_page(page_text):
+                        stats['skipped_pages'] += len(buffered) + 1
+                        buffered.clear()
+                        in_toc = True
+                        continue
+                    
+                    if not in_toc and page_number <= self.FRONT_MATTER_MAX_PAGES:
+                        buffered.append((page_number, page_text))
+                        continue
+                    
+                    body = True
+                    for page in buffered:
+                        yield page
+                    buffered.clear()
+                
+                yield page_number, page_text
+        
+        # Documento curto, sem sumário
+        for page in buffered:
+            yield page
+    
+    @staticmethod
+    def _is_toc_page(text: str) -> bool:
+        """
+        Detecta página de sumário/listas
+        
+        Sumário: três ou mais entradas pontilhadas, ou página que começa com
+        o cabeçalho ('Table of Contents', 'Índice') sozinho na linha ou
+        seguido de entradas. Páginas do corpo que começam com a palavra
+        ('Contents of the sample bags...') não são sumário.
+        """
+        entries = len(_TOC_ENTRY.findall(text))
+        if entries >= 3:
+            return True
+        heading = _TOC_HEADING.match(text)
+        return heading is not None and (not heading.group('rest').strip() or entries > 0)
+    
+    async def iter_pages(self, file_path: str) -> AsyncIterator[Tuple[int, str]]:
+        """
+        Extrai texto página a página (modo streaming)
+        
+        Cada página é limpa assim que extraída, de modo que o pico de memória
+        acompanha o tamanho da página e não o do documento. DOCX e TXT são
+        lidos em blocos de cerca de TXT_CHUNK_SIZE caracteres/bytes, cada um
+        numerado como uma página. Ao final, a metadata fica disponível em
+        get_metadata() (para chamadas concorrentes, prefira extract).
+        
+        Com cache configurado, o SHA-256 do arquivo é calculado antes do parsing;
+        em caso de hit as páginas armazenadas são devolvidas sem parsing algum.
+        
+        Args:
+            file_path: Caminho do arquivo
+        
+        Yields:
+            Tuplas (número da página, texto limpo) para páginas não vazias
+        """
+        state: Dict[str, Any] = {}
+        pages = self._iter_pages(file_path, state)
+        
+        async with aclosing(pages):
+            async for page in pages:
+                yield page
+        
+        metadata = state['metadata']
+        self._finish_telemetry(metadata, state, metadata['file_size'])
+        self.metadata = metadata
+    
+    async def _iter_pages(
+        self,
+        file_path: str,
+        state: Dict[str, Any]
+    ) -> AsyncIterator[Tuple[int, str]]:
+        """
+        Implementação de iter_pages com estado por chamada
+        
+        Args:
+            file_path: Caminho do arquivo
+            state: Dicionário da chamada; recebe 'telemetry' e 'cache_hit' antes
+                da primeira página e 'metadata' ao final
+        
+        Yields:
+            Tuplas (número da página, texto limpo)
+        """
+        telemetry = ExtractionTelemetry()
+        state['telemetry'] = telemetry
+        
+        with telemetry.stage('open'):
+            path = self._validate_path(file_path)
+            extension = path.suffix.lower()
+            
+            cache_key = None
+            cached = None
+            if self.cache is not None:
+                loop = asyncio.get_running_loop()
+                digest = await loop.run_in_executor(None, file_sha256, file_path)
+                mode = 'p' if self.keep_paragraphs else 's'
+                cache_key = f"v{self.EXTRACTION_VERSION}{mode}:{extension}:{digest}"
+                cached = await loop.run_in_executor(None, self.cache.get, cache_key)
+        
+        if cached is not None:
+            pages, counts = cached
+            state['cache_hit'] = True
+            state['metadata'] = self._build_metadata(path, **counts, cache_hit=True)
+            
+            for page in pages:
+                yield page
+            return
         
         # Detectar tipo e extrair
         if extension == '.pdf':
-            text = await self._extract_pdf(file_path)
+            raw_pages = self._iter_pdf_pages(file_path, telemetry)
         elif extension in {'.docx', '.doc'}:
-            text = await self._extract_docx(file_path)
-        elif extension == '.txt':
-            text = await self._extract_txt(file_path)
+            raw_pages = self._iter_docx_blocks(file_path, telemetry)
         else:
-            text = ""
+            raw_pages = self._iter_txt_chunks(file_path, telemetry)
+        
+        char_count = 0
+        word_count = 0
+        page_count = 0
+        stored_pages = [] if cache_key else None
+        
+        async with aclosing(raw_pages):
+            async for page_number, raw_text in raw_pages:
+                page_count = page_number
+                
+                # Limpar e normalizar
+                with telemetry.stage('clean'):
+                    page_text = self._clean_text(raw_text)
+                if not page_text:
+                    continue
+                
+                # Páginas são unidas pelo separador de página
+                char_count += len(page_text) + (len(self.page_separator) if char_count else 0)
+                word_count += len(page_text.split())
+                
+                if stored_pages is not None:
+                    stored_pages.append((page_number, page_text))
+                
+                yield page_number, page_text
+        
+        counts = {
+            'page_count': page_count,
+            'char_count': char_count,
+            'word_count': word_count
+        }
         
-        # Limpar e normalizar
-        cleaned_text = self._clean_text(text)
+        state['metadata'] = self._build_metadata(
+            path, **counts, cache_hit=False, reused_pages=telemetry.reused_pages
+        )
         
-        # Atualizar metadata
-        self.metadata = {
+        if cache_key:
+            await asyncio.get_running_loop().run_in_executor(
+                None, self.cache.put, cache_key, stored_pages, counts
+            )
+    
+    def _build_metadata(
+        self,
+        path: Path,
+        page_count: int,
+        char_count: int,
+        word_count: int,
+        cache_hit: bool,
+        reused_pages: int = 0
+    ) -> Dict[str, Any]:
+        """Monta metadata do documento processado"""
+        return {
             'file_name': path.name,
-            'file_type': extension,
+            'file_type': path.suffix.lower(),
             'file_size': path.stat().st_size,
-            'char_count': len(cleaned_text),
-            'word_count': len(cleaned_text.split())
+            'page_count': page_count,
+            'char_count': char_count,
+            'word_count': word_count,
+            'cache_hit': cache_hit,
+            'reused_pages': reused_pages
         }
+    
+    def _validate_path(self, file_path: str) -> Path:
+        """Valida existência e extensão do arquivo"""
+        path = Path(file_path)
+        
+        if not path.exists():
+            raise FileNotFoundError(f"Arquivo não encontrado: {file_path}")
+        
+        extension = path.suffix.lower()
+        
+        if extension not in self.SUPPORTED_EXTENSIONS:
+            raise ValueError(f"Formato não suportado: {extension}")
         
-        return cleaned_text
+        return path
     
-    async def _extract_pdf(self, file_path: str) -> str:
-        """Extrai texto de PDF"""
-        text = []
+    async def _iter_pdf_pages(
+        self,
+        file_path: str,
+        telemetry: Optional[ExtractionTelemetry] = None
+    ) -> AsyncIterator[Tuple[int, str]]:
+        """Extrai texto bruto de PDF página a página (em lotes no executor)"""
+        telemetry = telemetry or ExtractionTelemetry()
+        
+        if self.max_workers <= 0:
+            pages = self._iter_pdf_pages_threaded(file_path, telemetry)
+        else:
+            pages = self._iter_pdf_page_ranges(file_path, telemetry)
+        
+        async with aclosing(pages):
+            async for page in pages:
+                yield page
+    
+    async def _iter_pdf_pages_threaded(
+        self,
+        file_path: str,
+        telemetry: ExtractionTelemetry
+    ) -> AsyncIterator[Tuple[int, str]]:
+        """Backend de threads: um único leitor aberto, lotes de PAGES_PER_TASK"""
+        with telemetry.stage('open'):
+            reader = await self._run_pdf_extraction(extractors.PdfPageReader, file_path)
+        source = _PdfSource(reader.extract, reader.fingerprints, reader.extract_indices)
         
         try:
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
+            for start in range(0, reader.page_count, self.PAGES_PER_TASK):
+                with telemetry.stage('parse'):
+                    pages = await self._extract_pdf_batch(
+                        source, start, start + self.PAGES_PER_TASK, telemetry
+                    )
+                
+                for page_number, (page_text, seconds) in enumerate(pages, start=start + 1):
+                    if seconds is not None:
+                        telemetry.page_parsed(page_number, seconds)
+                    yield page_number, page_text
+        finally:
+            reader.close()
+    
+    async def _iter_pdf_page_ranges(
+        self,
+        file_path: str,
+        telemetry: ExtractionTelemetry
+    ) -> AsyncIterator[Tuple[int, str]]:
+        """
+        Backend de processos: faixas de páginas abertas de forma independente
+        
+        PDFs com ao menos parallel_page_threshold páginas têm até
+        parallel_workers faixas em extração simultânea; os resultados são
+        devolvidos na ordem original das páginas.
+        """
+        with telemetry.stage('open'):
+            page_count = await self._run_pdf_extraction(extractors.pdf_page_count, file_path)
+        size = self.PAGES_PER_PROCESS_TASK
+        window = 1
+        
+        if page_count >= self.parallel_page_threshold:
+            window = max(self.parallel_workers, 1)
+            # Cerca de duas faixas por worker: cada faixa reabre o arquivo
+            size = max(size, -(-page_count // (window * 2)))
+        
+        ranges = deque((start, min(start + size, page_count)) for start in range(0, page_count, size))
+        source = _PdfSource(
+            partial(extractors.extract_pdf_pages, file_path),
+            partial(extractors.pdf_page_fingerprints, file_path),
+            partial(extractors.extract_pdf_page_indices, file_path)
+        )
+        
+        in_flight = deque()
+        try:
+            while ranges or in_flight:
+                while ranges and len(in_flight) < window:
+                    start, end = ranges.popleft()
+                    task = asyncio.ensure_future(
+                        self._extract_pdf_batch(source, start, end, telemetry)
+                    )
+                    in_flight.append((start, task))
+                
+                start, task = in_flight.popleft()
+                with telemetry.stage('parse'):
+                    pages = await task
                 
-                for page in pdf_reader.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text.append(page_text)
+                for page_number, (page_text, seconds) in enumerate(pages, start=start + 1):
+                    if seconds is not None:
+                        telemetry.page_parsed(page_number, seconds)
+                    yield page_number, page_text
+        finally:
+            # Leitura interrompida (orçamento, erro): descartar faixas pendentes
+            for _, task in in_flight:
+                task.cancel()
+    
+    async def _extract_pdf_batch(
+        self,
+        source: _PdfSource,
+        start: int,
+        end: int,
+        telemetry: ExtractionTelemetry
+    ) -> List[Tuple[str, Optional[float]]]:
+        """
+        Extrai as páginas [start, end), reaproveitando páginas já vistas
+        
+        Com cache e dedup_pages, cada página é identificada pelo fingerprint
+        do content stream e dos recursos; só as páginas sem entrada no cache
+        são parseadas, e seu texto bruto é armazenado para revisões futuras.
+        
+        Returns:
+            Tuplas (texto bruto, segundos de parsing); segundos é None para
+            páginas reaproveitadas
+        """
+        if self.cache is None or not self.dedup_pages:
+            return await self._run_pdf_extraction(source.extract, start, end, admitted=True)
+        
+        fingerprints = await self._run_pdf_extraction(source.fingerprints, start, end, admitted=True)
+        keys = [f"page{self.PAGE_CACHE_VERSION}:{fingerprint}" for fingerprint in fingerprints]
+        
+        loop = asyncio.get_running_loop()
+        cached = await loop.run_in_executor(None, self.cache.get_many, keys)
+        
+        missing = [start + offset for offset, key in enumerate(keys) if key not in cached]
+        parsed = iter(
+            await self._run_pdf_extraction(source.extract_indices, missing, admitted=True)
+            if missing else []
+        )
+        
+        pages = []
+        stored = []
+        for key in keys:
+            if key in cached:
+                pages.append((cached[key][0][1], None))
+            else:
+                page_text, seconds = next(parsed)
+                pages.append((page_text, seconds))
+                stored.append((key, [(0, page_text)]))
+        
+        telemetry.reused_pages += len(keys) - len(missing)
+        if stored:
+            await loop.run_in_executor(None, self.cache.put_many, stored)
+        
+        return pages
+    
+    async def _run_pdf_extraction(self, func: Callable, *args, admitted: bool = False):
+        """Executa etapa de parsing de PDF no executor"""
+        try:
+            return await self._run_extraction(func, *args, admitted=admitted)
+        except ExtractionQueueFullError:
+            raise
         except Exception as e:
             raise ValueError(f"Erro ao ler PDF: {str(e)}")
+    
+    async def _extract_pdf(self, file_path: str) -> str:
+        """Extrai texto de PDF"""
+        text = []
+        
+        async for _, page_text in self._iter_pdf_pages(file_path):
+            if page_text:
+                text.append(page_text)
         
         return '\n'.join(text)
     
-    async def _extract_docx(self, file_path: str) -> str:
-        """Extrai texto de DOCX"""
-        text = []
+    async def _iter_docx_blocks(
+        self,
+        file_path: str,
+        telemetry: Optional[ExtractionTelemetry] = None
+    ) -> AsyncIterator[Tuple[int, str]]:
+        """
+        Extrai texto bruto de DOCX em streaming (parágrafos e linhas de tabela)
+        
+        No backend de threads um único leitor fica aberto e devolve lotes de
+        cerca de TXT_CHUNK_SIZE caracteres, cada um numerado como uma página.
+        No pool de processos o documento é extraído em uma única tarefa.
+        """
+        telemetry = telemetry or ExtractionTelemetry()
+        separator = '\n\n' if self.keep_paragraphs else '\n'
+        
+        if self.max_workers > 0:
+            started = time.perf_counter()
+            with telemetry.stage('parse'):
+                text = await self._run_docx_extraction(extractors.extract_docx, file_path, separator)
+            telemetry.page_parsed(1, time.perf_counter() - started)
+            yield 1, text
+            return
+        
+        with telemetry.stage('open'):
+            reader = await self._run_docx_extraction(extractors.DocxBlockReader, file_path)
         
         try:
-            doc = Document(file_path)
-            
-            for paragraph in doc.paragraphs:
-                if paragraph.text.strip():
-                    text.append(paragraph.text)
-            
-            # Extrair texto de tabelas
-            for table in doc.tables:
-                for row in table.rows:
-                    row_text = ' | '.join([cell.text.strip() for cell in row.cells])
-                    if row_text.strip():
-                        text.append(row_text)
+            page_number = 0
+            while True:
+                started = time.perf_counter()
+                with telemetry.stage('parse'):
+                    blocks = await self._run_docx_extraction(
+                        reader.read, self.TXT_CHUNK_SIZE, admitted=True
+                    )
+                if not blocks:
+                    break
+                
+                page_number += 1
+                telemetry.page_parsed(page_number, time.perf_counter() - started)
+                yield page_number, separator.join(blocks)
+        finally:
+            reader.close()
+    
+    async def _run_docx_extraction(self, func: Callable, *args, admitted: bool = False):
+        """Executa etapa de parsing de DOCX no executor"""
+        try:
+            return await self._run_extraction(func, *args, admitted=admitted)
+        except ExtractionQueueFullError:
+            raise
         except Exception as e:
             raise ValueError(f"Erro ao ler DOCX: {str(e)}")
+    
+    async def _extract_docx(self, file_path: str) -> str:
+        """Extrai texto de DOCX"""
+        text = []
+        
+        async for _, block_text in self._iter_docx_blocks(file_path):
+            text.append(block_text)
         
         return '\n'.join(text)
     
-    async def _extract_txt(self, file_path: str) -> str:
-        """Extrai texto de TXT"""
+    async def _iter_txt_chunks(
+        self,
+        file_path: str,
+        telemetry: Optional[ExtractionTelemetry] = None
+    ) -> AsyncIterator[Tuple[int, str]]:
+        """
+        Lê TXT via mmap em blocos limitados, decodificando UTF-8 incrementalmente
+        
+        Os blocos são cortados após um espaço em branco (ou após uma linha em
+        branco, com keep_paragraphs), de forma que limpar cada bloco
+        separadamente equivale a limpar o arquivo inteiro.
+        """
+        telemetry = telemetry or ExtractionTelemetry()
+        
         try:
-            async with aiofiles.open(file_path, 'r', encoding='utf-8', errors='ignore') as file:
-                text = await file.read()
-                return text
+            with open(file_path, 'rb') as file:
+                size = os.fstat(file.fileno()).st_size
+                if size == 0:
+                    return
+                
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    decoder = codecs.getincrementaldecoder('utf-8')(errors='ignore')
+                    pending = ''
+                    chunk_number = 0
+                    
+                    for offset in range(0, size, self.TXT_CHUNK_SIZE):
+                        started = time.perf_counter()
+                        final = offset + self.TXT_CHUNK_SIZE >= size
+                        text = pending + decoder.decode(
+                            mapped[offset:offset + self.TXT_CHUNK_SIZE], final=final
+                        )
+                        cut = len(text) if final else self._chunk_boundary(text)
+                        pending = text[cut:]
+                        seconds = time.perf_counter() - started
+                        telemetry.stages['parse'] += seconds
+                        
+                        if cut:
+                            chunk_number += 1
+                            telemetry.page_parsed(chunk_number, seconds)
+                            yield chunk_number, text[:cut]
+                        
+                        # Devolver o controle ao event loop entre blocos
+                        await asyncio.sleep(0)
         except Exception as e:
             raise ValueError(f"Erro ao ler TXT: {str(e)}")
     
+    def _chunk_boundary(self, text: str) -> int:
+        """Posição de corte do bloco: após a última quebra segura"""
+        if self.keep_paragraphs:
+            index = text.rfind('\n\n')
+            if index >= 0:
+                return index + 2
+        
+        for index in range(len(text) - 1, -1, -1):
+            if text[index].isspace():
+                return index + 1
+        
+        # Bloco sem espaços: corte forçado
+        return len(text)
+    
+    async def _extract_txt(self, file_path: str) -> str:
+        """Extrai texto de TXT"""
+        return ''.join([chunk async for _, chunk in self._iter_txt_chunks(file_path)])
+    
     def _clean_text(self, text: str) -> str:
         """
         Remove ruído e normaliza texto
         
         Args:
             text: Texto bruto
-            
+        
         Returns:
             Texto limpo
         """
-        # Remover múltiplos espaços
-        text = re.sub(r'\s+', ' ', text)
+        return self._normalizer.normalize(text)
+    
+    async def _run_extraction(self, func: Callable, *args, admitted: bool = False):
+        """
+        Executa função de parsing fora do event loop
+        
+        O limite de fila é aplicado na admissão de um documento; tarefas
+        seguintes do mesmo documento (admitted=True) não são rejeitadas.
+        
+        Args:
+            func: Função síncrona de extractors (deve ser serializável)
+            *args: Argumentos da função
+            admitted: Tarefa de um documento já admitido
+        
+        Returns:
+            Resultado da função
+        
+        Raises:
+            ExtractionQueueFullError: Se a fila de extração estiver cheia
+        """
+        limit = max(self.max_workers, 1) + self.max_queue_depth
+        if not admitted and self._pending >= limit:
+            raise ExtractionQueueFullError(
+                f"Fila de extração cheia ({self._pending} tarefas pendentes)"
+            )
         
-        # Remover caracteres especiais excessivos
-        text = re.sub(r'[^\w\s\.,;:!?()\-\[\]{}]', '', text)
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self._pending -= 1
+    
+    def _get_executor(self) -> Optional[Executor]:
+        """Cria o pool de processos sob demanda (None = executor padrão do loop)"""
+        if self.max_workers <= 0:
+            return None
+        
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
         
-        # Normalizar quebras de linha
-        text = re.sub(r'\n+', '\n', text)
+        return self._executor
+    
+    def shutdown(self, wait: bool = True):
+        """
+        Encerra o pool de processos de extração, se existir
         
-        # Remover espaços no início/fim
-        text = text.strip()
+        Extrações em segundo plano para o cache são canceladas.
         
-        return text
+        Args:
+            wait: Espera as extrações pendentes; com False as que ainda não
+                começaram são canceladas e a chamada retorna imediatamente
+        """
+        for task in self._cache_fills:
+            task.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=not wait)
+            self._executor = None
+    
+    def get_cache_stats(self) -> Optional[Dict[str, Any]]:
+        """Retorna contadores do cache de extração (None se desabilitado)"""
+        return self.cache.stats() if self.cache is not None else None
     
     def get_metadata(self) -> Dict[str, Any]:
-        """Retorna metadata do último documento processado"""
+        """
+        Retorna metadata do último documento processado
+        
+        Compartilhada entre chamadas; com documentos concorrentes use
+        ExtractionResult.metadata.
+        """
         return self.metadata
@@ -0,0 +1,110 @@
+"""
+QIVO Intelligence Layer - Extraction Result Module
+Resultado imutável de uma extração, próprio de cada requisição
+"""
+
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from .sections import Section
+
+
+def _freeze(value: Any) -> Any:
+    """Cópia somente leitura: dicionários (também os aninhados) viram MappingProxyType e listas, tuplas"""
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """Inverso de _freeze: dicionários e listas comuns (serializáveis)"""
+    if isinstance(value, Mapping):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+
+@dataclass(frozen=True, slots=True)
+class ExtractionResult:
+    """
+    Texto extraído de um documento e seus dados de extração
+    
+    Cada chamada de extract/extract_with_budget devolve seu próprio
+    resultado, de forma que uma única instância de DocumentPreprocessor (e do
+    ValidatorAI) pode atender documentos concorrentes sem compartilhar estado.
+    metadata e timings são copiados em profundidade ao criar o resultado
+    (incluindo 'telemetry'), então alterar a metadata do preprocessor ou a
+    enviada ao metrics_hook não altera o resultado.
+    
+    Attributes:
+        text: Texto limpo
+        metadata: Metadata do documento (somente leitura)
+        page_offsets: Pares (número da página, posição inicial em text)
+        timings: Tempos de extração em segundos (somente leitura)
+        sections: Índice de seções (cabeçalhos com posições em text)
+    """
+    
+    text: str
+    metadata: Mapping[str, Any] = field(default_factory=dict)
+    page_offsets: Tuple[Tuple[int, int], ...] = ()
+    timings: Mapping[str, float] = field(default_factory=dict)
+    sections: Tuple[Section, ...] = ()
+    
+    def __post_init__(self):
+        object.__setattr__(self, 'metadata', _freeze(self.metadata or {}))
+        object.__setattr__(self, 'timings', _freeze(self.timings or {}))
+        object.__setattr__(self, 'page_offsets', tuple(tuple(pair) for pair in self.page_offsets))
+        object.__setattr__(self, 'sections', tuple(self.sections))
+    
+    def page_at(self, offset: int) -> Optional[int]:
+        """
+        Retorna o número da página que contém a posição offset do texto
+        
+        Args:
+            offset: Posição em text
+        
+        Returns:
+            Número da página ou None se offset estiver antes da primeira página
+        """
+        index = bisect_right(self.page_offsets, offset, key=lambda pair: pair[1]) - 1
+        return self.page_offsets[index][0] if index >= 0 else None
+    
+    def find_section(self, name: str) -> Optional[Section]:
+        """
+        Localiza uma seção pelo número ('14') ou título (sem diferenciar caixa)
+        
+        Args:
+            name: Número ou título da seção
+        
+        Returns:
+            Primeira seção correspondente ou None
+        """
+        key = name.strip().lower()
+        for section in self.sections:
+            if section.number == key or section.title.lower() == key:
+                return section
+        return None
+    
+    def section_text(self, name: str) -> Optional[str]:
+        """Texto de uma seção (ver find_section), sem novo scan do documento"""
+        section = self.find_section(name)
+        return self.text[section.start:section.end] if section else None
+    
+    def metadata_dict(self) -> Dict[str, Any]:
+        """Cópia da metadata em dicionários comuns (mutável e serializável)"""
+        return _thaw(self.metadata)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Representação serializável (dicionários comuns)"""
+        return {
+            'text': self.text,
+            'metadata': self.metadata_dict(),
+            'page_offsets': [list(pair) for pair in self.page_offsets],
+            'timings': dict(self.timings),
+            'sections': [section.to_dict() for section in self.sections]
+        }
@@ -0,0 +1,317 @@
+"""
+QIVO Intelligence Layer - Rulesets Module
+Regras de scoring versionadas, carregadas de arquivo e recarregadas sem reinício
+"""
+
+import json
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple
+
+from .matcher import KeywordMatcher
+
+logger = logging.getLogger(__name__)
+
+RISK_LEVELS = ('low', 'moderate', 'high')
+
+# Matchers compilados por (hash das palavras-chave, modo de fronteira)
+MATCHER_CACHE_SIZE = 16
+_matchers: 'OrderedDict[Tuple[str, str], KeywordMatcher]' = OrderedDict()
+_matchers_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class Ruleset:
+    """
+    Regras de scoring de compliance
+    
+    Formato do arquivo (JSON):
+        {
+            "version": "2025.03",
+            "keywords": {"jorc": ["jorc", "ore reserve"], ...},
+            "weights": {"jorc": 0.25, ...},
+            "risk_thresholds": {"low": 80, "moderate": 60, "high": 40},
+            "strength_min": 3,
+            "weakness_below": 2,
+            "recommendations": {"jorc": "Aumentar referências ao JORC", ...},
+            "default_recommendation": "Documento apresenta boa conformidade geral"
+        }
+    Apenas version, keywords e weights são obrigatórios.
+    
+    Attributes:
+        version: Versão declarada (registrada em cada resultado)
+        keywords: Palavras-chave por categoria
+        weights: Peso de cada categoria no score
+        risk_thresholds: Score mínimo dos níveis low/moderate/high (abaixo: crítico)
+        strength_min: Ocorrências a partir das quais a categoria é ponto forte
+        weakness_below: Ocorrências abaixo das quais a categoria é ponto fraco
+        recommendations: Recomendação para cada categoria fraca
+        default_recommendation: Recomendação quando não há pontos fracos
+        digest: SHA-256 do conteúdo
+        keywords_digest: SHA-256 das palavras-chave (chave do cache de matchers)
+    """
+    
+    version: str
+    keywords: Mapping[str, Tuple[str, ...]]
+    weights: Mapping[str, float]
+    risk_thresholds: Mapping[str, int] = field(
+        default_factory=lambda: {'low': 80, 'moderate': 60, 'high': 40}
+    )
+    strength_min: int = 3
+    weakness_below: int = 2
+    recommendations: Mapping[str, str] = field(default_factory=dict)
+    default_recommendation: str = "Documento apresenta boa conformidade geral"
+    digest: str = field(init=False, compare=False)
+    keywords_digest: str = field(init=False, compare=False)
+    
+    def __post_init__(self):
+        keywords = {category: tuple(words) for category, words in self.keywords.items()}
+        weights = {category: float(weight) for category, weight in self.weights.items()}
+        thresholds = {level: int(score) for level, score in self.risk_thresholds.items()}
+        
+        if not self.version:
+            raise ValueError("Ruleset sem versão")
+        missing = [category for category in weights if category not in keywords]
+        if missing:
+            raise ValueError(f"Categorias com peso e sem palavras-chave: {', '.join(missing)}")
+        unknown = [level for level in thresholds if level not in RISK_LEVELS]
+        if unknown:
+            raise ValueError(f"Níveis de risco inválidos: {', '.join(unknown)}")
+        
+        object.__setattr__(self, 'version', str(self.version))
+        object.__setattr__(self, 'keywords', MappingProxyType(keywords))
+        object.__setattr__(self, 'weights', MappingProxyType(weights))
+        object.__setattr__(self, 'risk_thresholds', MappingProxyType(thresholds))
+        object.__setattr__(self, 'recommendations', MappingProxyType(dict(self.recommendations)))
+        
+        object.__setattr__(self, 'digest', _digest(self.to_dict()))
+        object.__setattr__(self, 'keywords_digest', _digest(keywords))
+    
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> 'Ruleset':
+        """
+        Cria o ruleset a partir do conteúdo de um arquivo
+        
+        Args:
+            data: Dicionário no formato do arquivo
+        
+        Returns:
+            Ruleset validado
+        
+        Raises:
+            ValueError: Campos ausentes ou inválidos
+        """
+        try:
+            keywords = {
+                category: [str(word) for word in words]
+                for category, words in data['keywords'].items()
+            }
+            return cls(
+                version=data['version'],
+                keywords=keywords,
+                weights=data['weights'],
+                **{key: data[key] for key in _OPTIONAL_FIELDS if key in data}
+            )
+        except (KeyError, TypeError, AttributeError) as e:
+            raise ValueError(f"Ruleset inválido: {e!r}") from e
+    
+    @classmethod
+    def from_file(cls, path: str) -> 'Ruleset':
+        """Carrega um ruleset de arquivo JSON (ver formato na classe)"""
+        with open(path, 'r', encoding='utf-8') as file:
+            try:
+                data = json.load(file)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Ruleset inválido em {path}: {e}") from e
+        return cls.from_dict(data)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Conteúdo no formato do arquivo"""
+        return {
+            'version': self.version,
+            'keywords': {category: list(words) for category, words in self.keywords.items()},
+            'weights': dict(self.weights),
+            'risk_thresholds': dict(self.risk_thresholds),
+            'strength_min': self.strength_min,
+            'weakness_below': self.weakness_below,
+            'recommendations': dict(self.recommendations),
+            'default_recommendation': self.default_recommendation
+        }
+
+
+def _digest(data: Any) -> str:
+    canonical = json.dumps(data, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+_OPTIONAL_FIELDS = (
+    'risk_thresholds', 'strength_min', 'weakness_below', 'recommendations',
+    'default_recommendation'
+)
+
+
+def compiled_matcher(ruleset: Ruleset, boundary: str) -> KeywordMatcher:
+    """
+    Matcher das palavras-chave do ruleset, compilado uma vez por hash
+    
+    Rulesets que só diferem em pesos, limites ou recomendações compartilham
+    o mesmo matcher.
+    
+    Args:
+        ruleset: Ruleset
+        boundary: Modo de fronteira do KeywordMatcher
+    
+    Returns:
+        KeywordMatcher compartilhado entre scorers
+    """
+    return _cached_matcher(ruleset.keywords_digest, ruleset.keywords, boundary)
+
+
+def keywords_matcher(keywords: Mapping[str, Iterable[str]], boundary: str) -> KeywordMatcher:
+    """
+    Matcher de palavras-chave avulsas, no mesmo cache dos rulesets
+    
+    Args:
+        keywords: Palavras-chave por categoria
+        boundary: Modo de fronteira do KeywordMatcher
+    
+    Returns:
+        KeywordMatcher (o mesmo de um ruleset com as mesmas palavras-chave)
+    """
+    keywords = {category: tuple(words) for category, words in keywords.items()}
+    return _cached_matcher(_digest(keywords), keywords, boundary)
+
+
+def _cached_matcher(
+    digest: str,
+    keywords: Mapping[str, Tuple[str, ...]],
+    boundary: str
+) -> KeywordMatcher:
+    key = (digest, boundary)
+    with _matchers_lock:
+        matcher = _matchers.get(key)
+        if matcher is not None:
+            _matchers.move_to_end(key)
+            return matcher
+    
+    # Compilação fora do lock: leitores de outros rulesets não esperam
+    matcher = KeywordMatcher(keywords, boundary)
+    
+    with _matchers_lock:
+        matcher = _matchers.setdefault(key, matcher)
+        while len(_matchers) > MATCHER_CACHE_SIZE:
+            _matchers.popitem(last=False)
+    return matcher
+
+
+class RulesetStore:
+    """
+    Ruleset corrente e seu matcher, trocados atomicamente
+    
+    snapshot() não usa lock: a troca é a atribuição de uma única tupla
+    (ruleset, matcher), então uma avaliação em andamento termina com as
+    regras que leu enquanto as seguintes já usam as novas. Com path, o
+    arquivo é verificado (mtime e tamanho) no máximo a cada
+    reload_interval segundos; um arquivo inválido é registrado no log e as
+    regras atuais são mantidas.
+    """
+    
+    def __init__(
+        self,
+        ruleset: Optional[Ruleset] = None,
+        path: Optional[str] = None,
+        boundary: str = 'none',
+        reload_interval: float = 5.0
+    ):
+        """
+        Inicializa o store
+        
+        Args:
+            ruleset: Regras iniciais (obrigatório sem path)
+            path: Arquivo JSON versionado; carregado agora e recarregado se mudar
+            boundary: Modo de fronteira dos matchers
+            reload_interval: Segundos entre verificações do arquivo (0 = a cada uso)
+        
+        Raises:
+            ValueError: Sem regras, ou arquivo inicial inválido
+        """
+        self.path = path
+        self.boundary = boundary
+        self.reload_interval = reload_interval
+        self._reload_lock = threading.Lock()
+        self._file_state: Optional[Tuple[int, int]] = None
+        self._next_check = 0.0
+        
+        if path:
+            ruleset = Ruleset.from_file(path)
+            self._file_state = self._stat()
+            self._next_check = time.monotonic() + reload_interval
+        elif ruleset is None:
+            raise ValueError("RulesetStore requer ruleset ou path")
+        
+        self._current = (ruleset, compiled_matcher(ruleset, boundary))
+    
+    def snapshot(self) -> Tuple[Ruleset, KeywordMatcher]:
+        """Regras e matcher correntes (consistentes entre si)"""
+        if self.path and time.monotonic() >= self._next_check:
+            self.reload()
+        return self._current
+    
+    def reload(self) -> bool:
+        """
+        Recarrega o arquivo se ele mudou
+        
+        Se outra thread já está recarregando, retorna sem esperar.
+        
+        Returns:
+            True se as regras foram trocadas
+        """
+        if not self.path or not self._reload_lock.acquire(blocking=False):
+            return False
+        
+        try:
+            self._next_check = time.monotonic() + self.reload_interval
+            state = self._stat()
+            if state is None or state == self._file_state:
+                return False
+            
+            try:
+                ruleset = Ruleset.from_file(self.path)
+            except (OSError, ValueError):
+                logger.exception("Falha ao recarregar ruleset de %s; mantendo versão %s",
+                                 self.path, self._current[0].version)
+                return False
+            finally:
+                self._file_state = state
+            
+            return self.replace(ruleset)
+        finally:
+            self._reload_lock.release()
+    
+    def replace(self, ruleset: Ruleset) -> bool:
+        """
+        Troca as regras (a compilação acontece antes da troca)
+        
+        Returns:
+            True se o conteúdo mudou
+        """
+        if ruleset.digest == self._current[0].digest:
+            return False
+        
+        self._current = (ruleset, compiled_matcher(ruleset, self.boundary))
+        logger.info("Ruleset %s ativo (%s)", ruleset.version, ruleset.digest[:12])
+        return True
+    
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
@@ -3,9 +3,26 @@ QIVO Intelligence Layer - Compliance Scoring Module
 Avalia e pontua conformidade regulatória
 """
 
-from typing import Dict, Any, List
+import os
+import dataclasses
+from dataclasses import dataclass
+from typing import Dict, Any, Iterable, List, Optional, Sequence, Tuple
 from enum import Enum
 
+try:
+    import numpy as np
+except ImportError:  # Necessário apenas para evaluate_many
+    np = None
+
+from .heatmap import Heatmap
+from .rulesets import Ruleset, RulesetStore, keywords_matcher
+from .sections import Section
+
+
+def _require_numpy():
+    if np is None:
+        raise RuntimeError("Avaliação em lote requer numpy (pip install numpy)")
+
 
 class RiskLevel(str, Enum):
     """Níveis de risco de compliance"""
@@ -15,8 +32,78 @@ class RiskLevel(str, Enum):
     CRITICAL = "crítico"
 
 
+@dataclass(frozen=True)
+class ScoreBatch:
+    """
+    Resultado de evaluate_many em colunas (arrays NumPy, uma linha por texto)
+    
+    Attributes:
+        categories: Categorias, na ordem das colunas de counts
+        counts: Matriz textos × categorias de ocorrências
+        compliance_score: Score (0-100) de cada texto
+        risk_level: Nível de risco de cada texto (valores de RiskLevel)
+        strengths: Matriz booleana de pontos fortes
+        weaknesses: Matriz booleana de pontos fracos
+        ruleset: Regras usadas (versão em ruleset.version)
+    """
+    
+    categories: Tuple[str, ...]
+    counts: Any
+    compliance_score: Any
+    risk_level: Any
+    strengths: Any
+    weaknesses: Any
+    ruleset: Ruleset
+    
+    def __len__(self) -> int:
+        return len(self.compliance_score)
+    
+    def row(self, index: int) -> Dict[str, Any]:
+        """
+        Resultado de um texto no formato de evaluate()
+        
+        Args:
+            index: Linha
+        
+        Returns:
+            Dict com score, risk_level e breakdown detalhado
+        """
+        counts = dict(zip(self.categories, self.counts[index].tolist()))
+        weaknesses = [c for c, weak in zip(self.categories, self.weaknesses[index]) if weak]
+        
+        return {
+            'compliance_score': int(self.compliance_score[index]),
+            'risk_level': str(self.risk_level[index]),
+            'breakdown': ComplianceScorer._breakdown(counts),
+            'strengths': [c for c, strong in zip(self.categories, self.strengths[index]) if strong],
+            'weaknesses': weaknesses,
+            'recommendations': ComplianceScorer._recommendations(weaknesses, self.ruleset),
+            'ruleset_version': self.ruleset.version
+        }
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Colunas como listas serializáveis (uma coluna de ocorrências por categoria)"""
+        columns = {
+            'ruleset_version': self.ruleset.version,
+            'compliance_score': self.compliance_score.tolist(),
+            'risk_level': self.risk_level.tolist()
+        }
+        for index, category in enumerate(self.categories):
+            columns[f'{category}_count'] = self.counts[:, index].tolist()
+        return columns
+
+
 class ComplianceScorer:
-    """Avalia conformidade de documentos técnicos"""
+    """
+    Avalia conformidade de documentos técnicos
+    
+    As regras (palavras-chave, pesos, limites e recomendações) vêm de um
+    Ruleset. Sem arquivo configurado, valem as regras embutidas abaixo
+    (versão 'builtin'); com QIVO_RULESET_PATH (ou ruleset_path), o arquivo
+    JSON versionado é recarregado quando muda, sem reiniciar o processo.
+    """
+    
+    BUILTIN_VERSION = 'builtin'
     
     # Palavras-chave por categoria
     JORC_KEYWORDS = [
@@ -44,14 +131,98 @@ class ComplianceScorer:
         'competent person', 'qualified person', 'certification', 'audit'
     ]
     
-    def __init__(self):
-        self.scoring_weights = {
-            'jorc': 0.25,
-            'ni_43_101': 0.25,
-            'prms': 0.15,
-            'qa_qc': 0.20,
-            'compliance': 0.15
-        }
+    SCORING_WEIGHTS = {
+        'jorc': 0.25,
+        'ni_43_101': 0.25,
+        'prms': 0.15,
+        'qa_qc': 0.20,
+        'compliance': 0.15
+    }
+    
+    RECOMMENDATIONS = {
+        'jorc': "Aumentar referências ao código JORC e classificação de recursos/reservas",
+        'ni_43_101': "Incluir mais informações sobre NI 43-101 e pessoa qualificada",
+        'prms': "Adicionar detalhes sobre classificação de recursos petrolíferos (PRMS)",
+        'qa_qc': "Fortalecer descrição de procedimentos de QA/QC e amostragem",
+        'compliance': "Melhorar documentação de conformidade regulatória"
+    }
+    
+    # Nome dos campos do breakdown por categoria (demais: '<categoria>_mentions')
+    BREAKDOWN_KEYS = {'compliance': 'compliance_terms'}
+    
+    def __init__(
+        self,
+        boundary: Optional[str] = None,
+        ruleset: Optional[Ruleset] = None,
+        ruleset_path: Optional[str] = None,
+        reload_interval: Optional[float] = None
+    ):
+        """
+        Inicializa o scorer
+        
+        Args:
+            boundary: Fronteira de palavra na contagem ('none' = substring,
+                a contagem original com str.count; 'start' = início de
+                palavra; 'word' = palavra inteira). Padrão:
+                QIVO_KEYWORD_BOUNDARY ou 'none'. 'start' e 'word' deixam de
+                contar termos dentro de outras palavras ('cim' em
+                'specimen'), o que muda scores e níveis de risco já emitidos
+            ruleset: Regras fixas (padrão: regras embutidas)
+            ruleset_path: Arquivo JSON de regras recarregável (padrão: QIVO_RULESET_PATH)
+            reload_interval: Segundos entre verificações do arquivo
+                (padrão: QIVO_RULESET_RELOAD_S ou 5)
+        """
+        self.boundary = boundary or os.getenv('QIVO_KEYWORD_BOUNDARY', 'none')
+        
+        if reload_interval is None:
+            reload_interval = float(os.getenv('QIVO_RULESET_RELOAD_S', '5'))
+        
+        # Ruleset e matcher (todas as categorias em um único autômato,
+        # compilado uma vez por ruleset) trocados juntos
+        self.rulesets = RulesetStore(
+            ruleset or self.builtin_ruleset(),
+            path=ruleset_path or os.getenv('QIVO_RULESET_PATH') or None,
+            boundary=self.boundary,
+            reload_interval=reload_interval
+        )
+    
+    @classmethod
+    def builtin_ruleset(cls) -> Ruleset:
+        """Regras embutidas (constantes da classe)"""
+        return Ruleset(
+            version=cls.BUILTIN_VERSION,
+            keywords={
+                'jorc': cls.JORC_KEYWORDS,
+                'ni_43_101': cls.NI_43_101_KEYWORDS,
+                'prms': cls.PRMS_KEYWORDS,
+                'qa_qc': cls.QA_QC_KEYWORDS,
+                'compliance': cls.COMPLIANCE_KEYWORDS
+            },
+            weights=cls.SCORING_WEIGHTS,
+            recommendations=cls.RECOMMENDATIONS
+        )
+    
+    @property
+    def ruleset(self) -> Ruleset:
+        """Regras em vigor"""
+        return self.rulesets.snapshot()[0]
+    
+    @property
+    def matcher(self):
+        """Matcher compilado das regras em vigor"""
+        return self.rulesets.snapshot()[1]
+    
+    @property
+    def scoring_weights(self) -> Dict[str, float]:
+        """Pesos das regras em vigor"""
+        return dict(self.ruleset.weights)
+    
+    @scoring_weights.setter
+    def scoring_weights(self, weights: Dict[str, float]):
+        # Nova versão local das regras (substituída no próximo reload do arquivo)
+        ruleset = self.ruleset
+        version = ruleset.version if ruleset.version.endswith('+local') else f'{ruleset.version}+local'
+        self.rulesets.replace(dataclasses.replace(ruleset, version=version, weights=weights))
     
     def evaluate(self, analysis: str) -> Dict[str, Any]:
         """
@@ -63,40 +234,112 @@ class ComplianceScorer:
         Returns:
             Dict com score, risk_level e breakdown detalhado
         """
-        text_lower = analysis.lower()
+        # Regras e matcher lidos uma vez: uma troca de ruleset durante a
+        # avaliação não mistura versões
+        ruleset, matcher = self.rulesets.snapshot()
+        
+        # Calcular scores por categoria (uma única passagem pelo texto)
+        scores = matcher.count(analysis)
+        
+        return self._result(scores, ruleset)
+    
+    def evaluate_density(self, text: str, per_chars: int = 10000) -> Dict[str, Any]:
+        """
+        Avalia pela densidade de palavras-chave (ocorrências a cada per_chars caracteres)
+        
+        evaluate() foi calibrado para a análise do GPT, um texto curto: em um
+        documento inteiro as contagens crescem com o tamanho e qualquer
+        relatório longo atinge o teto de cada categoria. Aqui as ocorrências
+        são convertidas para ocorrências por per_chars caracteres antes dos
+        pesos e limites, então o score não depende do tamanho do documento.
+        Textos com até per_chars caracteres têm o mesmo resultado de evaluate().
+        
+        Args:
+            text: Texto do documento
+            per_chars: Tamanho de referência em caracteres
+        
+        Returns:
+            Dict no formato de evaluate() (breakdown em ocorrências por
+            per_chars caracteres) com 'density_chars'
+        """
+        ruleset, matcher = self.rulesets.snapshot()
+        scale = per_chars / max(len(text), per_chars)
+        scores = {category: int(count * scale) for category, count in matcher.count(text).items()}
+        
+        result = self._result(scores, ruleset)
+        result['density_chars'] = per_chars
+        return result
+    
+    def evaluate_heatmap(
+        self,
+        text: str,
+        window: Optional[int] = None,
+        sections: Sequence[Section] = (),
+        page_offsets: Sequence[Tuple[int, int]] = ()
+    ) -> Dict[str, Any]:
+        """
+        Avalia e localiza as evidências de cada categoria no texto
+        
+        As posições saem da mesma passagem da contagem; as densidades por
+        trecho são calculadas sobre elas, sem nova busca no texto.
+        
+        Args:
+            text: Texto do documento (ex.: ExtractionResult.text)
+            window: Caracteres por janela (padrão: QIVO_HEATMAP_WINDOW ou 5000)
+            sections: Índice de seções (ExtractionResult.sections)
+            page_offsets: Início de cada página (ExtractionResult.page_offsets)
+        
+        Returns:
+            Resultado de evaluate() com 'offsets' (posições por categoria) e
+            'heatmap' (trechos por janela, página e seção com contagens e
+            densidade por mil caracteres)
+        """
+        if window is None:
+            window = int(os.getenv('QIVO_HEATMAP_WINDOW', '5000'))
         
-        # Calcular scores por categoria
-        scores = {
-            'jorc': self._count_keywords(text_lower, self.JORC_KEYWORDS),
-            'ni_43_101': self._count_keywords(text_lower, self.NI_43_101_KEYWORDS),
-            'prms': self._count_keywords(text_lower, self.PRMS_KEYWORDS),
-            'qa_qc': self._count_keywords(text_lower, self.QA_QC_KEYWORDS),
-            'compliance': self._count_keywords(text_lower, self.COMPLIANCE_KEYWORDS)
+        ruleset, matcher = self.rulesets.snapshot()
+        positions = matcher.positions(matcher.find(text))
+        scores = {category: len(offsets) for category, offsets in positions.items()}
+        
+        heatmap = Heatmap(positions, len(text), page_offsets)
+        result = self._result(scores, ruleset)
+        result['offsets'] = positions
+        result['heatmap'] = {
+            'window': window,
+            'windows': [item.to_dict() for item in heatmap.windows(window)],
+            'pages': [item.to_dict() for item in heatmap.pages()],
+            'sections': [item.to_dict() for item in heatmap.sections(sections)]
         }
+        return result
+    
+    def session(self) -> 'ScoringSession':
+        """
+        Avaliação incremental de um texto recebido em partes
         
+        Returns:
+            ScoringSession (feed/finalize) com as regras em vigor agora
+        """
+        return ScoringSession(self)
+    
+    def _result(self, scores: Dict[str, int], ruleset: Ruleset) -> Dict[str, Any]:
+        """Monta o resultado de evaluate() a partir das ocorrências por categoria"""
         # Calcular score ponderado (0-100)
         weighted_score = sum(
             min(scores[key] * 10, 100) * weight
-            for key, weight in self.scoring_weights.items()
+            for key, weight in ruleset.weights.items()
         )
         
         compliance_score = min(int(weighted_score), 100)
         
         # Determinar nível de risco
-        risk_level = self._determine_risk(compliance_score)
+        risk_level = self._risk_for(compliance_score, ruleset)
         
         # Gerar breakdown detalhado
-        breakdown = {
-            'jorc_mentions': scores['jorc'],
-            'ni_43_101_mentions': scores['ni_43_101'],
-            'prms_mentions': scores['prms'],
-            'qa_qc_mentions': scores['qa_qc'],
-            'compliance_terms': scores['compliance']
-        }
+        breakdown = self._breakdown(scores)
         
         # Identificar pontos fortes e fracos
-        strengths = [k for k, v in scores.items() if v >= 3]
-        weaknesses = [k for k, v in scores.items() if v < 2]
+        strengths = [k for k, v in scores.items() if v >= ruleset.strength_min]
+        weaknesses = [k for k, v in scores.items() if v < ruleset.weakness_below]
         
         return {
             'compliance_score': compliance_score,
@@ -104,44 +347,176 @@ class ComplianceScorer:
             'breakdown': breakdown,
             'strengths': strengths,
             'weaknesses': weaknesses,
-            'recommendations': self._generate_recommendations(weaknesses)
+            'recommendations': self._recommendations(weaknesses, ruleset),
+            'ruleset_version': ruleset.version
         }
     
+    def evaluate_many(self, texts: Iterable[str]) -> ScoreBatch:
+        """
+        Avalia vários textos de uma vez (reavaliação de acervos)
+        
+        Conta as palavras-chave de cada texto em uma matriz textos ×
+        categorias e aplica pesos, limites e faixas de risco com operações
+        de array. Mesmos valores que evaluate() texto a texto.
+        
+        Args:
+            texts: Textos das análises
+        
+        Returns:
+            ScoreBatch com os resultados em colunas
+        """
+        _require_numpy()
+        ruleset, matcher = self.rulesets.snapshot()
+        categories = tuple(ruleset.keywords)
+        
+        rows = [matcher.count(text) for text in texts]
+        counts = np.array(
+            [[row[category] for category in categories] for row in rows],
+            dtype=np.int64
+        ).reshape(len(rows), len(categories))
+        
+        return self.score_counts(counts, categories, ruleset)
+    
+    def score_counts(
+        self,
+        counts,
+        categories: Optional[Tuple[str, ...]] = None,
+        ruleset: Optional[Ruleset] = None
+    ) -> ScoreBatch:
+        """
+        Aplica pesos e faixas de risco a uma matriz de ocorrências já contada
+        
+        Permite reavaliar um acervo com novas regras sem recontar:
+        scorer.score_counts(batch.counts, batch.categories).
+        
+        Args:
+            counts: Matriz textos × categorias
+            categories: Categorias das colunas (padrão: categorias do ruleset)
+            ruleset: Regras a aplicar (padrão: regras em vigor)
+        
+        Returns:
+            ScoreBatch com os resultados em colunas
+        """
+        _require_numpy()
+        ruleset = ruleset or self.ruleset
+        categories = tuple(categories or ruleset.keywords)
+        counts = np.asarray(counts, dtype=np.int64).reshape(-1, len(categories))
+        columns = {category: index for index, category in enumerate(categories)}
+        
+        # Soma na mesma ordem de evaluate() para obter os mesmos floats
+        weighted = np.zeros(len(counts))
+        clipped = np.minimum(counts * 10, 100)
+        for category, weight in ruleset.weights.items():
+            weighted = weighted + clipped[:, columns[category]] * weight
+        
+        compliance_score = np.minimum(weighted.astype(np.int64), 100)
+        thresholds = self._risk_thresholds(ruleset)
+        risk_level = np.select(
+            [compliance_score >= threshold for threshold, _ in thresholds],
+            [level.value for _, level in thresholds],
+            default=RiskLevel.CRITICAL.value
+        )
+        
+        return ScoreBatch(
+            categories=categories,
+            counts=counts,
+            compliance_score=compliance_score,
+            risk_level=risk_level,
+            strengths=counts >= ruleset.strength_min,
+            weaknesses=counts < ruleset.weakness_below,
+            ruleset=ruleset
+        )
+    
+    @classmethod
+    def _breakdown(cls, scores: Dict[str, int]) -> Dict[str, int]:
+        """Breakdown detalhado a partir das ocorrências por categoria"""
+        return {
+            cls.BREAKDOWN_KEYS.get(category, f'{category}_mentions'): count
+            for category, count in scores.items()
+        }
+    
+    def _category_keywords(self) -> Dict[str, List[str]]:
+        """Palavras-chave por categoria de score"""
+        return {category: list(words) for category, words in self.ruleset.keywords.items()}
+    
     def _count_keywords(self, text: str, keywords: List[str]) -> int:
         """Conta ocorrências de palavras-chave"""
-        count = 0
-        for keyword in keywords:
-            count += text.count(keyword.lower())
-        return count
+        return keywords_matcher({'keywords': keywords}, self.boundary).count(text)['keywords']
     
     def _determine_risk(self, score: int) -> RiskLevel:
         """Determina nível de risco baseado no score"""
-        if score >= 80:
-            return RiskLevel.LOW
-        elif score >= 60:
-            return RiskLevel.MODERATE
-        elif score >= 40:
-            return RiskLevel.HIGH
-        else:
-            return RiskLevel.CRITICAL
+        return self._risk_for(score, self.ruleset)
+    
+    @staticmethod
+    def _risk_thresholds(ruleset: Ruleset) -> List[Tuple[int, RiskLevel]]:
+        """Pares (score mínimo, nível), do menor risco para o maior"""
+        return sorted(
+            ((score, RiskLevel[level.upper()]) for level, score in ruleset.risk_thresholds.items()),
+            key=lambda pair: pair[0],
+            reverse=True
+        )
+    
+    @classmethod
+    def _risk_for(cls, score: int, ruleset: Ruleset) -> RiskLevel:
+        for threshold, level in cls._risk_thresholds(ruleset):
+            if score >= threshold:
+                return level
+        return RiskLevel.CRITICAL
     
     def _generate_recommendations(self, weaknesses: List[str]) -> List[str]:
         """Gera recomendações baseadas em pontos fracos"""
+        return self._recommendations(weaknesses, self.ruleset)
+    
+    @staticmethod
+    def _recommendations(weaknesses: List[str], ruleset: Ruleset) -> List[str]:
         recommendations = []
         
-        recommendation_map = {
-            'jorc': "Aumentar referências ao código JORC e classificação de recursos/reservas",
-            'ni_43_101': "Incluir mais informações sobre NI 43-101 e pessoa qualificada",
-            'prms': "Adicionar detalhes sobre classificação de recursos petrolíferos (PRMS)",
-            'qa_qc': "Fortalecer descrição de procedimentos de QA/QC e amostragem",
-            'compliance': "Melhorar documentação de conformidade regulatória"
-        }
-        
         for weakness in weaknesses:
-            if weakness in recommendation_map:
-                recommendations.append(recommendation_map[weakness])
+            if weakness in ruleset.recommendations:
+                recommendations.append(ruleset.recommendations[weakness])
         
         if not recommendations:
-            recommendations.append("Documento apresenta boa conformidade geral")
+            recommendations.append(ruleset.default_recommendation)
         
         return recommendations
+
+
+class ScoringSession:
+    """
+    Avaliação de texto que chega em partes (saída do GPT em streaming,
+    leitura de arquivo em blocos)
+    
+    As regras são fixadas na criação da sessão. O matcher mantém entre as
+    partes apenas o trecho final ainda indefinido, de modo que termos
+    divididos entre partes ('certified reference' | 'material') contam
+    normalmente e finalize() devolve exatamente o mesmo que evaluate() do
+    texto completo.
+    """
+    
+    def __init__(self, scorer: ComplianceScorer):
+        self._scorer = scorer
+        self._ruleset, matcher = scorer.rulesets.snapshot()
+        self._stream = matcher.stream()
+        self._final: Optional[Dict[str, Any]] = None
+    
+    def feed(self, chunk: str):
+        """
+        Adiciona a próxima parte do texto
+        
+        Raises:
+            ValueError: Sessão já finalizada
+        """
+        if self._final is not None:
+            raise ValueError("Sessão de scoring já finalizada")
+        self._stream.feed(chunk)
+    
+    def finalize(self) -> Dict[str, Any]:
+        """
+        Encerra o texto e calcula o resultado (chamadas seguintes o repetem)
+        
+        Returns:
+            Dict no formato de ComplianceScorer.evaluate
+        """
+        if self._final is None:
+            self._final = self._scorer._result(self._stream.finalize(), self._ruleset)
+        return self._final
@@ -0,0 +1,192 @@
+"""
+QIVO Intelligence Layer - Sections Module
+Índice de seções (título, nível, posições) construído durante a extração
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+from ..templates import REPORT_TEMPLATES
+from .normalizer import TextNormalizer
+
+# Linha pontilhada após o título: entrada de sumário, não cabeçalho
+_DOT_LEADER = re.compile(r'\s*\.{3,}')
+
+
+@dataclass(frozen=True, slots=True)
+class Section:
+    """
+    Seção localizada no texto extraído
+    
+    Attributes:
+        title: Título como consta no vocabulário
+        number: Numeração do cabeçalho ('14', '14.2'; None se não numerado)
+        level: Profundidade da numeração (1 para 'Item 14' ou '14')
+        start: Posição do cabeçalho no texto
+        end: Início do próximo cabeçalho de nível igual ou superior (ou fim do texto)
+        page: Página em que o cabeçalho aparece
+    """
+    
+    title: str
+    number: Optional[str]
+    level: int
+    start: int
+    end: int
+    page: int
+    
+    def to_dict(self) -> Dict[str, object]:
+        """Representação serializável"""
+        return {
+            'title': self.title,
+            'number': self.number,
+            'level': self.level,
+            'start': self.start,
+            'end': self.end,
+            'page': self.page
+        }
+
+
+def template_vocabulary() -> List[str]:
+    """Títulos de seção de todos os templates do Manus (sem repetição)"""
+    titles = []
+    for template in REPORT_TEMPLATES.values():
+        for title in template['sections']:
+            if title not in titles:
+                titles.append(title)
+    return titles
+
+
+class SectionVocabulary:
+    """
+    Títulos de seção reconhecidos, compilados em uma única regex
+    
+    Um cabeçalho é um título do vocabulário precedido de numeração
+    ('Item 14 Mineral Resource Estimates', '14.2 Drilling'). Com
+    keep_paragraphs, títulos não numerados no início de um parágrafo também
+    contam. Compilado uma vez e compartilhado entre extrações.
+    """
+    
+    def __init__(
+        self,
+        titles: Optional[Iterable[str]] = None,
+        keep_paragraphs: bool = False
+    ):
+        """
+        Compila o vocabulário
+        
+        Args:
+            titles: Títulos reconhecidos (usa as seções dos templates do Manus)
+            keep_paragraphs: O texto preserva limites de parágrafo
+        """
+        normalizer = TextNormalizer(keep_paragraphs=False)
+        self.titles: Dict[str, str] = {}
+        for title in titles or template_vocabulary():
+            # Títulos passam pela mesma limpeza do texto (ex.: '/' é removido)
+            self.titles.setdefault(normalizer.normalize(title).lower(), title)
+        
+        alternatives = '|'.join(
+            r'\s+'.join(re.escape(word) for word in title.split())
+            for title in sorted(self.titles, key=len, reverse=True)
+        )
+        numbered = (
+            r'(?<![\w.])(?:(?:item|section)\s+)?'
+            r'(?P<number>\d{1,2}(?:\.\d{1,2}){0,3})\.?\s+'
+            rf'(?P<title>{alternatives})(?!\w)'
+        )
+        if keep_paragraphs:
+            pattern = rf'{numbered}|(?:^|(?<=\n\n))(?P<plain>{alternatives})(?!\w)'
+        else:
+            pattern = numbered
+        self.pattern = re.compile(pattern, re.IGNORECASE)
+
+
+class SectionIndexer:
+    """
+    Detecta cabeçalhos página a página, sem novo scan do texto completo
+    
+    Um indexador por extração. Entradas de sumário (linha pontilhada ou
+    página de sumário), repetições (cabeçalhos de página) e numeração de
+    nível 1 que retrocede (referências cruzadas) são ignoradas.
+    """
+    
+    def __init__(self, vocabulary: SectionVocabulary):
+        """
+        Inicializa o indexador
+        
+        Args:
+            vocabulary: Vocabulário compilado
+        """
+        self._vocabulary = vocabulary
+        self._sections: List[Section] = []
+        self._seen = set()
+        self._last_top_level = 0
+    
+    def feed(self, page_number: int, page_text: str, offset: int, is_toc: bool = False):
+        """
+        Indexa uma página já limpa
+        
+        Args:
+            page_number: Número da página
+            page_text: Texto limpo da página (ou o trecho mantido pelo orçamento)
+            offset: Posição do início da página no texto final
+            is_toc: Página de sumário (nenhum cabeçalho é registrado)
+        """
+        if is_toc:
+            return
+        
+        for match in self._vocabulary.pattern.finditer(page_text):
+            if _DOT_LEADER.match(page_text, match.end()):
+                continue
+            
+            number = match.group('number')
+            title_text = match.group('title') or match.group('plain')
+            title = self._vocabulary.titles.get(' '.join(title_text.split()).lower(), title_text)
+            
+            level = number.count('.') + 1 if number else 1
+            if number and level == 1:
+                top = int(number)
+                if top <= self._last_top_level:
+                    continue
+                self._last_top_level = top
+            
+            key = (number, title)
+            if key in self._seen:
+                continue
+            self._seen.add(key)
+            
+            self._sections.append(Section(
+                title=title,
+                number=number,
+                level=level,
+                start=offset + match.start(),
+                end=-1,
+                page=page_number
+            ))
+    
+    def finalize(self, text_length: int) -> List[Section]:
+        """
+        Fecha o índice
+        
+        Args:
+            text_length: Tamanho do texto final
+        
+        Returns:
+            Seções em ordem, com end preenchido
+        """
+        sections = []
+        for index, section in enumerate(self._sections):
+            end = text_length
+            for following in self._sections[index + 1:]:
+                if following.level <= section.level:
+                    end = following.start
+                    break
+            sections.append(Section(
+                title=section.title,
+                number=section.number,
+                level=section.level,
+                start=section.start,
+                end=min(end, text_length),
+                page=section.page
+            ))
+        return sections
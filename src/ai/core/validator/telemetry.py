@@ -0,0 +1,100 @@
+"""
+QIVO Intelligence Layer - Extraction Telemetry Module
+Tempos por etapa de extração (abertura, parsing por página, limpeza)
+"""
+
+import sys
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Recebe a metadata (com 'telemetry') de cada extração concluída
+MetricsHook = Callable[[Dict[str, Any]], None]
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """Pico de memória residente do processo (None se indisponível)"""
+    if resource is None:
+        return None
+    
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss é em KiB no Linux e em bytes no macOS
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class ExtractionTelemetry:
+    """
+    Acumula tempos de uma extração
+    
+    Etapas: 'open' (validação, hash/cache e abertura do arquivo), 'parse'
+    (parsing no executor) e 'clean' (normalização). O parsing também é
+    registrado por página para identificar páginas patológicas; páginas
+    reaproveitadas do cache por página são contadas à parte.
+    """
+    
+    __slots__ = (
+        'stages', 'parsed_pages', 'reused_pages', 'slowest_page', 'slowest_page_s',
+        '_started', '_peak_rss_start'
+    )
+    
+    def __init__(self):
+        self.stages: Dict[str, float] = {'open': 0.0, 'parse': 0.0, 'clean': 0.0}
+        self.parsed_pages = 0
+        self.reused_pages = 0
+        self.slowest_page: Optional[int] = None
+        self.slowest_page_s = 0.0
+        self._started = time.perf_counter()
+        self._peak_rss_start = peak_rss_bytes()
+    
+    @contextmanager
+    def stage(self, name: str):
+        """Soma o tempo do bloco à etapa name"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - started
+    
+    def page_parsed(self, page_number: int, seconds: float):
+        """Registra o tempo de parsing de uma página"""
+        self.parsed_pages += 1
+        if self.slowest_page is None or seconds > self.slowest_page_s:
+            self.slowest_page = page_number
+            self.slowest_page_s = seconds
+    
+    def summary(self, page_count: int, byte_count: Optional[int]) -> Dict[str, Any]:
+        """
+        Consolida os tempos
+        
+        Args:
+            page_count: Páginas lidas
+            byte_count: Bytes do arquivo processados (None se desconhecido,
+                por exemplo em leitura interrompida pelo orçamento)
+        
+        Returns:
+            Dict serializável com tempos em segundos e taxas
+        """
+        total = time.perf_counter() - self._started
+        peak_rss = peak_rss_bytes()
+        
+        return {
+            'total_s': round(total, 6),
+            'stages_s': {name: round(seconds, 6) for name, seconds in self.stages.items()},
+            'parsed_pages': self.parsed_pages,
+            'reused_pages': self.reused_pages,
+            'parse_per_page_s': round(self.stages['parse'] / self.parsed_pages, 6) if self.parsed_pages else None,
+            'slowest_page': self.slowest_page,
+            'slowest_page_s': round(self.slowest_page_s, 6),
+            'pages_per_s': round(page_count / total, 2) if total > 0 else None,
+            'bytes_per_s': round(byte_count / total, 2) if byte_count is not None and total > 0 else None,
+            # Aumento do pico do processo durante a extração (0 se não subiu);
+            # parsing no pool de processos não entra nesta medida
+            'peak_rss_delta_bytes': (
+                peak_rss - self._peak_rss_start if peak_rss is not None else None
+            )
+        }
@@ -4,9 +4,16 @@ Análise de conformidade regulatória com OpenAI GPT
 """
 
 import os
-from typing import Dict, Any, Optional
+import time
+import asyncio
+import contextlib
+from typing import AsyncIterator, Dict, Any, Iterable, Optional
 from openai import AsyncOpenAI
+from ..llm import cached_completion, cached_stream, get_openai_client, get_token_budget, llm_priority
+from .chunking import split_chunks
+from .pipeline import PipelineStats
 from .preprocessor import DocumentPreprocessor
+from .result import ExtractionResult
 from .scoring import ComplianceScorer
 
 
@@ -16,19 +23,55 @@ class ValidatorAI:
     Suporta: JORC, NI 43-101, PRMS
     """
     
-    def __init__(self, api_key: Optional[str] = None):
+    SYSTEM_PROMPT = """Você é um especialista em conformidade regulatória de mineração.
+Analise o documento técnico fornecido e avalie sua conformidade com os seguintes códigos:
+
+- JORC Code (Joint Ore Reserves Committee)
+- NI 43-101 (Canadian National Instrument)
+- PRMS (Petroleum Resources Management System)
+
+Identifique:
+1. Padrões regulatórios mencionados
+2. Classificações de recursos/reservas
+3. Procedimentos de QA/QC descritos
+4. Qualificação de pessoas competentes
+5. Gaps de conformidade
+
+Seja objetivo e técnico."""
+    
+    ANALYSIS_PROMPT = """Analise este documento técnico de mineração para conformidade regulatória:
+
+{text}
+
+Forneça uma análise detalhada focando em conformidade com JORC, NI 43-101 e PRMS."""
+    
+    # Map: achados de um trecho; reduce: análise final sobre os achados
+    MAP_PROMPT = """Este é o trecho {index} de {total} de um documento técnico de mineração:
+
+{text}
+
+Liste de forma concisa os achados deste trecho relevantes para conformidade com JORC, NI 43-101 e PRMS (padrões citados, classificações, QA/QC, pessoas competentes, gaps). Não conclua sobre o documento inteiro."""
+    
+    REDUCE_PROMPT = """Achados parciais de {total} trechos consecutivos de um documento técnico de mineração:
+
+{findings}
+
+Consolide os achados (sem repetir os que aparecem em trechos sobrepostos) e forneça uma análise detalhada do documento inteiro focando em conformidade com JORC, NI 43-101 e PRMS."""
+    
+    def __init__(self, api_key: Optional[str] = None, client: Optional[AsyncOpenAI] = None):
         """
         Inicializa Validator AI
         
         Args:
             api_key: OpenAI API key (usa variável de ambiente se não fornecida)
+            client: Cliente OpenAI (padrão: cliente compartilhado do processo)
         """
         self.api_key = api_key or os.getenv('OPENAI_API_KEY')
         
         if not self.api_key:
             raise ValueError("OPENAI_API_KEY não configurada")
         
-        self.client = AsyncOpenAI(api_key=self.api_key)
+        self.client = client or get_openai_client(self.api_key)
         self.preprocessor = DocumentPreprocessor()
         self.scorer = ComplianceScorer()
         
@@ -36,6 +79,29 @@ class ValidatorAI:
         self.model = "gpt-4o"  # Ou gpt-4-turbo se disponível
         self.max_tokens = 2000
         self.temperature = 0.3  # Baixa para respostas mais consistentes
+        # Tokens do documento por análise (teto de custo; 0 = toda a janela
+        # do modelo menos prompt e resposta)
+        self.max_input_tokens = int(os.getenv('QIVO_MAX_INPUT_TOKENS', '3000'))
+        self.skip_front_matter = False  # Descartar capa/sumário antes do limite
+        
+        # Map-reduce: documento inteiro (até map_reduce_max_tokens) dividido
+        # em trechos analisados em paralelo e consolidados em uma chamada final
+        self.map_reduce = os.getenv('QIVO_MAP_REDUCE', '0') == '1'
+        self.map_reduce_max_tokens = int(os.getenv('QIVO_MAP_REDUCE_MAX_TOKENS', '100000'))
+        self.chunk_tokens = int(os.getenv('QIVO_CHUNK_TOKENS', '3000'))
+        self.chunk_overlap_tokens = int(os.getenv('QIVO_CHUNK_OVERLAP_TOKENS', '200'))
+        self.chunk_concurrency = int(os.getenv('QIVO_CHUNK_CONCURRENCY', '8'))
+        self.chunk_max_tokens = 800  # Resposta de cada trecho (entrada do reduce)
+        
+        # Pré-triagem local (QIVO_PRESCREEN=1): score de densidade do texto
+        # extraído <= prescreen_low ou >= prescreen_high responde sem chamar
+        # o GPT. Desligada por padrão até as faixas serem calibradas com
+        # relatórios reais
+        self.prescreen = os.getenv('QIVO_PRESCREEN', '0') == '1'
+        self.prescreen_density_chars = int(os.getenv('QIVO_PRESCREEN_DENSITY_CHARS', '10000'))
+        self.prescreen_low = int(os.getenv('QIVO_PRESCREEN_LOW', '10'))
+        self.prescreen_high = int(os.getenv('QIVO_PRESCREEN_HIGH', '90'))
+        self.tier_counts = {'local': 0, 'llm': 0}
     
     async def process(self, file_path: str) -> Dict[str, Any]:
         """
@@ -48,43 +114,235 @@ class ValidatorAI:
             Dict com análise completa
         """
         try:
-            # 1. Preprocessar documento
-            text = await self.preprocessor.preprocess_text(file_path)
-            metadata = self.preprocessor.get_metadata()
-            
-            if not text or len(text) < 100:
-                return {
-                    'status': 'error',
-                    'message': 'Documento muito curto ou vazio',
-                    'metadata': metadata
-                }
-            
-            # 2. Analisar com GPT
-            analysis = await self._analyze_with_gpt(text)
-            
-            # 3. Calcular compliance score
-            scoring_result = self.scorer.evaluate(analysis)
-            
-            # 4. Compilar resultado
-            result = {
-                'status': 'success',
-                'metadata': metadata,
-                'analysis': {
-                    'summary': analysis[:500] + '...' if len(analysis) > 500 else analysis,
-                    'full_text': analysis
-                },
-                'compliance': scoring_result,
+            extraction = await self._extract(file_path, self.preprocessor)
+            return await self._analyze_extraction(extraction)
+        
+        except Exception as e:
+            return {
+                'status': 'error',
+                'message': str(e),
                 'timestamp': self._get_timestamp()
             }
+    
+    async def process_many(
+        self,
+        file_paths: Iterable[str],
+        extraction_workers: Optional[int] = None,
+        llm_concurrency: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        stats: Optional[PipelineStats] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Processa vários documentos em pipeline: extração e análise sobrepostas
+        
+        Extratores (no pool de processos do preprocessor) alimentam uma fila
+        limitada consumida por llm_concurrency tarefas de análise. Com a fila
+        cheia os extratores esperam (backpressure); os resultados também
+        passam por uma fila limitada, então um consumidor lento segura as
+        análises em vez de acumular resultados, e o consumo de memória não
+        depende do tamanho do lote. As chamadas ao GPT têm prioridade
+        'batch' no limitador de taxa. Os resultados saem na ordem em que
+        terminam, cada um com 'file_path'.
+        
+        Args:
+            file_paths: Caminhos dos arquivos (lido sob demanda)
+            extraction_workers: Extrações simultâneas (padrão:
+                QIVO_BATCH_EXTRACTION_WORKERS ou número de CPUs)
+            llm_concurrency: Análises simultâneas (padrão: QIVO_BATCH_LLM_CONCURRENCY ou 8)
+            queue_size: Capacidade das filas entre etapas (padrão: QIVO_BATCH_QUEUE_SIZE ou 16)
+            stats: Contadores deste lote (preenchidos durante a execução)
             
-            return result
+        Yields:
+            Resultado de process() de cada documento, com 'file_path'
+        """
+        if extraction_workers is None:
+            extraction_workers = int(os.getenv('QIVO_BATCH_EXTRACTION_WORKERS', str(os.cpu_count() or 1)))
+        if llm_concurrency is None:
+            llm_concurrency = int(os.getenv('QIVO_BATCH_LLM_CONCURRENCY', '8'))
+        if queue_size is None:
+            queue_size = int(os.getenv('QIVO_BATCH_QUEUE_SIZE', '16'))
         
-        except Exception as e:
+        # Sem pool de processos configurado, o lote usa um próprio (com a
+        # mesma configuração): o parsing em threads disputaria o GIL com o
+        # event loop
+        preprocessor = self.preprocessor
+        owned = None
+        if preprocessor.max_workers <= 0 and extraction_workers > 1:
+            owned = preprocessor = preprocessor.with_workers(extraction_workers)
+        
+        stats = stats if stats is not None else PipelineStats()
+        stats.start()
+        
+        pending: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        extracted: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        results: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        
+        async def feed():
+            for file_path in file_paths:
+                await pending.put(file_path)
+            for _ in range(extraction_workers):
+                await pending.put(None)
+        
+        async def extract_worker():
+            while (file_path := await pending.get()) is not None:
+                started = time.perf_counter()
+                try:
+                    item = (file_path, await self._extract(file_path, preprocessor), None)
+                except Exception as e:
+                    item = (file_path, None, e)
+                stats.count('extraction', started, item[2] is None)
+                # Espera aqui quando a etapa de análise está atrasada
+                await extracted.put(item)
+        
+        async def analyze_worker():
+            while (item := await extracted.get()) is not None:
+                file_path, extraction, error = item
+                started = time.perf_counter()
+                try:
+                    if error is not None:
+                        raise error
+                    result = await self._analyze_extraction(extraction)
+                except Exception as e:
+                    result = {
+                        'status': 'error',
+                        'message': str(e),
+                        'timestamp': self._get_timestamp()
+                    }
+                if error is None:
+                    stats.count('analysis', started, result['status'] == 'success')
+                result['file_path'] = file_path
+                await results.put(result)
+        
+        async def run():
+            # Lote cede a vez às chamadas interativas no limitador de taxa
+            with llm_priority('batch'):
+                analyzers = [asyncio.create_task(analyze_worker()) for _ in range(llm_concurrency)]
+            try:
+                # Falha na leitura dos caminhos cancela os extratores
+                try:
+                    async with asyncio.TaskGroup() as group:
+                        group.create_task(feed())
+                        for _ in range(extraction_workers):
+                            group.create_task(extract_worker())
+                except BaseExceptionGroup as errors:
+                    raise errors.exceptions[0]
+                for _ in range(llm_concurrency):
+                    await extracted.put(None)
+                await asyncio.gather(*analyzers)
+            finally:
+                for task in analyzers:
+                    task.cancel()
+                await asyncio.gather(*analyzers, return_exceptions=True)
+                stats.finish()
+                # Cancelado pelo consumidor: ninguém mais lê a fila (cheia).
+                # Flag própria: no Python 3.11 o TaskGroup pode deixar
+                # cancelling() > 0 na tarefa após a falha de um extrator
+                if not consumer['closed']:
+                    await results.put(None)
+        
+        consumer = {'closed': False}
+        runner = asyncio.create_task(run())
+        try:
+            while (result := await results.get()) is not None:
+                yield result
+            await runner
+            if owned is not None:
+                # Leituras truncadas ainda gravando no cache usam o pool do lote
+                await owned.wait_cache_fills()
+        finally:
+            # Consumidor que parou antes do fim (break, aclose()): encerra as
+            # etapas e descarta as extrações ainda na fila do pool sem
+            # bloquear o event loop
+            consumer['closed'] = True
+            runner.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await runner
+            if owned is not None:
+                owned.shutdown(wait=False)
+    
+    async def _extract(self, file_path: str, preprocessor: DocumentPreprocessor) -> ExtractionResult:
+        """
+        Extrai o documento até o limite de entrada do GPT
+        
+        A leitura para quando o limite é atingido (+1 caractere para sinalizar
+        o truncamento). O resultado é próprio desta chamada (seguro com
+        requisições concorrentes).
+        """
+        return await preprocessor.extract_with_budget(
+            file_path,
+            max_chars=self._input_limit() + 1,
+            skip_front_matter=self.skip_front_matter
+        )
+    
+    async def _analyze_extraction(self, extraction: ExtractionResult) -> Dict[str, Any]:
+        """
+        Pré-triagem, análise e scoring de um documento extraído
+        
+        Args:
+            extraction: Resultado de _extract
+            
+        Returns:
+            Dict com análise completa (formato de process)
+        """
+        text = extraction.text
+        metadata = extraction.metadata_dict()
+        timings = {'extraction_s': round(extraction.timings['total'], 6)}
+        
+        if not text or len(text) < 100:
             return {
                 'status': 'error',
-                'message': str(e),
+                'message': 'Documento muito curto ou vazio',
+                'metadata': metadata
+            }
+        
+        # 2. Pré-triagem local: documentos claramente (não) conformes
+        #    dispensam o GPT
+        started = time.perf_counter()
+        prescreen = self._prescreen(text)
+        timings['prescreen_s'] = round(time.perf_counter() - started, 6)
+        
+        if self._is_decisive(prescreen):
+            self.tier_counts['local'] += 1
+            return {
+                'status': 'success',
+                'tier': 'local',
+                'metadata': metadata,
+                'analysis': self._local_analysis(prescreen),
+                'compliance': prescreen,
+                'timings': timings,
                 'timestamp': self._get_timestamp()
             }
+        
+        # 3. Analisar com GPT
+        self.tier_counts['llm'] += 1
+        started = time.perf_counter()
+        analysis = await self._analyze_with_gpt(text)
+        timings['analysis_s'] = round(time.perf_counter() - started, 6)
+        
+        # 4. Calcular compliance score
+        started = time.perf_counter()
+        scoring_result = self.scorer.evaluate(analysis)
+        timings['scoring_s'] = round(time.perf_counter() - started, 6)
+        
+        # 5. Compilar resultado
+        result = {
+            'status': 'success',
+            'tier': 'llm',
+            'metadata': metadata,
+            'analysis': {
+                'summary': analysis[:500] + '...' if len(analysis) > 500 else analysis,
+                'full_text': analysis
+            },
+            'compliance': scoring_result,
+            'prescreen': {
+                'compliance_score': prescreen['compliance_score'],
+                'risk_level': prescreen['risk_level']
+            },
+            'timings': timings,
+            'timestamp': self._get_timestamp()
+        }
+        
+        return result
     
     async def _analyze_with_gpt(self, text: str) -> str:
         """
@@ -96,50 +354,147 @@ class ValidatorAI:
         Returns:
             Análise textual do GPT
         """
-        # Limitar texto para não exceder token limit
-        max_chars = 12000  # ~3000 tokens
-        if len(text) > max_chars:
-            text = text[:max_chars] + "\n\n[... documento truncado ...]"
+        prompt = await self._analysis_prompt(text)
+        return await self._complete(prompt, self.max_tokens)
+    
+    async def _analysis_prompt(self, text: str) -> str:
+        """
+        Prompt da chamada final de análise
         
-        system_prompt = """Você é um especialista em conformidade regulatória de mineração.
-Analise o documento técnico fornecido e avalie sua conformidade com os seguintes códigos:
-
-- JORC Code (Joint Ore Reserves Committee)
-- NI 43-101 (Canadian National Instrument)
-- PRMS (Petroleum Resources Management System)
-
-Identifique:
-1. Padrões regulatórios mencionados
-2. Classificações de recursos/reservas
-3. Procedimentos de QA/QC descritos
-4. Qualificação de pessoas competentes
-5. Gaps de conformidade
-
-Seja objetivo e técnico."""
-
-        user_prompt = f"""Analise este documento técnico de mineração para conformidade regulatória:
-
-{text}
-
-Forneça uma análise detalhada focando em conformidade com JORC, NI 43-101 e PRMS."""
+        No modo map-reduce, documentos maiores que um trecho passam antes
+        pela etapa map e o prompt é o de consolidação dos achados.
+        
+        Args:
+            text: Texto preprocessado
+            
+        Returns:
+            Prompt do usuário para a análise
+        """
+        budget = get_token_budget(self.model)
+        
+        if self.map_reduce:
+            text = budget.truncate(text, self.map_reduce_max_tokens)
+            if budget.count(text) > self.chunk_tokens:
+                return await self._reduce_prompt(text)
+        
+        # Documento cortado no que sobra da janela (ou do teto) após o
+        # prompt de sistema, o template e a resposta
+        template = self._request(self.ANALYSIS_PROMPT.format(text=''), self.max_tokens)
+        text = budget.fit(text, template['messages'], self.max_tokens, limit=self.max_input_tokens)
+        return self.ANALYSIS_PROMPT.format(text=text)
+    
+    async def _reduce_prompt(self, text: str) -> str:
+        """
+        Etapa map: analisa um documento longo em trechos concorrentes
+        
+        Os trechos são analisados ao mesmo tempo (até chunk_concurrency
+        chamadas abertas), então o tempo total fica próximo de uma chamada
+        por trecho mais a consolidação. Se um trecho falha, as chamadas dos
+        demais são canceladas e o erro do trecho é propagado.
+        
+        Args:
+            text: Texto preprocessado
+            
+        Returns:
+            Prompt de consolidação (reduce) com os achados de cada trecho
+        """
+        # Tamanhos em caracteres pela proporção medida neste documento
+        chars_per_token = len(text) / max(get_token_budget(self.model).count(text), 1)
+        chunks = split_chunks(
+            text,
+            int(self.chunk_tokens * chars_per_token),
+            int(self.chunk_overlap_tokens * chars_per_token)
+        )
+        semaphore = asyncio.Semaphore(self.chunk_concurrency)
+        
+        async def analyze_chunk(index: int, chunk: str) -> str:
+            async with semaphore:
+                prompt = self.MAP_PROMPT.format(index=index, total=len(chunks), text=chunk)
+                return await self._complete(prompt, self.chunk_max_tokens)
         
         try:
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                max_tokens=self.max_tokens,
-                temperature=self.temperature
+            async with asyncio.TaskGroup() as group:
+                tasks = [
+                    group.create_task(analyze_chunk(index, chunk))
+                    for index, chunk in enumerate(chunks, start=1)
+                ]
+        except BaseExceptionGroup as errors:
+            # Mesmo erro de uma chamada isolada (ValueError de _complete)
+            raise errors.exceptions[0]
+        
+        combined = "\n\n".join(
+            f"### Trecho {index}/{len(chunks)}\n{task.result()}"
+            for index, task in enumerate(tasks, start=1)
+        )
+        return self.REDUCE_PROMPT.format(total=len(chunks), findings=combined)
+    
+    def _request(self, user_prompt: str, max_tokens: int) -> Dict[str, Any]:
+        """Argumentos de chat.completions.create com o prompt de sistema do validador"""
+        return {
+            'model': self.model,
+            'messages': [
+                {"role": "system", "content": self.SYSTEM_PROMPT},
+                {"role": "user", "content": user_prompt}
+            ],
+            'max_tokens': max_tokens,
+            'temperature': self.temperature
+        }
+    
+    async def _complete(self, user_prompt: str, max_tokens: int) -> str:
+        """Uma chamada ao GPT com o prompt de sistema do validador"""
+        try:
+            analysis = await cached_completion(
+                self.client, 'validator', **self._request(user_prompt, max_tokens)
             )
-            
-            analysis = response.choices[0].message.content
             return analysis or "Análise não gerada"
         
         except Exception as e:
             raise ValueError(f"Erro na análise GPT: {str(e)}")
     
+    def _input_limit(self) -> int:
+        """Caracteres a extrair para preencher o orçamento de tokens do documento"""
+        budget = get_token_budget(self.model)
+        if self.map_reduce:
+            tokens = self.map_reduce_max_tokens
+        else:
+            tokens = self.max_input_tokens or budget.context
+        return budget.char_budget(tokens)
+    
+    def _prescreen(self, text: str) -> Dict[str, Any]:
+        """Score local do documento (densidade, independe do tamanho)"""
+        return self.scorer.evaluate_density(text, self.prescreen_density_chars)
+    
+    def _is_decisive(self, prescreen: Dict[str, Any]) -> bool:
+        """Score local fora da faixa ambígua (dispensa o GPT)"""
+        if not self.prescreen:
+            return False
+        score = prescreen['compliance_score']
+        return score <= self.prescreen_low or score >= self.prescreen_high
+    
+    def _local_analysis(self, prescreen: Dict[str, Any]) -> Dict[str, str]:
+        """Análise resumida de um resultado da pré-triagem local"""
+        summary = (
+            f"Pré-triagem local: score {prescreen['compliance_score']} "
+            f"(risco {prescreen['risk_level']}) fora da faixa ambígua "
+            f"({self.prescreen_low}-{self.prescreen_high}); análise GPT dispensada."
+        )
+        return {'summary': summary, 'full_text': ''}
+    
+    def get_tier_stats(self) -> Dict[str, Any]:
+        """
+        Contadores de respostas por camada
+        
+        Returns:
+            Dict com respostas locais, chamadas ao GPT e chamadas evitadas
+        """
+        total = self.tier_counts['local'] + self.tier_counts['llm']
+        return {
+            'local': self.tier_counts['local'],
+            'llm': self.tier_counts['llm'],
+            'llm_calls_avoided': self.tier_counts['local'],
+            'avoided_rate': round(self.tier_counts['local'] / total, 4) if total else 0.0
+        }
+    
     def _get_timestamp(self) -> str:
         """Retorna timestamp ISO 8601"""
         from datetime import datetime, timezone
@@ -156,11 +511,24 @@ Forneça uma análise detalhada focando em conformidade com JORC, NI 43-101 e PR
             Dict com análise
         """
         try:
+            prescreen = self._prescreen(text)
+            if self._is_decisive(prescreen):
+                self.tier_counts['local'] += 1
+                return {
+                    'status': 'success',
+                    'tier': 'local',
+                    'analysis': self._local_analysis(prescreen),
+                    'compliance': prescreen,
+                    'timestamp': self._get_timestamp()
+                }
+            
+            self.tier_counts['llm'] += 1
             analysis = await self._analyze_with_gpt(text)
             scoring_result = self.scorer.evaluate(analysis)
             
             return {
                 'status': 'success',
+                'tier': 'llm',
                 'analysis': {
                     'summary': analysis[:500] + '...' if len(analysis) > 500 else analysis,
                     'full_text': analysis
@@ -175,3 +543,76 @@ Forneça uma análise detalhada focando em conformidade com JORC, NI 43-101 e PR
                 'message': str(e),
                 'timestamp': self._get_timestamp()
             }
+    
+    async def stream_text(self, text: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Valida texto enviando a análise do GPT à medida que é gerada
+        
+        Eventos, em ordem:
+            prescreen: score local (imediato, antes da chamada ao GPT)
+            token: trecho da análise ({'text': ...}), repetido
+            result: resultado no formato de validate_text; o compliance é
+                calculado incrementalmente sobre os tokens recebidos
+            error: falha ({'status': 'error', 'message': ...}), encerra o fluxo
+        Documentos decididos pela pré-triagem recebem apenas result.
+        
+        Args:
+            text: Texto a analisar
+            
+        Yields:
+            Dicts {'event': nome, 'data': conteúdo}
+        """
+        try:
+            prescreen = self._prescreen(text)
+            if self._is_decisive(prescreen):
+                self.tier_counts['local'] += 1
+                yield {'event': 'result', 'data': {
+                    'status': 'success',
+                    'tier': 'local',
+                    'analysis': self._local_analysis(prescreen),
+                    'compliance': prescreen,
+                    'timestamp': self._get_timestamp()
+                }}
+                return
+            
+            self.tier_counts['llm'] += 1
+            yield {'event': 'prescreen', 'data': {
+                'compliance_score': prescreen['compliance_score'],
+                'risk_level': prescreen['risk_level']
+            }}
+            
+            prompt = await self._analysis_prompt(text)
+            session = self.scorer.session()
+            parts = []
+            try:
+                async for delta in cached_stream(
+                    self.client, 'validator', **self._request(prompt, self.max_tokens)
+                ):
+                    session.feed(delta)
+                    parts.append(delta)
+                    yield {'event': 'token', 'data': {'text': delta}}
+            except Exception as e:
+                raise ValueError(f"Erro na análise GPT: {str(e)}")
+            
+            analysis = ''.join(parts)
+            if not analysis:
+                analysis = "Análise não gerada"
+                session.feed(analysis)
+            
+            yield {'event': 'result', 'data': {
+                'status': 'success',
+                'tier': 'llm',
+                'analysis': {
+                    'summary': analysis[:500] + '...' if len(analysis) > 500 else analysis,
+                    'full_text': analysis
+                },
+                'compliance': session.finalize(),
+                'timestamp': self._get_timestamp()
+            }}
+        
+        except Exception as e:
+            yield {'event': 'error', 'data': {
+                'status': 'error',
+                'message': str(e),
+                'timestamp': self._get_timestamp()
+            }}
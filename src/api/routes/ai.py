@@ -5,13 +5,15 @@ Endpoints para análise de documentos com AI
 """
 
 from fastapi import APIRouter, UploadFile, File, HTTPException, BackgroundTasks
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import Optional
+from typing import Any, AsyncIterator, Dict, Optional
 import os
+import json
 import tempfile
 from pathlib import Path
 
+from src.ai.core.llm import get_rate_limiter
 from src.ai.core.validator.validator import ValidatorAI
 
 router = APIRouter(prefix="/ai", tags=["AI Intelligence - Validator"])
@@ -141,6 +143,44 @@ async def analyze_text(request: TextAnalysisRequest):
         raise HTTPException(status_code=500, detail=f"Erro na análise: {str(e)}")
 
 
+def format_sse(event: str, data: Dict[str, Any]) -> str:
+    """Formata um evento server-sent events (data em JSON de uma linha)"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@router.post("/analyze/text/stream")
+async def analyze_text_stream(request: TextAnalysisRequest):
+    """
+    Analisa texto direto com a resposta enviada por server-sent events
+    
+    **Body:** igual a /ai/analyze/text
+    
+    **Eventos:**
+    - prescreen: score local, enviado antes da chamada ao GPT
+    - token: trecho da análise (`{"text": "..."}`), à medida que o GPT gera
+    - result: resultado final no formato de /ai/analyze/text
+    - error: falha na análise (encerra o fluxo)
+    """
+    if not request.text or len(request.text) < 100:
+        raise HTTPException(
+            status_code=400,
+            detail="Texto muito curto. Mínimo 100 caracteres."
+        )
+    
+    ai = get_validator()
+    
+    async def events() -> AsyncIterator[str]:
+        async for event in ai.stream_text(request.text):
+            yield format_sse(event['event'], event['data'])
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # Sem cache nem buffering de proxy: cada token sai assim que gerado
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.get("/health")
 async def health_check():
     """
@@ -179,6 +219,7 @@ async def health_check():
         
         # Test OpenAI connectivity (lightweight check)
         openai_status = "connected" if api_key and ai.client else "not_configured"
+        limiter = get_rate_limiter()
         
         # Check components
         components_status = {
@@ -189,11 +230,13 @@ async def health_check():
             "openai": {
                 "status": openai_status,
                 "model": "gpt-4o" if openai_status == "connected" else None,
-                "api_key_configured": bool(api_key)
+                "api_key_configured": bool(api_key),
+                "rate_limit": limiter.stats() if limiter else None
             },
             "preprocessor": {
                 "status": "active",
-                "supported_formats": ["PDF", "DOCX", "TXT"]
+                "supported_formats": ["PDF", "DOCX", "TXT"],
+                "cache": ai.preprocessor.get_cache_stats()
             },
             "scorer": {
                 "status": "active",
@@ -248,6 +291,7 @@ async def get_capabilities():
       "endpoints": {
         "/ai/analyze": "POST - Analisa arquivo",
         "/ai/analyze/text": "POST - Analisa texto direto",
+        "/ai/analyze/text/stream": "POST - Analisa texto direto (SSE)",
         "/ai/health": "GET - Status do sistema",
         "/ai/capabilities": "GET - Lista capacidades"
       }
@@ -266,6 +310,7 @@ async def get_capabilities():
         'endpoints': {
             '/ai/analyze': 'POST - Analisa arquivo',
             '/ai/analyze/text': 'POST - Analisa texto direto',
+            '/ai/analyze/text/stream': 'POST - Analisa texto direto (SSE)',
             '/ai/health': 'GET - Status do sistema',
             '/ai/capabilities': 'GET - Lista capacidades'
         },
@@ -0,0 +1,176 @@
+"""
+Relatório NI 43-101 sintético de tamanho real para os testes
+
+Seções do modelo NI 43-101 com texto corrido e as tabelas (intercepts,
+lotes de QA/QC, blocos) que ocupam a maior parte de um relatório real.
+"""
+
+import random
+
+SECTIONS = {
+    "Summary": (
+        "This Technical Report was prepared for Serra Azul Mineração Ltda. to support the disclosure of "
+        "an updated Mineral Resource estimate for the Cerro Alto gold project in Minas Gerais, Brazil. "
+        "The project comprises four exploration licences covering 8,420 hectares. Gold mineralization is "
+        "hosted by sheared banded iron formation within an Archean greenstone belt. The estimate is based "
+        "on 412 diamond drill holes totalling 98,350 metres completed between 2017 and 2024."
+    ),
+    "Introduction and Terms of Reference": (
+        "The author visited the property between 12 and 15 March 2024, inspected drill core at the "
+        "Itabira core shed, reviewed collar locations with a handheld GPS and discussed logging "
+        "procedures with site geologists. Units are metric and currency is United States dollars "
+        "unless otherwise stated. The effective date of this report is 30 June 2024."
+    ),
+    "Reliance on Other Experts": (
+        "Information on land tenure was provided by the company's legal counsel and has not been "
+        "independently verified. Taxation and royalty terms were provided by the company's finance "
+        "department. The author has relied on these sources for the corresponding sections."
+    ),
+    "Property Description and Location": (
+        "The property lies 38 km north-east of Belo Horizonte and is accessed by a paved state highway "
+        "followed by 11 km of unpaved road. Surface rights over the deposit area are held by the company "
+        "through purchase agreements signed in 2019. A 1.5% net smelter return royalty is payable to the "
+        "federal government."
+    ),
+    "Accessibility, Climate, Local Resources, Infrastructure": (
+        "The climate is tropical with a wet season from November to March; field work can be conducted "
+        "year round. Grid power at 138 kV passes within 6 km of the site. Water is available from the "
+        "Piracicaba river under an existing abstraction permit. The towns of Itabira and João Monlevade "
+        "provide accommodation, services and an experienced mining workforce."
+    ),
+    "History": (
+        "Artisanal workings date from the eighteenth century. Mineração Vale do Rio Doce explored the "
+        "area in the 1980s with soil geochemistry and 23 shallow holes. The current owner acquired the "
+        "licences in 2016 and started systematic drilling in 2017."
+    ),
+    "Geological Setting and Mineralization": (
+        "The deposit is located in the Rio das Velhas greenstone belt. Host rocks are metavolcanic and "
+        "metasedimentary units of the Nova Lima Group, folded into a tight north-plunging antiform. "
+        "Gold occurs with arsenopyrite and pyrrhotite in quartz-carbonate veins and replacement zones "
+        "within the iron formation. Mineralized lenses are 2 to 18 m thick and have been traced for "
+        "1,900 m along strike and 700 m down plunge."
+    ),
+    "Deposit Types": (
+        "Cerro Alto is an orogenic gold deposit comparable to Cuiabá and Lamego. Structural control "
+        "by shear zones and fold hinges is the key exploration criterion."
+    ),
+    "Exploration": (
+        "Exploration since 2017 included soil sampling on a 100 by 25 m grid, ground magnetics, "
+        "induced polarisation surveys and mapping of the iron formation outcrops. The geophysical "
+        "surveys outlined two additional targets along strike that remain untested."
+    ),
+    "Drilling": (
+        "Drilling was carried out by Geosol using HQ and NQ diamond core. Holes were surveyed downhole "
+        "with a gyroscopic tool every 30 m. Core recovery averaged 97% in fresh rock and 88% in the "
+        "oxide zone. Significant intercepts are listed below."
+    ),
+    "Sample Preparation, Analyses and Security": (
+        "Core was logged, photographed and sampled at 1 m intervals or at geological contacts. Half core "
+        "was sent to the SGS Geosol laboratory in Vespasiano, which is accredited to ISO/IEC 17025. "
+        "Gold was determined by 50 g fire assay with atomic absorption finish. The QA/QC program inserted "
+        "certified reference material, blanks and field duplicates at a combined rate of 10%."
+    ),
+    "Data Verification": (
+        "The author re-sampled 48 intervals from 12 holes; results show no bias relative to the original "
+        "assays. The database was checked against original certificates for 10% of the records, and no "
+        "material errors were found. The author considers the data adequate for resource estimation."
+    ),
+    "Mineral Processing and Metallurgical Testing": (
+        "Metallurgical testwork on four composites was completed by SGS Lakefield. Gravity recoverable "
+        "gold averaged 32%. Whole-ore leaching after pressure oxidation recovered 92.5% of the gold. "
+        "Bond ball mill work index ranged from 14.2 to 16.8 kWh/t."
+    ),
+    "Mineral Resource Estimates": (
+        "The Mineral Resource estimate was prepared using ordinary kriging of 2 m composites capped at "
+        "45 g/t Au within wireframes of the mineralized lenses. Blocks of 10 by 10 by 5 m were classified "
+        "as Measured, Indicated or Inferred based on drill spacing and kriging variance. The estimate is "
+        "reported at a cut-off grade of 1.2 g/t Au for underground mining and follows the CIM Definition "
+        "Standards (2014)."
+    ),
+    "Mineral Reserve Estimates": (
+        "No Mineral Reserves have been estimated for the project at this time."
+    ),
+    "Mining Methods": (
+        "A conceptual underground mine using sublevel open stoping with paste fill is envisaged, with a "
+        "ramp from a portal in the hanging wall. A production rate of 1,200 t/d is assumed."
+    ),
+    "Recovery Methods": (
+        "The conceptual flowsheet includes crushing, grinding to 75 microns, gravity concentration, "
+        "flotation, pressure oxidation of the concentrate and carbon-in-leach."
+    ),
+    "Project Infrastructure": (
+        "Planned infrastructure comprises a 138 kV substation, a filtered tailings stack, a paste plant, "
+        "water treatment and a camp for 250 people."
+    ),
+    "Market Studies": (
+        "Gold is freely traded and no market studies were required. A long-term gold price of "
+        "US$1,900/oz was used for the cut-off calculation."
+    ),
+    "Environmental Studies, Permitting, Social/Community Impact": (
+        "Baseline environmental studies started in 2022 and cover fauna, flora, surface and ground water. "
+        "A preliminary licence application will be submitted to the state environmental agency. The "
+        "company maintains a community relations office in Itabira."
+    ),
+    "Capital and Operating Costs": (
+        "Capital and operating costs have not been estimated at this stage of the project."
+    ),
+    "Economic Analysis": (
+        "No economic analysis has been carried out, as no Mineral Reserves have been declared."
+    ),
+    "Adjacent Properties": (
+        "The Lamego mine, operated by AngloGold Ashanti, lies 14 km to the south-west. Information on "
+        "adjacent properties is not necessarily indicative of the mineralization at Cerro Alto."
+    ),
+    "Other Relevant Data and Information": (
+        "The author is not aware of any other information that would make this report misleading."
+    ),
+    "Interpretation and Conclusions": (
+        "Drilling has defined a continuous gold system with good grade continuity in the main lens. "
+        "Risks include metallurgical variability in the arsenopyrite-rich zones and the permitting "
+        "timeline for the tailings facility."
+    ),
+    "Recommendations": (
+        "A two-phase program is recommended: 25,000 m of infill and step-out drilling (US$6.2 million) "
+        "followed by a preliminary economic assessment (US$1.1 million)."
+    ),
+    "References": (
+        "CIM (2014) Definition Standards for Mineral Resources and Mineral Reserves. Lobato, L.M. et al. "
+        "(2001) Brazil's premier gold province. Mineralium Deposita 36, 228-248."
+    ),
+    "Certificates": (
+        "I, Ana Paula Ferreira, P.Geo., am a Qualified Person as defined by National Instrument "
+        "43-101 and have read the instrument. I am responsible for all sections of this report."
+    ),
+}
+
+# Tabelas (intercepts, análises, blocos) ocupam boa parte de um relatório real
+TABLES = {
+    "Drilling": ("Hole CA-{n:03d}  from {a:.1f} m to {b:.1f} m  {w:.1f} m at {g:.2f} g/t Au  azimuth {az} dip -{dip}", 160),
+    "Sample Preparation, Analyses and Security": ("Batch {n:04d}  {k} samples  standard {s} within 2SD  blank {bl:.3f} g/t  duplicate RPD {r:.1f}%", 120),
+    "Data Verification": ("Interval CA-{n:03d} {a:.1f}-{b:.1f} m  original {g:.2f} g/t  check {c:.2f} g/t", 48),
+    "Mineral Resource Estimates": ("Lens {l}  bench {n}  tonnes {t:,}  grade {g:.2f} g/t  ounces {o:,}", 90),
+    "Geological Setting and Mineralization": ("Outcrop OC-{n:03d}  easting {e}  northing {no}  strike {az}  dip {dip}  lithology BIF", 80),
+}
+
+
+def build_report(seed=7):
+    """Texto do relatório (~46 mil caracteres), determinístico por seed"""
+    rng = random.Random(seed)
+    parts = ["NI 43-101 Technical Report on the Cerro Alto Gold Project, Minas Gerais, Brazil"]
+    for number, (title, prose) in enumerate(SECTIONS.items(), start=1):
+        parts.append(f"{number} {title}")
+        parts.append(prose)
+        if title in TABLES:
+            line, rows = TABLES[title]
+            for n in range(rows):
+                a = rng.uniform(20, 600)
+                g = rng.uniform(0.3, 12)
+                parts.append(line.format(
+                    n=n + 1, a=a, b=a + rng.uniform(1, 20), w=rng.uniform(1, 20), g=g,
+                    c=g * rng.uniform(0.9, 1.1), az=rng.randrange(360), dip=rng.randrange(40, 80),
+                    k=rng.randrange(20, 40), s=rng.choice(["G310-6", "G912-3", "OREAS 254"]),
+                    bl=rng.uniform(0, 0.02), r=rng.uniform(0, 15), l=rng.choice("ABC"),
+                    t=rng.randrange(10000, 90000), o=rng.randrange(500, 9000),
+                    e=rng.randrange(640000, 650000), no=rng.randrange(7810000, 7820000)
+                ))
+    return "\n".join(parts)
@@ -0,0 +1,124 @@
+"""
+Testes do cache de respostas do LLM
+"""
+
+import asyncio
+import threading
+import pytest
+from types import SimpleNamespace
+
+from src.ai.core.llm import (
+    LLMResponseCache, cached_completion, get_llm_cache, llm_cache_bypass, request_key
+)
+from src.ai.core.validator import ValidatorAI
+
+
+class FakeClient:
+    """Cliente com chat.completions.create contando as chamadas"""
+    
+    def __init__(self):
+        self.calls = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+    
+    async def create(self, **request):
+        self.calls.append(request)
+        content = f"resposta {len(self.calls)}"
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return LLMResponseCache(str(tmp_path / "llm.sqlite3"))
+
+
+class TestLLMResponseCache:
+    """Testes do LLMResponseCache"""
+    
+    def test_request_key_normalization(self):
+        """Testa que só espaços irrelevantes não mudam a chave"""
+        messages = [{"role": "user", "content": "Analise o relatório\nJORC"}]
+        key = request_key("gpt-4o", messages, 0.3, None, 2000)
+        
+        assert key == request_key("gpt-4o", [{"role": "user", "content": "  Analise o relatório  \r\nJORC\n"}], 0.3, None, 2000)
+        assert key != request_key("gpt-4o", messages, 0.2, None, 2000)
+        assert key != request_key("gpt-4o", messages, 0.3, {"type": "json_object"}, 2000)
+        assert key != request_key("gpt-4o", messages, 0.3, None, 500)
+        assert key != request_key("gpt-4o-mini", messages, 0.3, None, 2000)
+    
+    def test_ttl_and_lru_eviction(self, tmp_path):
+        """Testa expiração por TTL e remoção LRU pelo limite de tamanho"""
+        cache = LLMResponseCache(str(tmp_path / "llm.sqlite3"), ttl_s=60, max_bytes=20)
+        cache.put("a", "bridge", "x" * 8)
+        cache.put("b", "bridge", "y" * 8)
+        assert cache.get("a", "bridge") == "x" * 8  # "b" passa a ser o menos recente
+        
+        cache.put("c", "bridge", "z" * 8)
+        assert cache.get("b", "bridge") is None
+        assert cache.get("a", "bridge") is not None
+        
+        cache.ttl_s = 0
+        assert cache.get("c", "bridge") is None
+        assert cache.stats()['engines']['bridge'] == {'hits': 2, 'misses': 2, 'bypassed': 0, 'hit_rate': 0.5}
+    
+    @pytest.mark.asyncio
+    async def test_cached_completion_shared_by_engines(self, cache, monkeypatch):
+        """Testa hits, bypass por chamada e métricas por engine"""
+        client = FakeClient()
+        request = {"model": "gpt-4o", "messages": [{"role": "user", "content": "resumo"}], "temperature": 0.3}
+        
+        first = await cached_completion(client, 'radar', cache=cache, **request)
+        assert await cached_completion(client, 'radar', cache=cache, **request) == first
+        assert len(client.calls) == 1
+        
+        assert await cached_completion(client, 'radar', cache=cache, bypass_cache=True, **request) == "resposta 2"
+        with llm_cache_bypass():
+            await cached_completion(client, 'radar', cache=cache, **request)
+        assert len(client.calls) == 3
+        
+        monkeypatch.setenv("QIVO_LLM_CACHE_PATH", str(cache.path))
+        validator = ValidatorAI(api_key="sk-test")
+        validator.client = client
+        analyses = [await validator._analyze_with_gpt("Relatório JORC " * 20) for _ in range(2)]
+        assert analyses[0] == analyses[1] and len(client.calls) == 4
+        
+        assert cache.stats()['engines']['radar'] == {'hits': 1, 'misses': 1, 'bypassed': 2, 'hit_rate': 0.5}
+        assert get_llm_cache().stats()['engines']['validator']['hits'] == 1
+    
+    @pytest.mark.asyncio
+    async def test_cache_io_off_event_loop(self, cache, monkeypatch):
+        """Testa que o SQLite bloqueado não trava o event loop"""
+        client = FakeClient()
+        request = {"model": "gpt-4o", "messages": [{"role": "user", "content": "resumo"}]}
+        threads = []
+        get, put = cache.get, cache.put
+        
+        def slow_get(*args):
+            threads.append(threading.current_thread())
+            with cache._lock:
+                threading.Event().wait(0.2)  # Banco bloqueado por outro processo
+            return get(*args)
+        
+        def tracking_put(*args):
+            threads.append(threading.current_thread())
+            return put(*args)
+        
+        monkeypatch.setattr(cache, "get", slow_get)
+        monkeypatch.setattr(cache, "put", tracking_put)
+        
+        ticks = 0
+        
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+        
+        task = asyncio.create_task(ticker())
+        try:
+            assert await cached_completion(client, 'radar', cache=cache, **request) == "resposta 1"
+        finally:
+            task.cancel()
+        
+        assert len(threads) == 2
+        assert threading.main_thread() not in threads
+        assert ticks >= 5
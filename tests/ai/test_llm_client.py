@@ -0,0 +1,21 @@
+"""
+Testes do cliente OpenAI compartilhado
+"""
+
+import asyncio
+
+from src.ai.core.llm import close_openai_clients, get_openai_client
+
+
+class TestSharedClient:
+    """Testes do get_openai_client"""
+    
+    def test_engines_share_client(self):
+        """Testa que a mesma chave reutiliza o cliente (e o pool de conexões)"""
+        first = get_openai_client("sk-test", base_url="http://127.0.0.1:1/v1")
+        assert get_openai_client("sk-test", base_url="http://127.0.0.1:1/v1") is first
+        assert get_openai_client("sk-other", base_url="http://127.0.0.1:1/v1") is not first
+        
+        asyncio.run(close_openai_clients())
+        assert get_openai_client("sk-test", base_url="http://127.0.0.1:1/v1") is not first
+        asyncio.run(close_openai_clients())
@@ -0,0 +1,96 @@
+"""
+Testes do limitador de taxa das chamadas ao GPT
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src.ai.core.llm import RateLimiter, cached_completion, cached_stream, get_rate_limiter, llm_priority
+
+
+class TestRateLimiter:
+    """Testes do RateLimiter"""
+    
+    def test_interactive_goes_before_batch(self):
+        """Testa que chamadas interativas passam na frente do lote quando o balde esvazia"""
+        limiter = RateLimiter(requests_per_min=600)
+        limiter.requests.level = 0
+        order = []
+        
+        async def call(name):
+            await limiter.acquire(10)
+            order.append(name)
+        
+        async def run():
+            with llm_priority('batch'):
+                batch = [asyncio.create_task(call(f"batch-{i}")) for i in range(2)]
+            await asyncio.sleep(0)
+            await asyncio.gather(call("interactive"), *batch)
+        
+        asyncio.run(run())
+        assert order == ["interactive", "batch-0", "batch-1"]
+        
+        stats = limiter.stats()
+        assert stats['wait']['batch']['acquired'] == 2
+        assert stats['wait']['interactive']['waited'] == 1
+        assert stats['wait']['batch']['wait_max_s'] >= stats['wait']['interactive']['wait_max_s'] > 0
+        assert stats['queued'] == {'interactive': 0, 'batch': 0}
+    
+    def test_tokens_refunded_and_split_across_workers(self, monkeypatch):
+        """Testa a devolução de tokens não usados e a divisão do limite entre processos"""
+        limiter = RateLimiter(tokens_per_min=1000)
+        reserved = asyncio.run(limiter.acquire(5000))
+        assert reserved == 1000
+        limiter.release(reserved, used=400)
+        assert limiter.stats()['tokens_available'] == 600
+        
+        monkeypatch.delenv('QIVO_LLM_RPM', raising=False)
+        monkeypatch.delenv('QIVO_LLM_TPM', raising=False)
+        assert get_rate_limiter() is None
+        
+        monkeypatch.setenv('QIVO_LLM_RPM', '500')
+        monkeypatch.setenv('QIVO_LLM_TPM', '90000')
+        monkeypatch.setenv('QIVO_LLM_WORKERS', '4')
+        shared = get_rate_limiter()
+        assert shared is get_rate_limiter()
+        assert shared.stats()['requests_per_min'] == 125
+        assert shared.stats()['tokens_per_min'] == 22500
+    
+    def test_failed_and_streamed_calls_settle_reservation(self, monkeypatch):
+        """Testa que falhas devolvem a reserva e streams acertam pelo uso do último pedaço"""
+        for name in ('QIVO_LLM_CACHE_PATH', 'QIVO_LLM_RPM', 'QIVO_LLM_WORKERS', 'WEB_CONCURRENCY'):
+            monkeypatch.delenv(name, raising=False)
+        monkeypatch.setenv('QIVO_LLM_TPM', '600')
+        limiter = get_rate_limiter()
+        request = dict(model="gpt-4o", messages=[{"role": "user", "content": "Resumo JORC"}], max_tokens=500)
+        requests = []
+        
+        async def failing_create(**kwargs):
+            raise RuntimeError("503 Service Unavailable")
+        
+        async def streaming_create(**kwargs):
+            requests.append(kwargs)
+            
+            async def chunks():
+                for text in ("Recursos ", "JORC."):
+                    delta = SimpleNamespace(content=text)
+                    yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)], usage=None)
+                yield SimpleNamespace(choices=[], usage=SimpleNamespace(total_tokens=40))
+            return chunks()
+        
+        def client(create):
+            return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+        
+        with pytest.raises(RuntimeError):
+            asyncio.run(cached_completion(client(failing_create), 'validator', **request))
+        assert limiter.stats()['tokens_available'] == 600
+        
+        async def collect():
+            return [part async for part in cached_stream(client(streaming_create), 'validator', **request)]
+        
+        assert asyncio.run(collect()) == ["Recursos ", "JORC."]
+        assert requests[0]['stream_options'] == {'include_usage': True}
+        # Reserva de ~510 tokens acertada para os 40 usados
+        assert 558 <= limiter.stats()['tokens_available'] <= 562
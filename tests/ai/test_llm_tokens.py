@@ -0,0 +1,71 @@
+"""
+Testes do orçamento de tokens
+"""
+
+from src.ai.core.llm import TokenBudget, context_window
+
+
+class FakeEncoding:
+    """Codificação de 3 caracteres por token que registra os textos codificados"""
+    
+    def __init__(self):
+        self.encoded = []
+    
+    def encode(self, text, disallowed_special=()):
+        self.encoded.append(len(text))
+        return [text[i:i + 3] for i in range(0, len(text), 3)]
+    
+    def decode(self, tokens):
+        return ''.join(tokens)
+
+
+class TestTokenBudget:
+    """Testes do TokenBudget"""
+    
+    def test_counts_are_memoized(self):
+        """Testa que medir o mesmo texto de novo não tokeniza outra vez"""
+        budget = TokenBudget("gpt-4o")
+        text = "A jazida apresenta recursos medidos de 10 Mt segundo o código JORC. " * 50
+        
+        count = budget.count(text)
+        assert count > 0
+        assert budget.count(text) == count
+        assert budget.stats()['hits'] == 1 and budget.stats()['misses'] == 1
+    
+    def test_fit_to_context(self):
+        """Testa o corte pelo que sobra da janela após prompt e resposta"""
+        budget = TokenBudget("gpt-4")
+        assert budget.context == context_window("gpt-4-0613") == 8192
+        assert context_window("gpt-4o-mini") == 128000
+        
+        messages = [{"role": "system", "content": "Você é um especialista em mineração."}]
+        document = "Measured and indicated resources under NI 43-101. " * 2000
+        
+        fitted = budget.fit(document, messages, max_tokens=2000)
+        assert fitted.endswith("[... documento truncado ...]")
+        assert budget.count(fitted) <= budget.available(messages, 2000) + 1
+        assert budget.available(messages, 2000) == 8192 - 2000 - budget.count_messages(messages)
+        
+        capped = budget.fit(document, messages, max_tokens=2000, limit=300)
+        assert budget.count(capped) <= 301
+        assert budget.fit("Texto curto.", messages, max_tokens=2000) == "Texto curto."
+    
+    def test_truncate_reads_only_the_budget(self):
+        """Testa que um texto enorme é tokenizado uma vez e só até o orçamento"""
+        budget = TokenBudget("gpt-4o")
+        encoding = FakeEncoding()
+        budget._encoding = encoding
+        document = "Recursos indicados segundo o NI 43-101. " * 100000
+        
+        truncated = budget.truncate(document, 1000, marker="[corte]")
+        
+        assert encoding.encoded == [budget.char_budget(1000), len("[corte]")]
+        assert truncated == document[:3 * (1000 - 3)] + "[corte]"
+        assert budget.stats()['entries'] == 1  # Só o marcador
+        
+        assert budget.truncate("Texto curto.", 1000) == "Texto curto."
+        
+        estimated = TokenBudget("gpt-4o")
+        estimated._encoding = None
+        assert estimated.truncate(document, 1000, marker="[corte]") == document[:4 * (1000 - 2)] + "[corte]"
+        assert estimated.stats()['entries'] == 1
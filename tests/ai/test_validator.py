@@ -6,8 +6,90 @@ Testes Unit
 
 import pytest
 import os
+import dataclasses
+import asyncio
+import json
+import re
+import random
 from pathlib import Path
-from src.ai.core.validator import ValidatorAI, ComplianceScorer, DocumentPreprocessor, RiskLevel
+from types import SimpleNamespace
+from src.ai.core.validator import (
+    ValidatorAI, ComplianceScorer, DocumentPreprocessor, RiskLevel,
+    ExtractionQueueFullError, ExtractionCache, ExtractionResult, PipelineStats, Section
+)
+from src.ai.core.validator.chunking import split_chunks
+from src.ai.core.llm import get_token_budget
+from tests.ai.sample_report import build_report
+
+
+def build_pdf(pages):
+    """Gera um PDF mínimo com uma linha de texto por página"""
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # Pages, preenchido abaixo
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    kids = []
+    for text in pages:
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        content_id = len(objects)
+        objects.append(
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>"
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+    
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        out += f"{offset:010d} 00000 n \n".encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return out
+
+
+@pytest.fixture
+def sample_docx(tmp_path):
+    """DOCX com parágrafos, tabela com células mescladas e tabela aninhada"""
+    docx = pytest.importorskip("docx")
+    document = docx.Document()
+    document.add_paragraph("Relatório técnico NI 43-101")
+    
+    table = document.add_table(rows=3, cols=3)
+    for row_index, row in enumerate(table.rows):
+        for col_index, cell in enumerate(row.cells):
+            cell.text = f"R{row_index}C{col_index}"
+    table.cell(0, 0).merge(table.cell(0, 1))
+    table.cell(1, 2).merge(table.cell(2, 2))
+    table.cell(1, 0).add_table(rows=1, cols=2).cell(0, 0).text = "aninhada"
+    
+    run = document.add_paragraph("Teor\tmédio").add_run()
+    run.add_break()
+    run.add_text("2,5 g/t")
+    document.add_paragraph("   ")
+    document.add_paragraph("QA/QC com brancos")
+    
+    path = tmp_path / "report.docx"
+    document.save(str(path))
+    return path
+
+
+@pytest.fixture
+def sample_pdf(tmp_path):
+    """PDF de três páginas (a segunda vazia)"""
+    path = tmp_path / "report.pdf"
+    path.write_bytes(build_pdf([
+        "Item 14 Mineral Resource Estimates",
+        "",
+        "QA QC   sampling    with blanks",
+    ]))
+    return path
 
 
 class TestDocumentPreprocessor:
@@ -25,12 +107,439 @@ class TestDocumentPreprocessor:
         assert "  " not in clean
         assert "\n\n" not in clean
     
+    def test_clean_text_removes_special_chars(self, preprocessor):
+        """Testa remoção de caracteres especiais sem deixar espaços duplos"""
+        clean = preprocessor._clean_text("  Teor © 2,5 g/t Au • (JORC)\t\n")
+        
+        assert clean == "Teor 2,5 gt Au (JORC)"
+    
+    def test_clean_text_matches_legacy_regex(self, preprocessor):
+        """Testa que o resultado é o da limpeza antiga com os espaços duplos colapsados"""
+        def legacy(text):
+            text = re.sub(r'\s+', ' ', text)
+            text = re.sub(r'[^\w\s\.,;:!?()\-\[\]{}]', '', text)
+            return re.sub(r' {2,}', ' ', text).strip()
+        
+        rng = random.Random(42)
+        alphabet = "aZ09_ .,;:!?()-[]{}\t\n\r\x0b\x1f/%$@#àçãé\xa0\u2003\u2028•©—€😀ß"
+        for _ in range(200):
+            text = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 60)))
+            assert preprocessor._clean_text(text) == legacy(text)
+    
+    def test_clean_text_keep_paragraphs(self):
+        """Testa preservação de limites de parágrafo"""
+        preprocessor = DocumentPreprocessor(keep_paragraphs=True)
+        clean = preprocessor._clean_text("Item 1\nResumo  geral\n \n\nItem 2 ©\n\n")
+        
+        assert clean == "Item 1 Resumo geral\n\nItem 2"
+    
     def test_get_metadata(self, preprocessor):
         """Testa extração de metadata"""
         metadata = preprocessor.get_metadata()
         
         assert isinstance(metadata, dict)
         assert all(key in metadata for key in ['file_name', 'file_type', 'file_size'])
+    
+    @pytest.mark.asyncio
+    async def test_iter_pages_pdf(self, preprocessor, sample_pdf):
+        """Testa extração streaming página a página"""
+        pages = [page async for page in preprocessor.iter_pages(str(sample_pdf))]
+        
+        assert pages == [
+            (1, "Item 14 Mineral Resource Estimates"),
+            (3, "QA QC sampling with blanks"),
+        ]
+        
+        metadata = preprocessor.get_metadata()
+        assert metadata['page_count'] == 3
+        assert metadata['char_count'] == len(' '.join(text for _, text in pages))
+        assert metadata['word_count'] == 10
+    
+    @pytest.mark.asyncio
+    async def test_extract_joins_pages(self, preprocessor, sample_pdf):
+        """Testa que extract consome o modo streaming e devolve um resultado"""
+        result = await preprocessor.extract(str(sample_pdf))
+        
+        assert isinstance(result, ExtractionResult)
+        assert result.text == "Item 14 Mineral Resource Estimates QA QC sampling with blanks"
+        assert result.page_offsets == ((1, 0), (3, 35))
+        assert result.page_at(40) == 3
+        assert result.metadata['page_count'] == 3
+        assert result.timings['total'] >= result.timings['first_page'] > 0
+    
+    @pytest.mark.asyncio
+    async def test_preprocess_text_returns_text(self, preprocessor, sample_pdf):
+        """Testa que preprocess_text mantém o retorno em texto e a metadata da instância"""
+        text = await preprocessor.preprocess_text(str(sample_pdf))
+        
+        assert text == "Item 14 Mineral Resource Estimates QA QC sampling with blanks"
+        assert preprocessor.get_metadata()['page_count'] == 3
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_results_are_isolated(self, preprocessor, sample_pdf, tmp_path):
+        """Testa que documentos concorrentes não compartilham metadata"""
+        notes = tmp_path / "notes.txt"
+        notes.write_text("linha um", encoding="utf-8")
+        
+        pdf, txt = await asyncio.gather(
+            preprocessor.extract(str(sample_pdf)),
+            preprocessor.extract(str(notes))
+        )
+        
+        assert (pdf.metadata['file_name'], pdf.metadata['page_count']) == ("report.pdf", 3)
+        assert (txt.metadata['file_name'], txt.metadata['page_count']) == ("notes.txt", 1)
+        with pytest.raises(TypeError):
+            pdf.metadata['file_name'] = "outro.pdf"
+        with pytest.raises(AttributeError):
+            pdf.text = ""
+    
+    @pytest.mark.asyncio
+    async def test_result_metadata_frozen_deeply(self, sample_pdf):
+        """Testa que a telemetria do resultado não é compartilhada com o preprocessor"""
+        reported = []
+        preprocessor = DocumentPreprocessor(metrics_hook=reported.append)
+        result = await preprocessor.extract(str(sample_pdf))
+        parsed_pages = result.metadata['telemetry']['parsed_pages']
+        
+        preprocessor.get_metadata()['telemetry']['parsed_pages'] = -1
+        reported[0]['telemetry']['stages_s']['parse'] = -1.0
+        
+        assert result.metadata['telemetry']['parsed_pages'] == parsed_pages
+        assert result.metadata['telemetry']['stages_s']['parse'] >= 0
+        with pytest.raises(TypeError):
+            result.metadata['telemetry']['parsed_pages'] = 0
+        
+        metadata = result.metadata_dict()
+        metadata['telemetry']['parsed_pages'] = 0
+        assert result.metadata['telemetry']['parsed_pages'] == parsed_pages
+        assert json.loads(json.dumps(result.to_dict()))['metadata']['telemetry']['parsed_pages'] == parsed_pages
+    
+    @pytest.mark.asyncio
+    async def test_extraction_telemetry(self, sample_pdf):
+        """Testa tempos por etapa na metadata e no metrics_hook"""
+        reported = []
+        preprocessor = DocumentPreprocessor(metrics_hook=reported.append)
+        
+        result = await preprocessor.extract(str(sample_pdf))
+        telemetry = result.metadata['telemetry']
+        
+        assert set(telemetry['stages_s']) == {'open', 'parse', 'clean'}
+        assert telemetry['parsed_pages'] == 3
+        assert telemetry['slowest_page'] in (1, 2, 3)
+        assert telemetry['pages_per_s'] > 0
+        assert telemetry['bytes_per_s'] > 0
+        assert result.timings['parse'] > 0
+        assert reported == [dict(result.metadata)]
+    
+    @pytest.mark.asyncio
+    async def test_metrics_hook_errors_are_ignored(self, sample_pdf):
+        """Testa que falha no metrics_hook não interrompe a extração"""
+        def broken(metadata):
+            raise RuntimeError("exportador indisponível")
+        
+        preprocessor = DocumentPreprocessor(metrics_hook=broken)
+        result = await preprocessor.extract(str(sample_pdf))
+        
+        assert result.metadata['page_count'] == 3
+    
+    @pytest.mark.asyncio
+    async def test_section_index(self, preprocessor, tmp_path):
+        """Testa índice de seções construído durante a extração"""
+        path = tmp_path / "ni43101.pdf"
+        path.write_bytes(build_pdf([
+            "Technical Report Gold Project",
+            "Item 1 Summary ........ 3 Item 14 Mineral Resource Estimates ........ 40",
+            "Item 1 Summary The project hosts indicated resources",
+            "Item 14 Mineral Resource Estimates Indicated 2.1 Mt at 3.4 g/t",
+            "Item 14 Mineral Resource Estimates as noted in Item 1 Summary grades",
+            "Item 15 Mineral Reserve Estimates Probable reserves",
+        ]))
+        
+        result = await preprocessor.extract(str(path))
+        
+        assert [(s.number, s.title, s.page) for s in result.sections] == [
+            ("1", "Summary", 3),
+            ("14", "Mineral Resource Estimates", 4),
+            ("15", "Mineral Reserve Estimates", 6),
+        ]
+        assert result.metadata['section_count'] == 3
+        assert result.section_text("14").startswith("Item 14 Mineral Resource Estimates Indicated")
+        assert result.section_text("14").endswith("Item 1 Summary grades ")
+        assert result.section_text("mineral reserve estimates") == "Item 15 Mineral Reserve Estimates Probable reserves"
+        assert result.section_text("Drilling") is None
+    
+    @pytest.mark.asyncio
+    async def test_process_pool_backend(self, sample_pdf):
+        """Testa extração no pool de processos"""
+        preprocessor = DocumentPreprocessor(max_workers=2)
+        try:
+            result = await preprocessor.extract(str(sample_pdf))
+        finally:
+            preprocessor.shutdown()
+        
+        assert result.text == "Item 14 Mineral Resource Estimates QA QC sampling with blanks"
+    
+    @pytest.mark.asyncio
+    async def test_parallel_page_ranges_keep_order(self, tmp_path):
+        """Testa extração paralela em faixas com remontagem na ordem original"""
+        path = tmp_path / "large.pdf"
+        path.write_bytes(build_pdf([f"Page {i}" for i in range(1, 26)]))
+        
+        preprocessor = DocumentPreprocessor(
+            max_workers=2, parallel_page_threshold=10, parallel_workers=2
+        )
+        preprocessor.PAGES_PER_PROCESS_TASK = 3
+        try:
+            pages = [page async for page in preprocessor.iter_pages(str(path))]
+        finally:
+            preprocessor.shutdown()
+        
+        assert pages == [(i, f"Page {i}") for i in range(1, 26)]
+    
+    @pytest.mark.asyncio
+    async def test_extraction_queue_full(self, sample_pdf):
+        """Testa rejeição quando a fila de extração está cheia"""
+        preprocessor = DocumentPreprocessor(max_workers=0, max_queue_depth=0)
+        preprocessor._pending = 1
+        
+        with pytest.raises(ExtractionQueueFullError):
+            await preprocessor.extract(str(sample_pdf))
+    
+    @pytest.mark.asyncio
+    async def test_extract_with_budget_stops_early(self, tmp_path):
+        """Testa que páginas após o orçamento não são parseadas"""
+        path = tmp_path / "long.pdf"
+        path.write_bytes(build_pdf([f"Page {i} resource estimate" for i in range(1, 41)]))
+        
+        preprocessor = DocumentPreprocessor()
+        preprocessor.PAGES_PER_TASK = 2
+        batch_ends = []
+        run_extraction = preprocessor._run_extraction
+        
+        async def tracking(func, *args, **kwargs):
+            if len(args) == 2:
+                batch_ends.append(args[1])
+            return await run_extraction(func, *args, **kwargs)
+        
+        preprocessor._run_extraction = tracking
+        result = await preprocessor.extract_with_budget(str(path), max_chars=40)
+        metadata = result.metadata
+        
+        assert result.text == "Page 1 resource estimate Page 2 resource"
+        assert metadata['truncated'] is True
+        assert metadata['page_count'] == 2
+        assert max(batch_ends) <= 4
+    
+    @pytest.mark.asyncio
+    async def test_extract_with_budget_no_dangling_separator(self, preprocessor, tmp_path):
+        """Testa que o orçamento esgotado no separador não conta a página seguinte"""
+        path = tmp_path / "short.pdf"
+        path.write_bytes(build_pdf(["Page one", "Page two", "Page three"]))
+        
+        result = await preprocessor.extract_with_budget(str(path), max_chars=9)
+        
+        assert result.text == "Page one"
+        assert result.page_offsets == ((1, 0),)
+        assert result.metadata['page_count'] == 1
+        assert result.metadata['truncated'] is True
+    
+    @pytest.mark.asyncio
+    async def test_extract_with_budget_skips_front_matter(self, preprocessor, tmp_path):
+        """Testa descarte de capa e sumário"""
+        path = tmp_path / "ni43101.pdf"
+        path.write_bytes(build_pdf([
+            "Technical Report Gold Project",
+            "Table of Contents",
+            "Summary ........ 1 Geology ........ 5 Drilling ........ 9",
+            "1 Summary The project hosts indicated resources",
+            "2 Geology Orogenic gold",
+        ]))
+        
+        result = await preprocessor.extract_with_budget(
+            str(path), max_tokens=100, skip_front_matter=True
+        )
+        metadata = result.metadata
+        
+        assert result.text.startswith("1 Summary")
+        assert result.page_offsets[0] == (4, 0)
+        assert metadata['skipped_pages'] == 3
+        assert metadata['truncated'] is False
+    
+    def test_toc_detection_anchored_to_page_start(self):
+        """Testa que 'contents' no corpo da página não marca sumário"""
+        is_toc = DocumentPreprocessor._is_toc_page
+        
+        assert is_toc("Table of Contents")
+        assert is_toc("Índice 1 Resumo .... 3")
+        assert is_toc("Summary ........ 1 Geology ........ 5 Drilling ........ 9")
+        assert not is_toc("Contents of the sample bags were logged before assay")
+        assert not is_toc("The metal contents of the deposit are reported in Table 14")
+        assert not is_toc("Table of Contents of the drill core storage facility")
+    
+    @pytest.mark.asyncio
+    async def test_iter_pages_txt(self, preprocessor, tmp_path):
+        """Testa que TXT é tratado como página única"""
+        path = tmp_path / "notes.txt"
+        path.write_text("linha   um\n\nlinha dois", encoding="utf-8")
+        
+        pages = [page async for page in preprocessor.iter_pages(str(path))]
+        
+        assert pages == [(1, "linha um linha dois")]
+    
+    @pytest.mark.asyncio
+    async def test_iter_pages_txt_chunks(self, tmp_path):
+        """Testa leitura de TXT em blocos sem quebrar palavras ou caracteres UTF-8"""
+        path = tmp_path / "drillhole_log.txt"
+        content = "\n".join(f"FURO-{i:03d} teor 2,5 g/t ação análise" for i in range(200))
+        path.write_text(content, encoding="utf-8")
+        
+        preprocessor = DocumentPreprocessor()
+        preprocessor.TXT_CHUNK_SIZE = 37
+        pages = [page async for page in preprocessor.iter_pages(str(path))]
+        
+        assert len(pages) > 100
+        assert all(len(text.encode("utf-8")) <= 2 * 37 for _, text in pages)
+        assert ' '.join(text for _, text in pages) == preprocessor._clean_text(content)
+        assert preprocessor.get_metadata()['page_count'] == len(pages)
+    
+    def test_docx_blocks_match_python_docx(self, sample_docx):
+        """Testa que o parser em streaming reproduz o texto do python-docx"""
+        docx = pytest.importorskip("docx")
+        from docx.table import Table
+        from docx.text.paragraph import Paragraph
+        from src.ai.core.validator.extractors import iter_docx_blocks
+        
+        document = docx.Document(str(sample_docx))
+        expected = []
+        for child in document.element.body.iterchildren():
+            if child.tag.endswith('}p'):
+                expected.append(Paragraph(child, document).text)
+            elif child.tag.endswith('}tbl'):
+                expected.extend(
+                    ' | '.join(cell.text.strip() for cell in row.cells)
+                    for row in Table(child, document).rows
+                )
+        
+        assert list(iter_docx_blocks(str(sample_docx))) == [text for text in expected if text.strip()]
+    
+    @pytest.mark.asyncio
+    async def test_iter_pages_docx_chunks(self, sample_docx):
+        """Testa leitura de DOCX em lotes nos dois backends"""
+        from src.ai.core.validator.extractors import extract_docx
+        
+        preprocessor = DocumentPreprocessor()
+        preprocessor.TXT_CHUNK_SIZE = 20
+        pages = [page async for page in preprocessor.iter_pages(str(sample_docx))]
+        expected = preprocessor._clean_text(extract_docx(str(sample_docx)))
+        
+        assert len(pages) > 1
+        assert ' '.join(text for _, text in pages) == expected
+        
+        pool = DocumentPreprocessor(max_workers=1)
+        try:
+            assert (await pool.extract(str(sample_docx))).text == expected
+        finally:
+            pool.shutdown()
+    
+    @pytest.mark.asyncio
+    async def test_iter_pages_empty_txt(self, preprocessor, tmp_path):
+        """Testa TXT vazio"""
+        path = tmp_path / "empty.txt"
+        path.write_bytes(b"")
+        
+        assert [page async for page in preprocessor.iter_pages(str(path))] == []
+    
+    @pytest.mark.asyncio
+    async def test_iter_pages_unsupported(self, preprocessor, tmp_path):
+        """Testa rejeição de formato não suportado"""
+        path = tmp_path / "data.csv"
+        path.write_text("a,b", encoding="utf-8")
+        
+        with pytest.raises(ValueError):
+            async for _ in preprocessor.iter_pages(str(path)):
+                pass
+
+
+class TestExtractionCache:
+    """Testes do cache de extração endereçado por conteúdo"""
+    
+    @pytest.fixture
+    def cache(self, tmp_path):
+        return ExtractionCache(str(tmp_path / "cache.db"))
+    
+    @pytest.mark.asyncio
+    async def test_cache_hit_skips_parsing(self, cache, sample_pdf, tmp_path):
+        """Testa que um hit devolve as páginas sem parsing"""
+        preprocessor = DocumentPreprocessor(cache=cache)
+        first = await preprocessor.extract(str(sample_pdf))
+        assert first.metadata['cache_hit'] is False
+        
+        # Mesmo conteúdo com outro nome de arquivo
+        copy = tmp_path / "resubmission.pdf"
+        copy.write_bytes(sample_pdf.read_bytes())
+        
+        async def fail(*args):
+            raise AssertionError("parsing não deveria ocorrer")
+        
+        preprocessor._run_extraction = fail
+        second = await preprocessor.extract(str(copy))
+        metadata = second.metadata
+        
+        assert second.text == first.text
+        assert second.page_offsets == first.page_offsets
+        assert metadata['cache_hit'] is True
+        assert metadata['file_name'] == "resubmission.pdf"
+        assert metadata['page_count'] == 3
+        assert cache.stats()['hits'] == 1
+        assert cache.stats()['misses'] == 1
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("max_workers", [0, 1])
+    async def test_revision_reuses_unchanged_pages(self, cache, tmp_path, max_workers):
+        """Testa que a revisão de um relatório só parseia as páginas alteradas"""
+        pages = [f"Section {i} resource estimate" for i in range(1, 7)]
+        original = tmp_path / "report_rev1.pdf"
+        original.write_bytes(build_pdf(pages))
+        pages[2] = "Section 3 updated reserve estimate"
+        revision = tmp_path / "report_rev2.pdf"
+        revision.write_bytes(build_pdf(pages))
+        
+        preprocessor = DocumentPreprocessor(max_workers=max_workers, cache=cache)
+        try:
+            await preprocessor.extract(str(original))
+            
+            parsed = []
+            run_extraction = preprocessor._run_extraction
+            
+            async def tracking(func, *args, **kwargs):
+                # Método do leitor (threads) ou partial de extractors (processos)
+                if getattr(func, 'func', func).__name__ in ('extract_indices', 'extract_pdf_page_indices'):
+                    parsed.extend(args[0])
+                return await run_extraction(func, *args, **kwargs)
+            
+            preprocessor._run_extraction = tracking
+            result = await preprocessor.extract(str(revision))
+        finally:
+            preprocessor.shutdown()
+        
+        assert parsed == [2]
+        assert result.metadata['reused_pages'] == 5
+        assert result.metadata['telemetry']['parsed_pages'] == 1
+        assert result.text == ' '.join(pages)
+    
+    def test_lru_eviction(self, tmp_path):
+        """Testa remoção da entrada menos recente ao exceder o limite"""
+        cache = ExtractionCache(str(tmp_path / "cache.db"), max_bytes=60)
+        cache.put("a", [(1, "x" * 20)], {})
+        cache.put("b", [(1, "y" * 20)], {})
+        assert cache.get("a") is not None
+        
+        cache.put("c", [(1, "z" * 20)], {})
+        
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+        assert cache.stats()['evictions'] == 1
 
 
 class TestComplianceScorer:
@@ -47,6 +556,186 @@ class TestComplianceScorer:
         
         assert count >= 4  # jorc x2 + resource + measured + indicated
     
+    def test_single_pass_matches_str_count(self):
+        """Testa que a contagem em uma passagem equivale a str.count (modo 'none')"""
+        scorer = ComplianceScorer(boundary='none')
+        categories = scorer._category_keywords()
+        keywords = [k for words in categories.values() for k in words]
+        fragments = keywords + ['specimen', '11p', 'ni 43-101p', 'qa/qcim', ' ', '-']
+        
+        rng = random.Random(13)
+        for _ in range(200):
+            text = ''.join(rng.choice(fragments) for _ in range(20))
+            expected = {
+                category: sum(text.count(k) for k in words)
+                for category, words in categories.items()
+            }
+            assert scorer.matcher.count(text) == expected
+    
+    def test_self_overlapping_keywords_match_str_count(self, monkeypatch):
+        """Testa que ocorrências sobrepostas da mesma palavra-chave contam como em str.count"""
+        monkeypatch.delenv("QIVO_KEYWORD_BOUNDARY", raising=False)
+        assert ComplianceScorer().boundary == 'none'
+        
+        categories = {'a': ['bb', 'abab', 'ab', 'b'], 'c': ['bab', 'x bb']}
+        scorer = ComplianceScorer(ruleset=dataclasses.replace(
+            ComplianceScorer.builtin_ruleset(), version='teste', keywords=categories,
+            weights={'a': 0.5, 'c': 0.5}
+        ))
+        matcher = scorer.matcher
+        assert matcher.count("bbb") == {'a': 1 + 3, 'c': 0}
+        
+        rng = random.Random(15)
+        for _ in range(300):
+            text = ''.join(rng.choice(['b', 'a', 'ab', 'bb', ' ', 'x ']) for _ in range(rng.randrange(25)))
+            expected = {category: sum(text.count(k) for k in words) for category, words in categories.items()}
+            assert matcher.count(text) == expected
+            assert {c: len(p) for c, p in matcher.positions(matcher.find(text)).items()} == expected
+            
+            session = scorer.session()
+            for index in range(0, len(text), 3):
+                session.feed(text[index:index + 3])
+            assert session.finalize() == scorer.evaluate(text)
+    
+    @pytest.mark.parametrize("boundary,expected", [
+        ('none', {'cim': 2, '1p': 2, 'resource': 2}),
+        ('start', {'cim': 1, '1p': 1, 'resource': 2}),
+        ('word', {'cim': 1, '1p': 1, 'resource': 1}),
+    ])
+    def test_keyword_boundaries(self, boundary, expected):
+        """Testa os modos de fronteira de palavra"""
+        scorer = ComplianceScorer(boundary=boundary)
+        counts = scorer.matcher.count_keywords("CIM specimen 1P 11p resources resource")
+        
+        assert {k: counts[k] for k in expected} == expected
+    
+    def test_matcher_is_shared(self):
+        """Testa que o autômato é compilado uma vez por conjunto de regras"""
+        assert ComplianceScorer().matcher is ComplianceScorer().matcher
+        
+        with pytest.raises(ValueError):
+            ComplianceScorer(boundary='fuzzy')
+    
+    def test_evaluate_many_matches_evaluate(self, scorer):
+        """Testa que a avaliação em lote equivale a evaluate() texto a texto"""
+        pytest.importorskip("numpy")
+        keywords = [k for words in scorer._category_keywords().values() for k in words]
+        
+        rng = random.Random(14)
+        texts = ['', 'sem termos'] + [
+            ' '.join(rng.choice(keywords + ['teor', 'furo']) for _ in range(rng.randint(1, 80)))
+            for _ in range(100)
+        ]
+        batch = scorer.evaluate_many(texts)
+        
+        assert len(batch) == len(texts)
+        assert batch.counts.shape == (len(texts), 5)
+        for index, text in enumerate(texts):
+            assert batch.row(index) == scorer.evaluate(text)
+        
+        columns = batch.to_dict()
+        assert columns['compliance_score'] == batch.compliance_score.tolist()
+        assert columns['jorc_count'] == batch.counts[:, 0].tolist()
+    
+    def test_score_counts_with_new_weights(self, scorer):
+        """Testa reavaliação com novos pesos sem recontar"""
+        pytest.importorskip("numpy")
+        batch = scorer.evaluate_many(["jorc measured indicated inferred qa/qc sampling assay"])
+        
+        reweighted = ComplianceScorer()
+        reweighted.scoring_weights = {'jorc': 1.0, 'ni_43_101': 0, 'prms': 0, 'qa_qc': 0, 'compliance': 0}
+        rescored = reweighted.score_counts(batch.counts, batch.categories)
+        
+        assert rescored.compliance_score.tolist() == [40]
+        assert rescored.risk_level.tolist() == [RiskLevel.HIGH.value]
+        assert rescored.ruleset.version == 'builtin+local'
+    
+    def test_ruleset_hot_reload(self, tmp_path):
+        """Testa recarga do arquivo de regras e versão registrada no resultado"""
+        path = tmp_path / "ruleset.json"
+        rules = ComplianceScorer.builtin_ruleset().to_dict()
+        
+        def write(version, **changes):
+            path.write_text(json.dumps({**rules, 'version': version, **changes}), encoding="utf-8")
+            stat = path.stat()
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        
+        write("2025.1")
+        scorer = ComplianceScorer(ruleset_path=str(path), reload_interval=0)
+        text = "jorc measured indicated qa/qc"
+        first = scorer.evaluate(text)
+        matcher = scorer.matcher
+        
+        assert first['ruleset_version'] == "2025.1"
+        assert first == {**ComplianceScorer().evaluate(text), 'ruleset_version': "2025.1"}
+        
+        write("2025.2", weights={'jorc': 1.0})
+        second = scorer.evaluate(text)
+        assert second['ruleset_version'] == "2025.2"
+        assert second['compliance_score'] == 30
+        assert scorer.matcher is matcher  # Mesmas palavras-chave: mesmo autômato
+        
+        path.write_text("{inválido", encoding="utf-8")
+        assert scorer.evaluate(text) == second
+        
+        with pytest.raises(ValueError):
+            ComplianceScorer(ruleset_path=str(path))
+    
+    @pytest.mark.parametrize("boundary", ['none', 'start', 'word'])
+    def test_session_matches_evaluate(self, boundary):
+        """Testa que o scoring incremental equivale a evaluate() em qualquer divisão"""
+        scorer = ComplianceScorer(boundary=boundary)
+        text = "QA/QC with certified reference material (CRM), blanks and NI 43-101 1P reserves. " * 3
+        
+        for split in range(len(text)):
+            session = scorer.session()
+            session.feed(text[:split])
+            session.feed(text[split:])
+            assert session.finalize() == scorer.evaluate(text)
+        
+        rng = random.Random(16)
+        session = scorer.session()
+        position = 0
+        while position < len(text):
+            size = rng.randint(1, 7)
+            session.feed(text[position:position + size])
+            position += size
+        assert session.finalize() == scorer.evaluate(text)
+        
+        with pytest.raises(ValueError):
+            session.feed("audit")
+    
+    def test_heatmap_locates_evidence(self):
+        """Testa posições e densidades por página, seção e janela"""
+        scorer = ComplianceScorer()
+        intro = "Property description and geology. " * 20
+        qaqc = "QA/QC program with blanks, duplicates and CRM standards. " * 5
+        text = intro + qaqc + intro
+        qaqc_start = len(intro)
+        sections = [
+            Section("Introduction", "1", 1, 0, qaqc_start, 1),
+            Section("Sample Preparation", "11", 1, qaqc_start, qaqc_start + len(qaqc), 2)
+        ]
+        
+        result = scorer.evaluate_heatmap(
+            text, window=500, sections=sections, page_offsets=[(1, 0), (2, qaqc_start)]
+        )
+        expected = scorer.evaluate(text)
+        assert {key: result[key] for key in expected} == expected
+        
+        offsets = result['offsets']['qa_qc']
+        assert len(offsets) == result['breakdown']['qa_qc_mentions']
+        assert all(qaqc_start <= offset < qaqc_start + len(qaqc) for offset in offsets)
+        assert text[offsets[0]:].lower().startswith('qa/qc')
+        
+        heatmap = result['heatmap']
+        pages = {item['page']: item['counts']['qa_qc'] for item in heatmap['pages']}
+        assert pages == {1: 0, 2: len(offsets)}
+        assert [item['label'] for item in heatmap['sections']] == ["1 Introduction", "11 Sample Preparation"]
+        assert heatmap['sections'][1]['density']['qa_qc'] > 0
+        assert sum(item['counts']['qa_qc'] for item in heatmap['windows']) == len(offsets)
+        assert heatmap['windows'][-1]['end'] == len(text)
+    
     def test_determine_risk_low(self, scorer):
         """Testa classificação de risco baixo"""
         risk = scorer._determine_risk(85)
@@ -135,6 +824,371 @@ class TestValidatorAI:
             assert 'compliance' in result
             assert 'timestamp' in result
     
+    @pytest.mark.asyncio
+    async def test_prescreen_tiers(self, monkeypatch, tmp_path):
+        """Testa que documentos claros são respondidos sem chamar o GPT"""
+        monkeypatch.delenv("QIVO_PRESCREEN", raising=False)
+        validator = ValidatorAI(api_key="sk-test")
+        assert validator.prescreen is False
+        validator.prescreen = True
+        calls = []
+        
+        async def fake_gpt(text):
+            calls.append(text)
+            return "Análise JORC com recursos measured e indicated."
+        
+        monkeypatch.setattr(validator, "_analyze_with_gpt", fake_gpt)
+        
+        invoice = tmp_path / "invoice.txt"
+        invoice.write_text("Fatura 123. Serviços de transporte. Valor total R$ 4.500,00. " * 5, encoding="utf-8")
+        local = await validator.process(str(invoice))
+        
+        assert local['tier'] == 'local'
+        assert local['compliance']['compliance_score'] == 0
+        assert 'prescreen_s' in local['timings']
+        assert calls == []
+        
+        ambiguous = await validator.validate_text("Relatório JORC com recursos measured, indicated e QA/QC. " * 2)
+        assert ambiguous['tier'] == 'llm'
+        assert len(calls) == 1
+        
+        validator.prescreen = False
+        assert (await validator.validate_text("Fatura de transporte"))['tier'] == 'llm'
+        
+        assert validator.get_tier_stats() == {
+            'local': 1, 'llm': 2, 'llm_calls_avoided': 1, 'avoided_rate': 0.3333
+        }
+    
+    @pytest.mark.asyncio
+    async def test_prescreen_full_length_report(self, monkeypatch):
+        """Testa que um relatório real inteiro cai na faixa ambígua e vai ao GPT"""
+        validator = ValidatorAI(api_key="sk-test")
+        validator.prescreen = True
+        calls = []
+        
+        async def fake_gpt(text):
+            calls.append(text)
+            return "Análise NI 43-101 com QA/QC."
+        
+        monkeypatch.setattr(validator, "_analyze_with_gpt", fake_gpt)
+        
+        report = build_report()
+        assert len(report) > 40000
+        
+        # Contagem bruta satura em um documento inteiro; a densidade não
+        prescreen = validator._prescreen(report)
+        assert validator.prescreen_low < prescreen['compliance_score'] < validator.prescreen_high
+        assert validator._prescreen(report * 4)['compliance_score'] == prescreen['compliance_score']
+        assert validator.scorer.evaluate(report)['compliance_score'] > prescreen['compliance_score']
+        
+        result = await validator.validate_text(report)
+        assert result['tier'] == 'llm'
+        assert result['analysis']['full_text'] == "Análise NI 43-101 com QA/QC."
+        assert calls == [report]
+    
+    @pytest.mark.asyncio
+    async def test_map_reduce_analysis(self, monkeypatch):
+        """Testa a análise em trechos concorrentes com consolidação final"""
+        validator = ValidatorAI(api_key="sk-test")
+        validator.map_reduce = True
+        validator.chunk_tokens = 50
+        validator.chunk_overlap_tokens = 5
+        validator.chunk_concurrency = 3
+        prompts = []
+        active = []
+        peak = []
+        
+        async def fake_complete(prompt, max_tokens):
+            prompts.append(prompt)
+            active.append(prompt)
+            peak.append(len(active))
+            await asyncio.sleep(0.01)
+            active.remove(prompt)
+            return f"achados {len(prompts)}"
+        
+        monkeypatch.setattr(validator, "_complete", fake_complete)
+        
+        text = "Drilling and QA/QC program under JORC. " * 60
+        chars_per_token = len(text) / get_token_budget(validator.model).count(text)
+        chunks = split_chunks(text, int(50 * chars_per_token), int(5 * chars_per_token))
+        analysis = await validator._analyze_with_gpt(text)
+        
+        assert len(prompts) == len(chunks) + 1
+        assert max(peak) == 3
+        assert prompts[-1].startswith(f"Achados parciais de {len(chunks)} trechos")
+        assert analysis == f"achados {len(prompts)}"
+        
+        # Trechos com sobreposição cobrem o texto inteiro
+        words = " ".join(f"w{index}" for index in range(300))
+        position = 0
+        for chunk in split_chunks(words, 200, 20):
+            start = words.index(chunk)
+            assert len(chunk) <= 200 and start <= position
+            position = start + len(chunk)
+        assert position == len(words)
+        
+        prompts.clear()
+        validator.map_reduce = False
+        await validator._analyze_with_gpt(text)
+        assert len(prompts) == 1
+    
+    @pytest.mark.asyncio
+    async def test_map_reduce_chunk_failure_cancels_siblings(self, monkeypatch):
+        """Testa que a falha de um trecho cancela as chamadas dos demais"""
+        validator = ValidatorAI(api_key="sk-test")
+        validator.map_reduce = True
+        validator.chunk_tokens = 50
+        validator.chunk_overlap_tokens = 5
+        validator.chunk_concurrency = 3
+        started = []
+        cancelled = []
+        
+        async def fake_complete(prompt, max_tokens):
+            started.append(prompt)
+            if len(started) == 1:
+                await asyncio.sleep(0.01)
+                raise ValueError("Erro na análise GPT: rate limit")
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(prompt)
+                raise
+            return "achados"
+        
+        monkeypatch.setattr(validator, "_complete", fake_complete)
+        
+        text = "Drilling and QA/QC program under JORC. " * 60
+        chars_per_token = len(text) / get_token_budget(validator.model).count(text)
+        chunks = split_chunks(text, int(50 * chars_per_token), int(5 * chars_per_token))
+        with pytest.raises(ValueError, match="rate limit"):
+            await asyncio.wait_for(validator._analyze_with_gpt(text), timeout=2)
+        
+        # Os trechos restantes não chegam ao GPT e os que estavam em voo são cancelados
+        assert len(started) < len(chunks)
+        assert len(cancelled) == len(started) - 1
+    
+    @pytest.mark.asyncio
+    async def test_stream_text(self, monkeypatch):
+        """Testa os eventos do streaming e o compliance incremental"""
+        monkeypatch.delenv("QIVO_LLM_CACHE_PATH", raising=False)
+        validator = ValidatorAI(api_key="sk-test")
+        validator.prescreen = True
+        analysis = "O relatório cita JORC e NI 43-101, com QA/QC (blanks, duplicates) e recursos measured."
+        requests = []
+        
+        async def fake_create(**request):
+            requests.append(request)
+            
+            async def chunks():
+                for index in range(0, len(analysis), 7):
+                    delta = SimpleNamespace(content=analysis[index:index + 7])
+                    yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+            return chunks()
+        
+        monkeypatch.setattr(validator.client.chat.completions, "create", fake_create)
+        
+        text = "Relatório JORC com recursos measured, indicated e QA/QC. " * 2
+        events = [event async for event in validator.stream_text(text)]
+        
+        assert [event['event'] for event in events[:2]] == ['prescreen', 'token']
+        assert requests[0]['stream'] is True
+        assert "".join(event['data']['text'] for event in events if event['event'] == 'token') == analysis
+        
+        result = events[-1]
+        assert result['event'] == 'result' and result['data']['tier'] == 'llm'
+        assert result['data']['compliance'] == validator.scorer.evaluate(analysis)
+        
+        local = [event async for event in validator.stream_text("Fatura de transporte. " * 10)]
+        assert [event['event'] for event in local] == ['result']
+        assert local[0]['data']['tier'] == 'local'
+    
+    @pytest.mark.asyncio
+    async def test_process_many_pipeline(self, monkeypatch, tmp_path):
+        """Testa o lote em pipeline: resultados por arquivo, concorrência e contadores"""
+        validator = ValidatorAI(api_key="sk-test")
+        validator.prescreen = False
+        active = []
+        peak = []
+        
+        async def fake_gpt(text):
+            active.append(text)
+            peak.append(len(active))
+            await asyncio.sleep(0.02)
+            active.remove(text)
+            return "Análise JORC com QA/QC."
+        
+        monkeypatch.setattr(validator, "_analyze_with_gpt", fake_gpt)
+        
+        paths = []
+        for index in range(6):
+            path = tmp_path / f"relatorio_{index}.txt"
+            path.write_text(f"Relatório {index} com recursos JORC e amostragem. " * 5, encoding="utf-8")
+            paths.append(str(path))
+        paths.append(str(tmp_path / "ausente.txt"))
+        
+        stats = PipelineStats()
+        results = [
+            result async for result in validator.process_many(
+                paths, extraction_workers=1, llm_concurrency=3, queue_size=2, stats=stats
+            )
+        ]
+        
+        assert sorted(result['file_path'] for result in results) == sorted(paths)
+        failed = [result for result in results if result['status'] == 'error']
+        assert [result['file_path'] for result in failed] == [paths[-1]]
+        assert max(peak) == 3
+        
+        stats = stats.to_dict()
+        assert stats['extraction']['completed'] == 6 and stats['extraction']['failed'] == 1
+        assert stats['analysis']['completed'] == 6
+        assert stats['analysis']['throughput_per_s'] > 0
+    
+    @pytest.mark.asyncio
+    async def test_process_fills_cache_for_long_documents(self, monkeypatch, tmp_path):
+        """Testa que a leitura truncada grava o documento inteiro no cache"""
+        validator = ValidatorAI(api_key="sk-test")
+        cache = ExtractionCache(str(tmp_path / "cache.db"))
+        validator.preprocessor = DocumentPreprocessor(cache=cache)
+        validator.preprocessor.TXT_CHUNK_SIZE = 1024
+        
+        async def fake_gpt(text):
+            return "Análise JORC com QA/QC."
+        
+        monkeypatch.setattr(validator, "_analyze_with_gpt", fake_gpt)
+        
+        path = tmp_path / "long_report.txt"
+        path.write_text("Recursos indicados JORC com amostragem e QA/QC. " * 5000, encoding="utf-8")
+        
+        first = await validator.process(str(path))
+        await validator.preprocessor.wait_cache_fills()
+        second = await validator.process(str(path))
+        
+        assert first['metadata']['truncated'] is True
+        assert first['metadata']['cache_hit'] is False
+        assert second['metadata']['cache_hit'] is True
+        assert second['metadata']['truncated'] is True
+        assert cache.stats()['entries'] == 1
+        assert cache.stats()['hits'] == 1
+    
+    @pytest.mark.asyncio
+    async def test_process_many_concurrent_batches(self, monkeypatch, tmp_path):
+        """Testa contadores próprios de cada lote e a fila de resultados limitada"""
+        validator = ValidatorAI(api_key="sk-test")
+        analyzed = []
+        
+        async def fake_gpt(text):
+            analyzed.append(text)
+            return "Análise JORC com QA/QC."
+        
+        monkeypatch.setattr(validator, "_analyze_with_gpt", fake_gpt)
+        
+        def batch_files(name, count):
+            paths = []
+            for index in range(count):
+                path = tmp_path / f"{name}_{index}.txt"
+                path.write_text(f"Relatório {name} {index} com recursos JORC e amostragem. " * 5, encoding="utf-8")
+                paths.append(str(path))
+            return paths
+        
+        def run(paths, stats):
+            return validator.process_many(
+                paths, extraction_workers=1, llm_concurrency=2, queue_size=2, stats=stats
+            )
+        
+        small, large = PipelineStats(), PipelineStats()
+        slow = run(batch_files("lento", 12), large)
+        first = await slow.__anext__()
+        await asyncio.sleep(0.2)
+        # Consumidor parado: 1 lido + 2 na fila de resultados + 2 análises esperando
+        assert len(analyzed) == 5
+        
+        fast = [result async for result in run(batch_files("rapido", 3), small)]
+        rest = [result async for result in slow]
+        assert len(fast) == 3 and len([first] + rest) == 12
+        assert small.to_dict()['analysis']['completed'] == 3
+        assert large.to_dict()['analysis']['completed'] == 12
+        assert large.to_dict()['extraction']['completed'] == 12
+    
+    @pytest.mark.asyncio
+    async def test_process_many_early_exit(self, monkeypatch, tmp_path):
+        """Testa que parar de consumir o lote encerra as etapas sem esperar o restante"""
+        validator = ValidatorAI(api_key="sk-test")
+        
+        async def slow_gpt(text):
+            await asyncio.sleep(5)
+            return "Análise JORC."
+        
+        monkeypatch.setattr(validator, "_analyze_with_gpt", slow_gpt)
+        
+        paths = []
+        for index in range(8):
+            path = tmp_path / f"relatorio_{index}.txt"
+            path.write_text(f"Relatório {index} com recursos JORC e amostragem. " * 5, encoding="utf-8")
+            paths.append(str(path))
+        paths[0] = str(tmp_path / "ausente.txt")
+        
+        batch = validator.process_many(paths, extraction_workers=2, llm_concurrency=2, queue_size=2)
+        started = asyncio.get_running_loop().time()
+        first = await batch.__anext__()
+        await batch.aclose()
+        
+        assert first['status'] == 'error'
+        assert asyncio.get_running_loop().time() - started < 2
+        assert asyncio.all_tasks() == {asyncio.current_task()}
+    
+    @pytest.mark.asyncio
+    async def test_process_many_keeps_preprocessor_config(self, monkeypatch, tmp_path):
+        """Testa que o pool próprio do lote usa o cache, o metrics_hook e a limpeza do validador"""
+        validator = ValidatorAI(api_key="sk-test")
+        cache = ExtractionCache(str(tmp_path / "cache.db"))
+        reported = []
+        validator.preprocessor = DocumentPreprocessor(
+            cache=cache, keep_paragraphs=True, metrics_hook=reported.append
+        )
+        
+        async def fake_gpt(text):
+            return "Análise JORC com QA/QC."
+        
+        monkeypatch.setattr(validator, "_analyze_with_gpt", fake_gpt)
+        
+        paths = []
+        for index in range(3):
+            path = tmp_path / f"relatorio_{index}.txt"
+            path.write_text(f"Relatório {index} com recursos JORC.\n\nAmostragem e QA/QC. " * 5, encoding="utf-8")
+            paths.append(str(path))
+        
+        expected = await validator.process(paths[0])
+        results = [result async for result in validator.process_many(paths, extraction_workers=2)]
+        batch = next(result for result in results if result['file_path'] == paths[0])
+        
+        assert batch['metadata']['char_count'] == expected['metadata']['char_count']
+        assert batch['metadata']['cache_hit'] is True
+        assert cache.stats()['entries'] == 3
+        assert len(reported) == 4
+    
+    @pytest.mark.asyncio
+    async def test_process_many_feed_error_cancels_extractors(self, monkeypatch, tmp_path):
+        """Testa que erro ao ler os caminhos encerra os extratores e chega ao consumidor"""
+        validator = ValidatorAI(api_key="sk-test")
+        
+        async def fake_gpt(text):
+            return "Análise JORC."
+        
+        monkeypatch.setattr(validator, "_analyze_with_gpt", fake_gpt)
+        
+        path = tmp_path / "relatorio.txt"
+        path.write_text("Relatório com recursos JORC e amostragem. " * 5, encoding="utf-8")
+        
+        def file_paths():
+            yield str(path)
+            raise OSError("listagem do bucket falhou")
+        
+        with pytest.raises(OSError, match="bucket"):
+            async for _ in validator.process_many(file_paths(), extraction_workers=2, llm_concurrency=1):
+                pass
+        
+        assert asyncio.all_tasks() == {asyncio.current_task()}
+    
     def test_get_timestamp(self, validator):
         """Testa geração de timestamp"""
         timestamp = validator._get_timestamp()